@@ -0,0 +1,101 @@
+import time
+
+import numpy as np
+
+from BasisCache import cached_basis_matrix
+from BezierEval import bernstein_matrix, bezier_levels
+
+
+class FrameTimer:
+    """Records how long an animation's precompute took and how long each frame update takes."""
+
+    def __init__(self, precompute_time=0.0):
+        self.precompute_time = precompute_time
+        self.frame_times = []
+
+    def wrap(self, update):
+        def timed_update(*args):
+            start = time.perf_counter()
+            result = update(*args)
+            self.frame_times.append(time.perf_counter() - start)
+            return result
+        return timed_update
+
+    @property
+    def mean_frame_time(self):
+        return float(np.mean(self.frame_times)) if self.frame_times else 0.0
+
+    def report(self):
+        return (f"precompute {self.precompute_time * 1e3:.2f} ms, {len(self.frame_times)} frames, "
+                f"mean {self.mean_frame_time * 1e3:.3f} ms/frame")
+
+
+def bspline_frame_tables(control_points, nodes, degree, num_points, num_basis_samples=100):
+    """
+    Everything the B-spline animation shows, computed once before the first frame.
+
+    Parameters:
+    - control_points: (n, 2) control points
+    - nodes: Knot vector
+    - degree: Degree of the B-spline
+    - num_points: Number of frames; frame f shows u[f]
+    - num_basis_samples: Samples of the basis function plot over [nodes[0], nodes[-1]]
+
+    Returns:
+    - dict with
+      u: (frames,) parameter value of every frame
+      basis_u: (frames, n) basis function values at u, the per-frame label values
+      curve: (frames, 2) curve point of every frame; frame f draws curve[:f]
+      t_values, basis_values: (num_basis_samples,) grid and (num_basis_samples, n) basis plot data
+      precompute_time: seconds spent building the tables
+    """
+    start = time.perf_counter()
+    control_points = np.asarray(control_points, dtype=float)
+    u = np.linspace(nodes[degree], nodes[-degree - 1], num_points)
+    # 最后一帧落在最后一个节点上，include_end 让它仍属于最后一个非空区间，而不是全为 0
+    basis_u = cached_basis_matrix(nodes, degree, u, include_end=True).toarray()
+    t_values = np.linspace(nodes[0], nodes[-1], num_basis_samples)
+    tables = {
+        'u': u,
+        'basis_u': basis_u,
+        'curve': basis_u @ control_points,
+        't_values': t_values,
+        'basis_values': cached_basis_matrix(nodes, degree, t_values, include_end=True).toarray(),
+    }
+    tables['precompute_time'] = time.perf_counter() - start
+    return tables
+
+
+def bezier_frame_tables(control_points, num_frames=100):
+    """
+    Everything the Bezier animation shows, computed once before the first frame.
+
+    Parameters:
+    - control_points: (n + 1, 2) control points
+    - num_frames: Number of frames; frame f shows t[f], t evenly spaced over [0, 1]
+
+    Returns:
+    - dict with
+      t: (frames,) parameter value of every frame
+      levels: (frames, n + 1, n + 1, 2) de Casteljau pyramid of every frame; level l holds
+        n + 1 - l valid points, the rest are NaN
+      bernstein: (frames, n + 1) Bernstein basis values at t, the per-frame label values
+      curve: (frames, 2) curve point of every frame, so frame f traces curve[:f + 1]
+      values: (frames, 2) the same points as the Bernstein sum, shown in the formula label
+      precompute_time: seconds spent building the tables
+    """
+    start = time.perf_counter()
+    control_points = np.asarray(control_points, dtype=float)
+    n = len(control_points) - 1
+    t = np.linspace(0, 1, num_frames)
+    levels = np.ascontiguousarray(bezier_levels(control_points, t).transpose(1, 0, 2, 3))
+    bernstein = bernstein_matrix(n, t)
+    tables = {
+        't': t,
+        'levels': levels,
+        'bernstein': bernstein,
+        'curve': np.ascontiguousarray(levels[:, n, 0]),
+        'values': bernstein @ control_points,
+    }
+    tables['precompute_time'] = time.perf_counter() - start
+    return tables
@@ -1,5 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from BasisCache import evaluate_bspline_cached
+from BSplineEval import evaluate_bspline_into
+from Flatten import flatten_bspline
 
 def basis_function(i, k, u, nodes):
     if k == 0:
@@ -8,15 +10,17 @@ def basis_function(i, k, u, nodes):
     term2 = 0.0 if nodes[i + k + 1] == nodes[i + 1] else (nodes[i + k + 1] - u) / (nodes[i + k + 1] - nodes[i + 1])
     return term1 * basis_function(i, k - 1, u, nodes) + term2 * basis_function(i + 1, k - 1, u, nodes)
 
-def b_spline_curve(control_points, nodes, degree, num_points):
-    curve_points = []
-    for u in np.linspace(nodes[degree], nodes[-degree - 1], num_points):
-        point = np.zeros(2)  # 假设是二维点
-        for i, control_point in enumerate(control_points):
-            basis = basis_function(i, degree, u, nodes)
-            point += control_point * basis
-        curve_points.append(point)
-    return np.array(curve_points)
+def b_spline_curve(control_points, nodes, degree, num_points, tolerance=None, out=None, chunk_size=65536):
+    # 给定 tolerance 时按节点区间自适应细分，返回满足弦高误差的最少折线点
+    if tolerance is not None:
+        return flatten_bspline(control_points, nodes, degree, tolerance)[1]
+    # 给定 out（可以是 np.memmap）时逐块求值写入，峰值内存只取决于 chunk_size
+    if out is not None:
+        return evaluate_bspline_into(control_points, nodes, degree, num_points, out, chunk_size)
+    # 基矩阵按 (节点矢量, 次数, 采样点) 缓存，控制点变化时只需一次稀疏矩阵乘法；
+    # 与逐块求值一样，最后一个采样点是曲线的终点
+    u = np.linspace(nodes[degree], nodes[-degree - 1], num_points)
+    return evaluate_bspline_cached(control_points, nodes, degree, u, include_end=True)
 
 def create_periodic_nodes(num_control_points, degree):
     nodes = np.zeros(num_control_points + degree + 1)
@@ -41,8 +45,10 @@ def generate_and_plot_spline(control_points, degree, num_points):
 
     return open_curve_points, periodic_curve_points
 
-def plot_bspline():
-    # 生成并绘制曲线
+def plot_bspline(control_points, num_points=100):
+    # 生成并绘制曲线；matplotlib 只在绘图时导入
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(2, 2, figsize=(10, 6))
     fig.subplots_adjust(left=0.2, hspace=1, wspace=3)  # 调整左侧边距和子图之间的间距
 
@@ -94,11 +100,12 @@ def plot_bspline():
     plt.tight_layout()
     plt.show()
 
-# 示例使用
-control_points = np.array([
-    [0, 0], [1, 2], [3, 5], [4, 4], [5, 0], [6, -3], [7, 0]
-])
+if __name__ == "__main__":
+    # 示例使用
+    control_points = np.array([
+        [0, 0], [1, 2], [3, 5], [4, 4], [5, 0], [6, -3], [7, 0]
+    ])
 
-num_points = 100
+    num_points = 100
 
-plot_bspline()
+    plot_bspline(control_points, num_points)
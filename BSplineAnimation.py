@@ -1,24 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import ticker
-from matplotlib.animation import FuncAnimation
-
-def basis_function(i, k, u, nodes):
-    if k == 0:
-        return 1.0 if nodes[i] <= u < nodes[i + 1] else 0.0
-    term1 = 0.0 if nodes[i + k] == nodes[i] else (u - nodes[i]) / (nodes[i + k] - nodes[i])
-    term2 = 0.0 if nodes[i + k + 1] == nodes[i + 1] else (nodes[i + k + 1] - u) / (nodes[i + k + 1] - nodes[i + 1])
-    return term1 * basis_function(i, k - 1, u, nodes) + term2 * basis_function(i + 1, k - 1, u, nodes)
+from AnimationData import FrameTimer, bspline_frame_tables
+from BasisCache import evaluate_bspline_cached
 
 def b_spline_curve(control_points, nodes, degree, num_points):
-    curve_points = []
-    for u in np.linspace(nodes[degree], nodes[-degree - 1], num_points):
-        point = np.zeros(2)  # 假设是二维点
-        for i, control_point in enumerate(control_points):
-            basis = basis_function(i, degree, u, nodes)
-            point += control_point * basis
-        curve_points.append(point)
-    return np.array(curve_points)
+    # 与 BSpline.b_spline_curve 相同：基矩阵按 (节点矢量, 次数, 采样点) 缓存，最后一个采样点是曲线的终点
+    u = np.linspace(nodes[degree], nodes[-degree - 1], num_points)
+    return evaluate_bspline_cached(control_points, nodes, degree, u, include_end=True)
 
 def create_periodic_nodes(num_control_points, degree):
     nodes = np.zeros(num_control_points + degree + 1)
@@ -33,7 +20,15 @@ def create_open_uniform_nodes(num_control_points, degree):
     nodes[degree + 1:-degree - 1] = np.arange(1, num_control_points - degree)
     return nodes
 
-def animate_bspline_curve(ax1, ax2, control_points, degree, num_points, node_type='periodic'):
+def create_nodes(num_control_points, degree, node_type='periodic'):
+    if node_type == 'periodic':
+        return create_periodic_nodes(num_control_points, degree)
+    return create_open_uniform_nodes(num_control_points, degree)
+
+def setup_bspline_animation(ax1, ax2, control_points, degree, num_points, node_type='periodic', tables=None):
+    # 绘制静态部分并返回帧回调 update(frame) 和计时器；tables 可由调用方预先算好（见 BatchRender）
+    from matplotlib import ticker
+
     ax1.set_xlim(np.min(control_points[:, 0]) - 1, np.max(control_points[:, 0]) + 1)
     ax1.set_ylim(np.min(control_points[:, 1]) - 1, np.max(control_points[:, 1]) + 1)
     ax1.set_xlabel('X-axis')
@@ -52,10 +47,7 @@ def animate_bspline_curve(ax1, ax2, control_points, degree, num_points, node_typ
     ax1.grid(True)
 
     # 创建节点向量
-    if node_type == 'periodic':
-        nodes = create_periodic_nodes(len(control_points), degree)
-    else:
-        nodes = create_open_uniform_nodes(len(control_points), degree)
+    nodes = create_nodes(len(control_points), degree, node_type)
 
     # 初始化曲线
     line, = ax1.plot([], [], label="B-spline Curve", color='blue')
@@ -72,12 +64,17 @@ def animate_bspline_curve(ax1, ax2, control_points, degree, num_points, node_typ
     ax2.legend()
     ax2.grid(True)
 
-    # 绘制基函数初始值
+    # 动画开始前一次性算好每一帧的参数、曲线点、基函数值，帧回调只做切片
     k = degree
-    t_values = np.linspace(nodes[0], nodes[-1], 100)
-    basis_lines = [ax2.plot(t_values,
-                            [basis_function(i, k, t, nodes) for t in t_values],
-                            label=f'B{i},{k}')[0] for i in range(len(control_points))]
+    if tables is None:
+        tables = bspline_frame_tables(control_points, nodes, k, num_points)
+    u_frames, basis_frames, curve_points = tables['u'], tables['basis_u'], tables['curve']
+    t_values, basis_values = tables['t_values'], tables['basis_values']
+    timer = FrameTimer(tables['precompute_time'])
+
+    # 基函数曲线不随帧变化，只绘制一次
+    for i in range(len(control_points)):
+        ax2.plot(t_values, basis_values[:, i], label=f'B{i},{k}')
 
     b_labels = [ax2.text(0.02, .9 - i / len(control_points) * .9, '', transform=ax2.transAxes,
                          fontsize=10, verticalalignment='top') for i in range(len(control_points))]
@@ -88,24 +85,20 @@ def animate_bspline_curve(ax1, ax2, control_points, degree, num_points, node_typ
     result = ax2.text(0.25, 0.2, '', transform=ax2.transAxes, fontsize=10, verticalalignment='top')
 
     def update(frame):
-        u = np.linspace(nodes[degree], nodes[-degree - 1], num_points)[frame]
-        curve_points = b_spline_curve(control_points, nodes, degree, num_points)
+        u = u_frames[frame]
         line.set_data(curve_points[:frame, 0], curve_points[:frame, 1])
 
-        # 更新右侧基函数视图
-        for i, basis_line in enumerate(basis_lines):
-            basis_line.set_ydata([basis_function(i, k, t, nodes) for t in t_values])
-
         # 更新当前变量值的文本框
         text_u.set_text(f'u = {u:.2f}')
         line_u.set_xdata([u, u])
 
+        basis_u = basis_frames[frame]
         for i, label in enumerate(b_labels):
-            label.set_text(f'B{i},{k}(u)={basis_function(i, k, u, nodes):.2f}')
+            label.set_text(f'B{i},{k}(u)={basis_u[i]:.2f}')
 
         formula = r'$P(u) = \sum_{i=0}^{n} B_{i,k} P_i$'
         field = r'$, \quad u \in [u_{k-1}, u_{n+1}]$'
-        value = sum([basis_function(i, k, u, nodes) * control_points[i] for i in range(len(control_points))])
+        value = curve_points[frame]
         result.set_text(f'{formula} = ({value[0]:.2f}, {value[1]:.2f}){field}')
         cur_point.set_text(f'Point=({value[0]:.2f}, {value[1]:.2f})')
 
@@ -113,22 +106,36 @@ def animate_bspline_curve(ax1, ax2, control_points, degree, num_points, node_typ
         moving_point.set_color('blue')
         moving_point.set_markersize(5)
 
-        return line, *basis_lines, *b_labels, text_u, line_u, result, cur_point, moving_point
+        return line, *b_labels, text_u, line_u, result, cur_point, moving_point
+
+    return update, timer
+
+def animate_bspline_curve(ax1, ax2, control_points, degree, num_points, node_type='periodic'):
+    from matplotlib.animation import FuncAnimation
+
+    update, timer = setup_bspline_animation(ax1, ax2, control_points, degree, num_points, node_type)
+    animation = FuncAnimation(ax1.figure, timer.wrap(update), frames=num_points, blit=True, repeat=False)
+    animation.timer = timer
+    return animation
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
-    return FuncAnimation(fig, update, frames=num_points, blit=True, repeat=False)
+    # 示例使用
+    control_points = np.array([
+        [0, 0], [1, 2], [3, 5], [4, 4], [5, 0], [6, -3], [7, 0], [8, 2], [9, 1], [10, 0]
+    ])
+    degree = 3
+    num_points = 100
 
-# 示例使用
-control_points = np.array([
-    [0, 0], [1, 2], [3, 5], [4, 4], [5, 0], [6, -3], [7, 0], [8, 2], [9, 1], [10, 0]
-])
-degree = 3
-num_points = 100
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10), gridspec_kw={'height_ratios': [1, 1]})
 
-fig, axes = plt.subplots(2, 2, figsize=(12, 10), gridspec_kw={'height_ratios': [1, 1]})
+    # 上下排列两个动画
+    ani_periodic = animate_bspline_curve(axes[0, 0], axes[0, 1], control_points, degree, num_points, node_type='periodic')
+    ani_open_uniform = animate_bspline_curve(axes[1, 0], axes[1, 1], control_points, degree, num_points, node_type='open_uniform')
 
-# 上下排列两个动画
-ani_periodic = animate_bspline_curve(axes[0, 0], axes[0, 1], control_points, degree, num_points, node_type='periodic')
-ani_open_uniform = animate_bspline_curve(axes[1, 0], axes[1, 1], control_points, degree, num_points, node_type='open_uniform')
+    plt.tight_layout()
+    plt.show()
 
-plt.tight_layout()
-plt.show()
+    for name, ani in (('periodic', ani_periodic), ('open uniform', ani_open_uniform)):
+        print(f"{name}: {ani.timer.report()}")
@@ -1,6 +1,5 @@
 import numpy as np
-from scipy.interpolate import BSpline
-import matplotlib.pyplot as plt
+from KnotOps import elevate_degree
 
 def create_open_uniform_nodes(num_control_points, degree):
     nodes = np.zeros(num_control_points + degree + 1)
@@ -45,53 +44,93 @@ def merge_bspline_segments(P, U, Q, V, degree):
 
     return U_prime, control_points
 
-# Example usage
-degree = 3
-P = np.array([[0, 0], [1, 2], [2, 2], [3, 0], [4, 2]])
-U = create_open_uniform_nodes(len(P), degree)
-print("U:", U)
-
-Q = np.array([[4, 0], [4, -1], [5, -2], [6, 0], [7, 4]])
-V = create_open_uniform_nodes(len(Q), degree)
-print("V:", V)
-
-# Create the individual B-splines
-spline1 = BSpline(U, P, degree)
-spline2 = BSpline(V, Q, degree)
-
-
-# Plot the B-splines
-fig, axs = plt.subplots(1, 2, figsize=(12, 6))
-# Plot the individual B-splines
-t1 = np.linspace(U[degree], U[-degree - 1], 200)
-points1 = spline1(t1)
-axs[0].plot(points1[:, 0], points1[:, 1], 'b-', label='B-Spline 1')
-axs[0].plot(P[:, 0], P[:, 1], 'ro-', label='Control Points 1')
-
-t2 = np.linspace(V[degree], V[-degree - 1], 200)
-points2 = spline2(t2)
-axs[0].plot(points2[:, 0], points2[:, 1], 'g-', label='B-Spline 2')
-axs[0].plot(Q[:, 0], Q[:, 1], 'mo-', label='Control Points 2')
-
-U_prime, control_points = merge_bspline_segments(P, U, Q, V, degree)
-# Create the merged B-spline
-spline_merged = BSpline(U_prime, control_points, degree)
-
-axs[0].legend()
-axs[0].set_xlabel('x')
-axs[0].set_ylabel('y')
-axs[0].set_title('Individual B-Spline Curves')
-
-# Plot the merged B-spline
-t_merged = np.linspace(U_prime[degree], U_prime[-degree - 1], 400)
-points_merged = spline_merged(t_merged)
-axs[1].plot(points_merged[:, 0], points_merged[:, 1], 'b-', label='Merged B-Spline')
-axs[1].plot(control_points[:, 0], control_points[:, 1], 'ro-', label='Control Points')
-
-axs[1].legend()
-axs[1].set_xlabel('x')
-axs[1].set_ylabel('y')
-axs[1].set_title('Merged B-Spline Curve')
-
-plt.tight_layout()
-plt.show()
+def merge_bspline_curves(P, U, p, Q, V, q):
+    """
+    Join two clamped B-splines into one without changing either curve.
+
+    The lower-degree curve is degree-elevated first, so the curves may have different
+    degrees and knot densities. V is shifted to start at U[-1]. If Q starts where P ends,
+    the junction knot gets multiplicity equal to the degree (a C0 join sharing that
+    control point); otherwise it gets degree + 1 and the merged curve jumps there.
+
+    Parameters:
+    - P, U, p: Control points, knot vector and degree of the first B-spline
+    - Q, V, q: Control points, knot vector and degree of the second B-spline
+
+    Returns:
+    - Merged knot vector, control points and degree
+    """
+    degree = max(p, q)
+    U, P = elevate_degree(P, U, p, degree - p)
+    V, Q = elevate_degree(Q, V, q, degree - q)
+    V = V - V[0] + U[-1]
+
+    if np.allclose(P[-1], Q[0]):
+        return np.concatenate((U[:-1], V[degree + 1:])), np.vstack((P, Q[1:])), degree
+    return np.concatenate((U, V[degree + 1:])), np.vstack((P, Q)), degree
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    from scipy.interpolate import BSpline
+
+    # Example usage
+    degree = 3
+    P = np.array([[0, 0], [1, 2], [2, 2], [3, 0], [4, 2]])
+    U = create_open_uniform_nodes(len(P), degree)
+    print("U:", U)
+
+    Q = np.array([[4, 0], [4, -1], [5, -2], [6, 0], [7, 4]])
+    V = create_open_uniform_nodes(len(Q), degree)
+    print("V:", V)
+
+    # Create the individual B-splines
+    spline1 = BSpline(U, P, degree)
+    spline2 = BSpline(V, Q, degree)
+
+
+    # Plot the B-splines
+    fig, axs = plt.subplots(1, 2, figsize=(12, 6))
+    # Plot the individual B-splines
+    t1 = np.linspace(U[degree], U[-degree - 1], 200)
+    points1 = spline1(t1)
+    axs[0].plot(points1[:, 0], points1[:, 1], 'b-', label='B-Spline 1')
+    axs[0].plot(P[:, 0], P[:, 1], 'ro-', label='Control Points 1')
+
+    t2 = np.linspace(V[degree], V[-degree - 1], 200)
+    points2 = spline2(t2)
+    axs[0].plot(points2[:, 0], points2[:, 1], 'g-', label='B-Spline 2')
+    axs[0].plot(Q[:, 0], Q[:, 1], 'mo-', label='Control Points 2')
+
+    U_prime, control_points = merge_bspline_segments(P, U, Q, V, degree)
+    # Create the merged B-spline
+    spline_merged = BSpline(U_prime, control_points, degree)
+
+    axs[0].legend()
+    axs[0].set_xlabel('x')
+    axs[0].set_ylabel('y')
+    axs[0].set_title('Individual B-Spline Curves')
+
+    # Plot the merged B-spline
+    t_merged = np.linspace(U_prime[degree], U_prime[-degree - 1], 400)
+    points_merged = spline_merged(t_merged)
+    axs[1].plot(points_merged[:, 0], points_merged[:, 1], 'b-', label='Merged B-Spline')
+    axs[1].plot(control_points[:, 0], control_points[:, 1], 'ro-', label='Control Points')
+
+    axs[1].legend()
+    axs[1].set_xlabel('x')
+    axs[1].set_ylabel('y')
+    axs[1].set_title('Merged B-Spline Curve')
+
+    # 不同次数的曲线精确拼接：三次 P 与二次 R（R 从 P 的终点出发）
+    R = np.array([[4, 2], [5, 3], [6, 1], [7, 3]], dtype=float)
+    W = create_open_uniform_nodes(len(R), 2)
+    W_merged, R_merged, merged_degree = merge_bspline_curves(P, U, degree, R, W, 2)
+    spline_exact = BSpline(W_merged, R_merged, merged_degree)
+    t_check = np.linspace(U[degree], U[-degree - 1], 200)
+    w_check = np.linspace(W[2], W[-3], 200)
+    deviation = max(np.abs(spline_exact(t_check) - spline1(t_check)).max(),
+                    np.abs(spline_exact(w_check + U[-1]) - BSpline(W, R, 2)(w_check)).max())
+    print(f"Exact merge: degree {merged_degree}, {len(R_merged)} control points, max deviation {deviation:.2e}")
+
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,306 @@
+import numpy as np
+
+
+def clamped_uniform_nodes(num_control_points, degree):
+    """
+    Clamped uniform knot vector on [0, 1]: each end knot repeated degree + 1 times, the
+    interior knots evenly spaced.
+    """
+    return np.concatenate(([0.0] * degree, np.linspace(0, 1, num_control_points - degree + 1), [1.0] * degree))
+
+
+def find_span(nodes, u, include_end=False):
+    """
+    Locate the knot span of every parameter value.
+
+    Parameters:
+    - nodes: Knot vector (non-decreasing)
+    - u: Parameter values, scalar or array
+    - include_end: Treat the last knot as belonging to the last non-empty span
+      instead of lying outside the half-open support of every basis function
+
+    Returns:
+    - Integer array of span indices j with nodes[j] <= u < nodes[j + 1], -1 where u is outside the knot vector
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    u = np.atleast_1d(np.asarray(u, dtype=float))
+    spans = np.searchsorted(nodes, u, side='right') - 1
+    spans[(spans < 0) | (spans >= len(nodes) - 1)] = -1
+    if include_end:
+        last_span = np.flatnonzero(nodes[:-1] < nodes[1:])[-1]
+        spans[u == nodes[-1]] = last_span
+    return spans
+
+
+def _cox_de_boor(nodes, degree, u, spans):
+    # 三角形 Cox-de Boor 表：区间 spans 上的 degree + 1 个非零基函数，
+    # 要求 nodes[spans + 1 - degree] 到 nodes[spans + degree] 都可以取到
+    m = len(u)
+    values = np.zeros((m, degree + 1))
+    values[:, 0] = 1.0
+    left = np.empty((m, degree + 1))
+    right = np.empty((m, degree + 1))
+    for r in range(1, degree + 1):
+        left[:, r] = u - nodes[spans + 1 - r]
+        right[:, r] = nodes[spans + r] - u
+        saved = np.zeros(m)
+        for s in range(r):
+            temp = values[:, s] / (right[:, s + 1] + left[:, r - s])
+            values[:, s] = saved + right[:, s + 1] * temp
+            saved = left[:, r - s] * temp
+        values[:, r] = saved
+    return values
+
+
+def basis_functions(nodes, degree, u, include_end=False):
+    """
+    Evaluate the degree + 1 nonzero B-spline basis functions at every parameter value.
+
+    Uses the triangular Cox-de Boor table, vectorized over the samples, so the cost is
+    O(len(u) * degree^2) instead of one recursive call per control point and sample.
+    The values agree with the recursive definition (half-open knot intervals, 0/0 = 0).
+
+    Parameters:
+    - nodes: Knot vector
+    - degree: Degree of the B-spline
+    - u: Parameter values, scalar or array of length m
+    - include_end: See find_span
+
+    Returns:
+    - spans: (m,) span index of every sample, -1 where all basis functions vanish
+    - values: (m, degree + 1) array, values[s, r] = N_{spans[s] - degree + r, degree}(u[s]);
+      entries belonging to nonexistent basis functions are zero
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    u = np.atleast_1d(np.asarray(u, dtype=float))
+    spans = find_span(nodes, u, include_end)
+    num_basis = len(nodes) - degree - 1
+
+    # Samples without a span are evaluated on any non-empty span and zeroed afterwards
+    valid = spans >= 0
+    safe_span = np.flatnonzero(nodes[:-1] < nodes[1:])[0]
+    j = np.where(valid, spans, safe_span) + degree
+
+    # Extend the knot vector on both sides so that j + 1 - r and j + r are always indexable.
+    # The padding only feeds basis functions that do not exist and are masked out below.
+    padded = np.concatenate((nodes[0] - np.arange(degree, 0, -1), nodes, nodes[-1] + np.arange(1, degree + 1)))
+
+    values = _cox_de_boor(padded, degree, u, j)
+
+    index = spans[:, None] - degree + np.arange(degree + 1)
+    values[(index < 0) | (index >= num_basis) | ~valid[:, None]] = 0.0
+    return spans, values
+
+
+def basis_function_derivatives(nodes, degree, u, order, include_end=False):
+    """
+    Evaluate the degree + 1 nonzero basis functions and their derivatives up to order.
+
+    Vectorized over the samples like basis_functions: the knot differences of the
+    Cox-de Boor table are kept and the derivatives are formed from them by the
+    recurrence of Piegl and Tiller (The NURBS Book, A2.3), so the cost is
+    O(len(u) * (degree^2 + order * degree)). Derivatives above the degree are zero.
+
+    Parameters:
+    - nodes: Knot vector
+    - degree: Degree of the B-spline
+    - u: Parameter values, scalar or array of length m
+    - order: Highest derivative order
+    - include_end: See find_span
+
+    Returns:
+    - spans: (m,) span index of every sample, -1 where all basis functions vanish
+    - derivatives: (m, order + 1, degree + 1) array, derivatives[s, k, r] is the k-th
+      derivative of N_{spans[s] - degree + r, degree} at u[s]; entries belonging to
+      nonexistent basis functions are zero
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    u = np.atleast_1d(np.asarray(u, dtype=float))
+    spans = find_span(nodes, u, include_end)
+    num_basis = len(nodes) - degree - 1
+    p = degree
+
+    valid = spans >= 0
+    safe_span = np.flatnonzero(nodes[:-1] < nodes[1:])[0]
+    j = np.where(valid, spans, safe_span) + p
+    padded = np.concatenate((nodes[0] - np.arange(p, 0, -1), nodes, nodes[-1] + np.arange(1, p + 1)))
+
+    # ndu[:, a, b]：上三角 (a <= b) 为各次基函数值，下三角 (a > b) 为对应的节点差
+    m = len(u)
+    ndu = np.empty((m, p + 1, p + 1))
+    ndu[:, 0, 0] = 1.0
+    left = np.empty((m, p + 1))
+    right = np.empty((m, p + 1))
+    for r in range(1, p + 1):
+        left[:, r] = u - padded[j + 1 - r]
+        right[:, r] = padded[j + r] - u
+        saved = np.zeros(m)
+        for s in range(r):
+            ndu[:, r, s] = right[:, s + 1] + left[:, r - s]
+            temp = ndu[:, s, r - 1] / ndu[:, r, s]
+            ndu[:, s, r] = saved + right[:, s + 1] * temp
+            saved = left[:, r - s] * temp
+        ndu[:, r, r] = saved
+
+    derivatives = np.zeros((m, order + 1, p + 1))
+    derivatives[:, 0] = ndu[:, :, p]
+    for r in range(p + 1):
+        a = np.zeros((2, m, p + 1))
+        a[0, :, 0] = 1.0
+        s1, s2 = 0, 1
+        for k in range(1, min(order, p) + 1):
+            d = np.zeros(m)
+            rk, pk = r - k, p - k
+            if r >= k:
+                a[s2, :, 0] = a[s1, :, 0] / ndu[:, pk + 1, rk]
+                d += a[s2, :, 0] * ndu[:, rk, pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k - 1 if r - 1 <= pk else p - r
+            for i in range(j1, j2 + 1):
+                a[s2, :, i] = (a[s1, :, i] - a[s1, :, i - 1]) / ndu[:, pk + 1, rk + i]
+                d += a[s2, :, i] * ndu[:, rk + i, pk]
+            if r <= pk:
+                a[s2, :, k] = -a[s1, :, k - 1] / ndu[:, pk + 1, r]
+                d += a[s2, :, k] * ndu[:, r, pk]
+            derivatives[:, k, r] = d
+            s1, s2 = s2, s1
+
+    # 乘以 p! / (p - k)!
+    factor = 1.0
+    for k in range(1, min(order, p) + 1):
+        factor *= p - k + 1
+        derivatives[:, k] *= factor
+
+    index = spans[:, None] - p + np.arange(p + 1)
+    mask = (index < 0) | (index >= num_basis) | ~valid[:, None]
+    derivatives[np.broadcast_to(mask[:, None], derivatives.shape)] = 0.0
+    return spans, derivatives
+
+
+def _basis_entries(nodes, degree, u, include_end, derivative=0):
+    # 非零基函数（或其 derivative 阶导数）的值、对应的控制点下标，以及真实存在的那些项
+    if derivative:
+        spans, values = basis_function_derivatives(nodes, degree, u, derivative, include_end)
+        values = values[:, derivative]
+    else:
+        spans, values = basis_functions(nodes, degree, u, include_end)
+    index = spans[:, None] - degree + np.arange(degree + 1)
+    keep = (spans[:, None] >= 0) & (index >= 0) & (index < len(nodes) - degree - 1)
+    return values, index, keep
+
+
+def basis_matrix(nodes, degree, u, include_end=False, derivative=0):
+    """
+    Dense (len(u), number of control points) matrix of all basis function values,
+    column i holding N_{i,degree} (or its derivative of the given order) sampled at u.
+    """
+    values, index, keep = _basis_entries(nodes, degree, u, include_end, derivative)
+    rows = np.broadcast_to(np.arange(len(values))[:, None], index.shape)
+    matrix = np.zeros((len(values), len(nodes) - degree - 1))
+    matrix[rows[keep], index[keep]] = values[keep]
+    return matrix
+
+
+def sparse_basis_matrix(nodes, degree, u, include_end=False, derivative=0):
+    """
+    Same matrix as basis_matrix in CSR form, storing at most degree + 1 entries per row.
+
+    Only the degree + 1 functions that are nonzero on the knot span of each sample are
+    evaluated, so time and memory grow with len(u) * (degree + 1), independent of the
+    number of control points.
+
+    Parameters:
+    - nodes: Knot vector, e.g. from create_open_uniform_nodes or create_periodic_nodes
+    - degree: Degree of the B-spline
+    - u: Parameter values, array of length m
+    - include_end: See find_span
+    - derivative: Order of the derivative with respect to u, 0 for the basis functions themselves
+
+    Returns:
+    - (m, number of control points) scipy.sparse CSR matrix; B @ control_points gives
+      the curve (or its derivative) at u
+    """
+    from scipy import sparse
+
+    values, index, keep = _basis_entries(nodes, degree, u, include_end, derivative)
+    indptr = np.concatenate(([0], np.cumsum(keep.sum(axis=1))))
+    return sparse.csr_matrix((values[keep], index[keep], indptr), shape=(len(values), len(nodes) - degree - 1))
+
+
+def evaluate_bspline(control_points, nodes, degree, u, include_end=False):
+    """
+    Evaluate a B-spline curve at an array of parameter values in one call.
+
+    Parameters:
+    - control_points: (n, dim) control points, n = len(nodes) - degree - 1
+    - nodes: Knot vector
+    - degree: Degree of the B-spline
+    - u: Parameter values, array of length m
+    - include_end: See find_span
+
+    Returns:
+    - (m, dim) array of curve points
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    spans, values = basis_functions(nodes, degree, u, include_end)
+    index = np.clip(spans[:, None] - degree + np.arange(degree + 1), 0, len(control_points) - 1)
+    return np.einsum('mr,mrd->md', values, control_points[index])
+
+
+def iter_bspline(control_points, nodes, degree, num_points, chunk_size=65536):
+    """
+    Evaluate a B-spline at num_points evenly spaced parameter values, chunk by chunk.
+
+    The samples are the same as np.linspace(nodes[degree], nodes[-degree - 1], num_points),
+    generated one chunk at a time. The knot spans are walked in order, each chunk searching
+    only the knots from the span where the previous one stopped, and the last sample is the
+    end point of the curve. Memory use depends on chunk_size and degree, not on num_points,
+    so control_points and the output may both be memory-mapped.
+
+    Parameters:
+    - control_points: (n, dim) control points, n = len(nodes) - degree - 1
+    - nodes: Knot vector
+    - degree: Degree of the B-spline
+    - num_points: Total number of samples
+    - chunk_size: Samples per chunk
+
+    Yields:
+    - (start, points): index of the first sample of the chunk and its (<= chunk_size, dim) points
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    n = len(nodes) - degree - 1
+    low, high = nodes[degree], nodes[n]
+    step = (high - low) / (num_points - 1) if num_points > 1 else 0.0
+    # 定义域 [nodes[degree], nodes[n]] 内最后一个非空区间，定义域右端点归入该区间
+    last_span = degree + np.flatnonzero(nodes[degree:n] < nodes[degree + 1:n + 1])[-1]
+    span = degree
+    for start in range(0, num_points, chunk_size):
+        stop = min(start + chunk_size, num_points)
+        u = np.arange(start, stop) * step + low
+        if stop == num_points and num_points > 1:
+            u[-1] = high
+        spans = span - 1 + np.searchsorted(nodes[span:last_span + 1], u, side='right')
+        spans = np.clip(spans, degree, last_span)
+        values = _cox_de_boor(nodes, degree, u, spans)
+        index = spans[:, None] - degree + np.arange(degree + 1)
+        yield start, np.einsum('mr,mrd->md', values, np.asarray(control_points[index], dtype=float))
+        span = spans[-1]
+
+
+def evaluate_bspline_into(control_points, nodes, degree, num_points, out, chunk_size=65536):
+    """
+    Write num_points evenly spaced curve points into out chunk by chunk, see iter_bspline.
+
+    Parameters:
+    - out: (num_points, dim) array to fill, e.g. an np.memmap or
+      np.lib.format.open_memmap(path, mode='w+', shape=(num_points, dim))
+
+    Returns:
+    - out
+    """
+    expected = (num_points, np.shape(control_points)[1])
+    if out.shape != expected:
+        raise ValueError(f"out has shape {out.shape}, expected {expected}")
+    for start, points in iter_bspline(control_points, nodes, degree, num_points, chunk_size):
+        out[start:start + len(points)] = points
+    return out
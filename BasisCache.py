@@ -0,0 +1,103 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from BSplineEval import sparse_basis_matrix
+
+
+def _digest(array):
+    array = np.ascontiguousarray(array, dtype=float)
+    return hashlib.blake2b(array.tobytes(), digest_size=16).digest()
+
+
+class BasisCache:
+    """
+    Process-wide LRU cache of sparse B-spline basis matrices.
+
+    Entries are keyed by the knot vector, the degree, the sample grid and the derivative
+    order, so a curve whose control points change (animation frames, dragged vertices) is
+    re-evaluated with a single sparse matrix product. The least recently used matrices are evicted once the stored
+    matrices exceed max_bytes. Cached matrices are shared and read-only.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, nodes, degree, u, include_end=False, derivative=0):
+        """Return the (len(u), number of control points) CSR basis matrix, building it on a miss."""
+        u = np.atleast_1d(np.asarray(u, dtype=float))
+        key = (_digest(nodes), int(degree), _digest(u), bool(include_end), int(derivative))
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return matrix
+            self.misses += 1
+
+        matrix = sparse_basis_matrix(nodes, degree, u, include_end, derivative)
+        for array in (matrix.data, matrix.indices, matrix.indptr):
+            array.flags.writeable = False
+        size = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = matrix
+                self.nbytes += size
+                self._evict()
+        return matrix
+
+    def resize(self, max_bytes):
+        """Change the memory budget, evicting entries if it shrank."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Hit/miss counters and memory usage as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'nbytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self._entries:
+            _, matrix = self._entries.popitem(last=False)
+            self.nbytes -= matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+            self.evictions += 1
+
+
+# 进程内共享的缓存实例
+basis_cache = BasisCache()
+
+
+def cached_basis_matrix(nodes, degree, u, include_end=False, derivative=0):
+    """Sparse basis matrix (or its derivative of the given order) from the shared basis_cache."""
+    return basis_cache.get(nodes, degree, u, include_end, derivative)
+
+
+def evaluate_bspline_cached(control_points, nodes, degree, u, include_end=False):
+    """Evaluate a B-spline as one sparse matrix product with the cached basis matrix."""
+    return cached_basis_matrix(nodes, degree, u, include_end) @ np.asarray(control_points, dtype=float)
@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from BasisCache import cached_basis_matrix
+from BezierEval import bernstein_matrix, log_bernstein_matrix
+from BSplineEval import clamped_uniform_nodes
+
+CURVE_KINDS = ('bezier', 'bspline')
+NODE_TYPES = ('open_uniform', 'periodic')
+# Bezier 基矩阵：'power' 在约 100 次以下最快，更高次时 'log' 更快且不溢出（见 benchmarks/bezier_modes.py）
+BEZIER_BASES = {'log': log_bernstein_matrix, 'power': bernstein_matrix}
+POWER_MAX_DEGREE = 100
+# executor='auto' 只在多核且每个块平均至少有这么多次乘加（曲线数 × 采样点数 × 控制点数）时使用线程池，
+# 否则线程池每个任务的开销超过计算量的 10%。benchmarks/batch_eval.py --calibrate 测得 3 万到 22 万，取偏大的值
+THREAD_MIN_WORK = 200000
+
+
+def curve_nodes(num_control_points, degree, node_type='open_uniform'):
+    """Knot vector of a B-spline: clamped uniform on [0, 1], or periodic with unit spacing."""
+    if node_type == 'open_uniform':
+        return clamped_uniform_nodes(num_control_points, degree)
+    if node_type == 'periodic':
+        return np.arange(num_control_points + degree + 1, dtype=float) - degree
+    raise ValueError(f"Unknown node type {node_type!r}, expected one of {NODE_TYPES}")
+
+
+def _basis(kind, length, degree, node_type, num_points, mode):
+    # 同一 (类型, 控制点数, 次数) 的所有曲线共用一个基矩阵
+    if kind == 'bezier':
+        if mode is None:
+            mode = 'power' if length - 1 <= POWER_MAX_DEGREE else 'log'
+        return BEZIER_BASES[mode](length - 1, np.linspace(0, 1, num_points))
+    nodes = curve_nodes(length, degree, node_type)
+    u = np.linspace(nodes[degree], nodes[-degree - 1], num_points)
+    return cached_basis_matrix(nodes, degree, u, include_end=True)
+
+
+def _evaluate_chunk(basis, nets):
+    # (m, n) 基矩阵乘以 k 条曲线的 (k, n, dim) 控制点 -> (k, m, dim)，一次矩阵乘法
+    k, n, dim = nets.shape
+    result = basis @ nets.transpose(1, 0, 2).reshape(n, k * dim)
+    return np.asarray(result).reshape(-1, k, dim).transpose(1, 0, 2)
+
+
+def plan_chunks(lengths, degrees, chunk_size):
+    """
+    Group curves with the same number of control points and degree and split every
+    group into chunks of at most chunk_size curves.
+
+    Returns:
+    - list of (length, degree, indices) with indices an int64 array of curve numbers
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    degrees = np.broadcast_to(np.asarray(degrees, dtype=np.int64), lengths.shape)
+    keys = np.stack((lengths, degrees), axis=1)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    order = np.argsort(inverse.ravel(), kind='stable')
+    bounds = np.searchsorted(inverse.ravel()[order], np.arange(len(unique) + 1))
+    chunks = []
+    for (length, degree), start, stop in zip(unique.tolist(), bounds[:-1], bounds[1:]):
+        for chunk_start in range(start, stop, chunk_size):
+            chunks.append((length, degree, order[chunk_start:min(chunk_start + chunk_size, stop)]))
+    return chunks
+
+
+def _gather(points, offsets, length, indices):
+    # 从扁平点数组中取出 indices 这些（长度同为 length 的）曲线，形状 (k, length, dim)
+    return points[offsets[indices][:, None] + np.arange(length)]
+
+
+def _thread_task(points, offsets, out, kind, node_type, mode, chunk):
+    length, degree, indices = chunk
+    basis = _basis(kind, length, degree, node_type, out.shape[1], mode)
+    out[indices] = _evaluate_chunk(basis, _gather(points, offsets, length, indices))
+    return len(indices)
+
+
+# 工作进程中附加到共享输出缓冲区，由 _init_process 设置
+_process = {}
+
+
+def _init_process(name, shape):
+    memory = shared_memory.SharedMemory(name=name)
+    _process['memory'] = memory
+    _process['out'] = np.ndarray(shape, dtype=float, buffer=memory.buf)
+
+
+def _process_task(nets, kind, node_type, mode, length, degree, indices):
+    out = _process['out']
+    out[indices] = _evaluate_chunk(_basis(kind, length, degree, node_type, out.shape[1], mode), nets)
+    return len(indices)
+
+
+def evaluate_curves(control_nets, num_points=100, kind='bezier', degree=3, node_type='open_uniform',
+                    offsets=None, executor='auto', workers=None, chunk_size=256, out=None, mode=None):
+    """
+    Evaluate many independent curves at num_points evenly spaced parameter values each.
+
+    Curves with the same number of control points (and degree) share one basis matrix,
+    so every chunk of up to chunk_size of them is evaluated with a single matrix product.
+    Chunks run in the calling thread, on a thread pool (NumPy releases the GIL inside the
+    products) or on a process pool writing into shared memory, and all results land in
+    one preallocated buffer. The default 'auto' uses the thread pool only on several
+    cores and when the chunks average THREAD_MIN_WORK multiply-adds or more; below that,
+    the pool costs more than it saves. The process pool is never chosen automatically:
+    every task pickles its control points to a worker, which costs about as much as the
+    product itself, so on benchmarks/batch_eval.py it runs at a quarter to a third of
+    the calling thread's speed. It only pays off when the threads cannot keep the cores
+    busy.
+
+    Parameters:
+    - control_nets: List of (n_i, dim) control point arrays, or a flat (total, dim) point
+      array split by offsets (the layout of CurveIO.read_text/read_binary)
+    - num_points: Samples per curve
+    - kind: 'bezier' or 'bspline'
+    - degree: B-spline degree, an int or one per curve; ignored for Bezier curves
+    - node_type: B-spline knot vector, 'open_uniform' (clamped) or 'periodic'
+    - offsets: Group boundaries when control_nets is a flat point array
+    - executor: 'auto', 'thread', 'process' or None to run in the calling thread
+    - workers: Pool size, default os.cpu_count()
+    - chunk_size: Maximum number of curves per task
+    - out: Optional (num_curves, num_points, dim) float64 array to write into
+    - mode: Bezier basis, one of BEZIER_BASES; default 'power' up to degree
+      POWER_MAX_DEGREE and 'log' above. Ignored for B-splines
+
+    Returns:
+    - (num_curves, num_points, dim) array of curve points
+    """
+    if kind not in CURVE_KINDS:
+        raise ValueError(f"Unknown curve kind {kind!r}, expected one of {CURVE_KINDS}")
+    if mode is not None and mode not in BEZIER_BASES:
+        raise ValueError(f"Unknown Bezier basis mode {mode!r}, expected one of {sorted(BEZIER_BASES)}")
+    if offsets is None:
+        nets = [np.asarray(net, dtype=float) for net in control_nets]
+        lengths = np.array([len(net) for net in nets], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        points = np.concatenate(nets) if nets else np.empty((0, 2))
+    else:
+        points = np.asarray(control_nets, dtype=float)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        lengths = np.diff(offsets)
+
+    num_curves, dim = len(lengths), points.shape[1]
+    degrees = np.full(num_curves, -1) if kind == 'bezier' else np.broadcast_to(degree, (num_curves,))
+    if kind == 'bspline' and num_curves and np.any(lengths <= degrees):
+        raise ValueError("A B-spline needs more control points than its degree.")
+    if out is None:
+        out = np.empty((num_curves, num_points, dim))
+    elif out.shape != (num_curves, num_points, dim):
+        raise ValueError(f"out has shape {out.shape}, expected {(num_curves, num_points, dim)}")
+    chunks = plan_chunks(lengths, degrees, chunk_size)
+    if executor == 'auto':
+        work = num_points * int(lengths.sum())
+        threads = (workers or os.cpu_count() or 1) > 1 and len(chunks) > 1
+        executor = 'thread' if threads and work >= THREAD_MIN_WORK * len(chunks) else None
+
+    if executor is None:
+        for chunk in chunks:
+            _thread_task(points, offsets, out, kind, node_type, mode, chunk)
+    elif executor == 'thread':
+        with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+            list(pool.map(lambda chunk: _thread_task(points, offsets, out, kind, node_type, mode, chunk), chunks))
+    elif executor == 'process':
+        memory = shared_memory.SharedMemory(create=True, size=max(out.nbytes, 1))
+        try:
+            shared = np.ndarray(out.shape, dtype=float, buffer=memory.buf)
+            with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_init_process,
+                                     initargs=(memory.name, out.shape)) as pool:
+                futures = [pool.submit(_process_task, _gather(points, offsets, length, indices), kind, node_type,
+                                       mode, length, degree, indices) for length, degree, indices in chunks]
+                for future in futures:
+                    future.result()
+            out[...] = shared
+            del shared
+        finally:
+            memory.close()
+            memory.unlink()
+    else:
+        raise ValueError(f"Unknown executor {executor!r}, expected 'auto', 'thread', 'process' or None")
+    return out
@@ -0,0 +1,351 @@
+"""
+Headless batch rendering of the Bezier and B-spline animations.
+
+The frame tables of every clip are computed once in the parent process and copied into
+one shared memory block that the workers of a single process pool attach to when they
+start, so every table exists once however many workers there are; the pool serves all
+clips of a run.
+Each worker builds a clip's animation figure on the Agg backend the first time it gets
+one of its chunks and keeps it for the rest of the clip. PNG frames are written by the
+workers themselves; for GIF/MP4 the rendered chunks are fed to a single encoder in frame
+order as they arrive, with at most a few chunks in flight, so a clip is never held in
+memory. Like FuncAnimation with blit=True, the static part of the figure is drawn once
+per worker and clip, and each frame only redraws the artists returned by the
+animation's update function.
+
+Usage (one clip per control point group of a text or .bzp file):
+    python BatchRender.py bezier data.txt clips --format gif --workers 4
+    python BatchRender.py bspline data.txt clips --format mp4 --node-type open_uniform
+"""
+import os
+import shutil
+import subprocess
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import matplotlib
+import numpy as np
+from PIL import Image, GifImagePlugin
+
+from AnimationData import bezier_frame_tables, bspline_frame_tables
+
+FORMATS = ('frames', 'gif', 'mp4')
+
+
+def prepare_scene(kind, control_points, num_frames=100, degree=3, node_type='periodic'):
+    """
+    Precompute everything a worker needs to render one clip.
+
+    Parameters:
+    - kind: 'bezier' or 'bspline'
+    - control_points: (n, 2) control points
+    - num_frames: Number of frames of the clip
+    - degree, node_type: B-spline degree and knot vector type, ignored for 'bezier'
+
+    Returns:
+    - scene dict, passed to the workers once
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    scene = {'kind': kind, 'control_points': control_points, 'num_frames': num_frames}
+    if kind == 'bezier':
+        scene['tables'] = bezier_frame_tables(control_points, num_frames)
+    elif kind == 'bspline':
+        from BSplineAnimation import create_nodes
+        nodes = create_nodes(len(control_points), degree, node_type)
+        scene.update(degree=degree, node_type=node_type,
+                     tables=bspline_frame_tables(control_points, nodes, degree, num_frames))
+    else:
+        raise ValueError(f"Unknown animation kind {kind!r}, expected 'bezier' or 'bspline'")
+    return scene
+
+
+def build_figure(scene):
+    """Create the animation figure of a scene; returns (fig, update)."""
+    if scene['kind'] == 'bezier':
+        from BezierAnimation import create_bezier_animation
+        fig, update, _, _ = create_bezier_animation(scene['control_points'], scene['tables'])
+        return fig, update
+
+    import matplotlib.pyplot as plt
+    from BSplineAnimation import setup_bspline_animation
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    update, _ = setup_bspline_animation(ax1, ax2, scene['control_points'], scene['degree'], scene['num_frames'],
+                                        scene['node_type'], scene['tables'])
+    fig.tight_layout()
+    return fig, update
+
+
+def _share_scenes(scenes):
+    # 把所有场景（及其 tables）中的数组复制到一块共享内存，场景里只留下 (偏移, 形状, 类型) 描述
+    arrays = []
+
+    def describe(mapping):
+        described = {}
+        for key, value in mapping.items():
+            if isinstance(value, dict):
+                described[key] = describe(value)
+            elif isinstance(value, np.ndarray):
+                offset = sum(array.nbytes for array in arrays)
+                arrays.append(value)
+                described[key] = ('shared', offset, value.shape, value.dtype.str)
+            else:
+                described[key] = value
+        return described
+
+    described = [describe(scene) for scene in scenes]
+    memory = shared_memory.SharedMemory(create=True, size=max(sum(array.nbytes for array in arrays), 1))
+    offset = 0
+    for array in arrays:
+        np.ndarray(array.shape, array.dtype, buffer=memory.buf, offset=offset)[...] = array
+        offset += array.nbytes
+    return memory, described
+
+
+def _attach(described, buffer):
+    # _share_scenes 的逆过程：数组是共享内存的视图，不复制
+    scene = {}
+    for key, value in described.items():
+        if isinstance(value, dict):
+            scene[key] = _attach(value, buffer)
+        elif isinstance(value, tuple) and value[:1] == ('shared',):
+            _, offset, shape, dtype = value
+            scene[key] = np.ndarray(shape, dtype, buffer=buffer, offset=offset)
+        else:
+            scene[key] = value
+    return scene
+
+
+# 每个工作进程附加到场景共享内存，由 _init_worker 设置；figures 按片段序号缓存图表
+_worker = {}
+
+
+def _init_worker(name, scenes, dpi):
+    # 工作进程不需要显示器；后端只在这里切换，导入本模块不改变调用方的后端
+    matplotlib.use('Agg')
+    memory = shared_memory.SharedMemory(name=name)
+    _worker.update(memory=memory, scenes=scenes, dpi=dpi, figures={})
+
+
+def _clip_figure(clip):
+    # 片段按顺序渲染，换到新片段时关闭上一个片段的图表
+    figures = _worker['figures']
+    if clip not in figures:
+        import matplotlib.pyplot as plt
+        for fig, _, _ in figures.values():
+            plt.close(fig)
+        figures.clear()
+        # 与 FuncAnimation 的 blit 相同：静态部分只绘制一次并保存，每帧只重绘 update 返回的艺术家对象
+        fig, update = build_figure(_attach(_worker['scenes'][clip], _worker['memory'].buf))
+        fig.set_dpi(_worker['dpi'])
+        for artist in update(0):
+            artist.set_animated(True)
+        fig.canvas.draw()
+        figures[clip] = fig, update, fig.canvas.copy_from_bbox(fig.bbox)
+    return figures[clip]
+
+
+def _render_chunk(clip, start, stop, frames_dir):
+    # 渲染片段 clip 的 [start, stop) 帧；输出目录模式下直接写 PNG，否则返回 RGBA 字节交给编码器
+    fig, update, background = _clip_figure(clip)
+    began = time.perf_counter()
+    frames = []
+    for frame in range(start, stop):
+        fig.canvas.restore_region(background)
+        for artist in update(frame):
+            fig.draw_artist(artist)
+        buffer = fig.canvas.buffer_rgba()
+        size = (buffer.shape[1], buffer.shape[0])
+        if frames_dir is None:
+            frames.append((size, bytes(buffer)))
+        else:
+            Image.frombuffer('RGBA', size, buffer, 'raw', 'RGBA', 0, 1).convert('RGB').save(
+                os.path.join(frames_dir, f'frame_{frame:05d}.png'))
+    return os.getpid(), stop - start, time.perf_counter() - began, frames
+
+
+class FFmpegEncoder:
+    """Pipe raw RGBA frames into ffmpeg, which writes an MP4 or GIF file."""
+
+    def __init__(self, path, size, fps):
+        command = [matplotlib.rcParams['animation.ffmpeg_path'], '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{size[0]}x{size[1]}', '-r', str(fps), '-i', '-']
+        if path.endswith('.mp4'):
+            # yuv420p 要求宽高为偶数
+            command += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-c:v', 'libx264', '-pix_fmt', 'yuv420p']
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+
+    def write(self, size, data):
+        self.process.stdin.write(data)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+class GifEncoder:
+    """
+    Write a looping GIF one frame at a time with Pillow, for when ffmpeg is not installed.
+
+    All frames share the adaptive palette of the first frame, so nothing but the output
+    file grows with the number of frames.
+    """
+
+    def __init__(self, path, size, fps):
+        self.file = open(path, 'wb')
+        self.duration = round(1000 / fps)
+        self.palette = None
+
+    def write(self, size, data):
+        image = Image.frombuffer('RGBA', size, data, 'raw', 'RGBA', 0, 1).convert('RGB')
+        if self.palette is None:
+            self.palette = image.quantize(256)
+            for chunk in GifImagePlugin.getheader(self.palette, None, {'loop': 0, 'duration': self.duration})[0]:
+                self.file.write(chunk)
+        frame = image.quantize(palette=self.palette, dither=Image.Dither.NONE)
+        for chunk in GifImagePlugin.getdata(frame, (0, 0), duration=self.duration):
+            self.file.write(chunk)
+
+    def close(self):
+        self.file.write(b';')
+        self.file.close()
+
+
+def _open_encoder(path, size, fps):
+    ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+    if path.endswith('.mp4'):
+        if ffmpeg is None:
+            raise RuntimeError("MP4 output requires ffmpeg on PATH (or rcParams['animation.ffmpeg_path'])")
+        return FFmpegEncoder(path, size, fps)
+    return FFmpegEncoder(path, size, fps) if ffmpeg else GifEncoder(path, size, fps)
+
+
+@contextmanager
+def render_pool(scenes, workers=None, dpi=100):
+    """
+    Start the worker processes for a list of prepared scenes, as a context manager.
+
+    The arrays of all scenes are copied once into shared memory; the workers receive
+    only their layout and view the tables of the clip they draw. Pass the pool to
+    render with the index of the clip. Leaving the with block shuts the pool down and
+    frees the shared memory.
+
+    Parameters:
+    - scenes: List of prepare_scene results
+    - workers: Number of worker processes, default os.cpu_count()
+    - dpi: Resolution of the rendered figures
+
+    Yields:
+    - ProcessPoolExecutor
+    """
+    memory, described = _share_scenes(scenes)
+    try:
+        with ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=_init_worker,
+                                 initargs=(memory.name, described, dpi)) as pool:
+            yield pool
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def render(scene, output, workers=None, chunk_size=10, fps=25, dpi=100, pool=None, clip=0):
+    """
+    Render a prepared scene without a display.
+
+    Parameters:
+    - scene: Result of prepare_scene
+    - output: Path ending in .gif or .mp4, or a directory for PNG frames
+    - workers: Number of worker processes, default os.cpu_count()
+    - chunk_size: Frames per task sent to a worker
+    - fps: Frame rate of the GIF/MP4 file
+    - dpi: Resolution of the rendered figure, ignored with pool
+    - pool: render_pool whose scenes[clip] is scene; default a pool for this scene alone
+    - clip: Index of scene in the scenes of pool
+
+    Returns:
+    - dict with frames, seconds, fps and per-worker {pid: {'frames', 'seconds', 'fps'}}
+    """
+    if pool is None:
+        with render_pool([scene], workers, dpi) as pool:
+            return render(scene, output, workers, chunk_size, fps, dpi, pool, 0)
+    workers = workers or os.cpu_count() or 1
+    num_frames = scene['num_frames']
+    frames_dir = None
+    if not output.endswith(('.gif', '.mp4')):
+        frames_dir = output
+        os.makedirs(frames_dir, exist_ok=True)
+
+    per_worker = {}
+    encoder = None
+
+    def collect(future):
+        nonlocal encoder
+        pid, count, seconds, frames = future.result()
+        stats = per_worker.setdefault(pid, {'frames': 0, 'seconds': 0.0})
+        stats['frames'] += count
+        stats['seconds'] += seconds
+        for size, data in frames:
+            if encoder is None:
+                encoder = _open_encoder(output, size, fps)
+            encoder.write(size, data)
+
+    began = time.perf_counter()
+    try:
+        # 按顺序提交、按顺序取回；最多 2 * workers 个块在途，内存占用与片段长度无关
+        pending = deque()
+        for start in range(0, num_frames, chunk_size):
+            pending.append(pool.submit(_render_chunk, clip, start, min(start + chunk_size, num_frames), frames_dir))
+            if len(pending) >= 2 * workers:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+    finally:
+        if encoder is not None:
+            encoder.close()
+    seconds = time.perf_counter() - began
+
+    for stats in per_worker.values():
+        stats['fps'] = stats['frames'] / stats['seconds'] if stats['seconds'] else 0.0
+    return {'frames': num_frames, 'seconds': seconds, 'fps': num_frames / seconds, 'workers': per_worker}
+
+
+def main():
+    import argparse
+
+    from CurveIO import read_binary, read_text
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('kind', choices=('bezier', 'bspline'))
+    parser.add_argument('input', help="Control point file, text or .bzp; one clip per group")
+    parser.add_argument('output_dir')
+    parser.add_argument('--format', choices=FORMATS, default='gif')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=10)
+    parser.add_argument('--fps', type=int, default=25)
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--degree', type=int, default=3)
+    parser.add_argument('--node-type', choices=('periodic', 'open_uniform'), default='periodic')
+    args = parser.parse_args()
+
+    points, offsets = read_binary(args.input) if args.input.endswith('.bzp') else read_text(args.input)
+    os.makedirs(args.output_dir, exist_ok=True)
+    scenes = [prepare_scene(args.kind, points[int(start):int(stop)], args.frames, args.degree, args.node_type)
+              for start, stop in zip(offsets[:-1], offsets[1:])]
+    # 整个运行只启动一次进程池，各片段按序号在同一批工作进程中渲染
+    with render_pool(scenes, args.workers, args.dpi) as pool:
+        for index, scene in enumerate(scenes):
+            name = f'{args.kind}_{index:05d}'
+            output = os.path.join(args.output_dir, name if args.format == 'frames' else f'{name}.{args.format}')
+            stats = render(scene, output, args.workers, args.chunk_size, args.fps, pool=pool, clip=index)
+            print(f"{output}: {stats['frames']} frames in {stats['seconds']:.2f} s ({stats['fps']:.1f} fps, "
+                  f"precompute {scene['tables']['precompute_time'] * 1e3:.2f} ms)")
+            for pid, worker in sorted(stats['workers'].items()):
+                print(f"  worker {pid}: {worker['frames']} frames, {worker['fps']:.1f} fps")
+
+
+if __name__ == '__main__':
+    main()
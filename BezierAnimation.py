@@ -1,23 +1,29 @@
+from math import comb
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import ticker
-from matplotlib.animation import FuncAnimation
-from scipy.special import comb
+from AnimationData import FrameTimer, bezier_frame_tables
+from BezierEval import evaluate_bezier
 
 def bernstein_basis(n, i, t):
     return comb(n, i) * (t ** i) * ((1 - t) ** (n - i))
 
-def bezier_curve(control_points, t):
-    n = len(control_points) - 1
-    curve_point = np.zeros(2)
-    for i in range(n + 1):
-        basis = bernstein_basis(n, i, t)
-        curve_point += basis * control_points[i]
-    return curve_point
+def bezier_curve(control_points, t, mode='casteljau'):
+    # 求值方式见 BezierEval.BEZIER_MODES，高次曲线可选 'log'
+    return evaluate_bezier(control_points, t, mode)[0]
+
+def create_bezier_animation(control_points, tables=None):
+    # 创建图表并返回 (fig, update, init_animation, timer)；tables 可由调用方预先算好（见 BatchRender）
+    import matplotlib.pyplot as plt
+    from matplotlib import ticker
 
-def animate_bezier_curve(control_points):
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))  # 创建一个包含两个子图的图表
-    t_values = np.linspace(0, 1, 100)
+    # 动画开始前一次性算好每一帧的 de Casteljau 金字塔、伯恩斯坦基函数值和曲线点，帧回调只做索引
+    if tables is None:
+        tables = bezier_frame_tables(control_points, 100)
+    t_values, levels, bernstein = tables['t'], tables['levels'], tables['bernstein']
+    curve_points, values = tables['curve'], tables['values']
+    timer = FrameTimer(tables['precompute_time'])
+    n = len(control_points) - 1
 
     # 设置子图1：动画曲线
     ax1.set_xlabel('x')
@@ -47,8 +53,7 @@ def animate_bezier_curve(control_points):
     ax2.set_ylabel('Basis Function Value')
     ax2.set_title('Bernstein Basis Functions')
     for i in range(len(control_points)):
-        t = np.linspace(0, 1, 100)
-        ax2.plot(t, bernstein_basis(len(control_points) - 1, i, t), label=f'B_{i}^{len(control_points)-1}(t)')
+        ax2.plot(t_values, bernstein[:, i], label=f'B_{i}^{n}(t)')
     line_t = ax2.axvline(x=t_values[0], color='gray', linestyle='--', linewidth=1)  # 在子图2中添加竖线
 
 
@@ -64,28 +69,20 @@ def animate_bezier_curve(control_points):
     b_labels = [ax2.text(0.02, .9 - i / len(control_points) * .9, '', transform=ax2.transAxes,
                          fontsize=10, verticalalignment='top') for i in range(len(control_points))]
 
-    def update(frame, control_points, curve_line, aux_lines, t_values, moving_points_plots, line_t):
+    def update(frame):
         t = t_values[frame]
-        points = [control_points]
-
-        # Compute De Casteljau's algorithm steps
-        while len(points[-1]) > 1:
-            next_points = []
-            for i in range(len(points[-1]) - 1):
-                next_point = (1 - t) * points[-1][i] + t * points[-1][i + 1]
-                next_points.append(next_point)
-            points.append(next_points)
-
-        # Update curve
-        curve_point = bezier_curve(control_points, t)
-        curve_line.set_data(np.append(curve_line.get_xdata(), curve_point[0]),
-                            np.append(curve_line.get_ydata(), curve_point[1]))
-
-        # Update auxiliary lines and moving points
+        pyramid = levels[frame]
+
+        # 曲线取预分配缓冲区的前 frame + 1 个点
+        curve_point = curve_points[frame]
+        curve_line.set_data(curve_points[:frame + 1, 0], curve_points[:frame + 1, 1])
+
+        # Update auxiliary lines and moving points, level i has n + 1 - i points
         for i, line in enumerate(aux_lines):
-            if i > 0 and i < len(points) - 1:
-                line.set_data([p[0] for p in points[i]], [p[1] for p in points[i]])
-                moving_points_plots[i].set_data([p[0] for p in points[i]], [p[1] for p in points[i]])
+            if 0 < i < n:
+                points = pyramid[i, :n + 1 - i]
+                line.set_data(points[:, 0], points[:, 1])
+                moving_points_plots[i].set_data(points[:, 0], points[:, 1])
             else:
                 line.set_data([], [])
                 moving_points_plots[i].set_data([], [])
@@ -96,16 +93,16 @@ def animate_bezier_curve(control_points):
         moving_points_plots[-1].set_markersize(5)
 
         # Update line_t position
-        line_t.set_xdata([t_values[frame], t_values[frame]])
+        line_t.set_xdata([t, t])
 
         # Update t value text
         t_text1.set_text(f't = {t:.2f}')
         t_text2.set_text(f't = {t:.2f}')
 
         for i, label in enumerate(b_labels):
-            label.set_text(f'B_{i}^{len(control_points)-1}(t)={bernstein_basis(len(control_points)-1, i, t):.2f}')
+            label.set_text(f'B_{i}^{n}(t)={bernstein[frame, i]:.2f}')
 
-        value = sum([bernstein_basis(len(control_points)-1, i, t) * control_points[i] for i in range(len(control_points))])
+        value = values[frame]
 
         result1.set_text(f'Point=({curve_point[0]:.2f},{curve_point[1]:.2f})')
 
@@ -120,16 +117,25 @@ def animate_bezier_curve(control_points):
         # 返回一个包含需要更新的艺术家对象的可迭代对象
         return curve_line,
 
-    ani = FuncAnimation(fig, update, frames=range(len(t_values)),
-                        fargs=(control_points, curve_line, aux_lines, t_values, moving_points_plots, line_t),
+    plt.tight_layout()
+    return fig, update, init_animation, timer
+
+def animate_bezier_curve(control_points, num_frames=100):
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    tables = bezier_frame_tables(control_points, num_frames)
+    fig, update, init_animation, timer = create_bezier_animation(control_points, tables)
+    ani = FuncAnimation(fig, timer.wrap(update), frames=range(num_frames),
                         init_func=init_animation,
                         blit=True, repeat=True)
 
-    plt.tight_layout()
     plt.show()
+    print(timer.report())
 
-# 控制点
-control_points = np.array([[0, 0], [1, 2], [3, 3], [4, 1], [5, 5]])
+if __name__ == "__main__":
+    # 控制点
+    control_points = np.array([[0, 0], [1, 2], [3, 3], [4, 1], [5, 5]])
 
-# 动画显示Bezier曲线和伯恩斯坦基函数
-animate_bezier_curve(control_points)
+    # 动画显示Bezier曲线和伯恩斯坦基函数
+    animate_bezier_curve(control_points)
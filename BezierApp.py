@@ -3,8 +3,14 @@ from math import comb
 from tkinter import ttk, filedialog, messagebox
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import matplotlib.ticker as ticker
+from BezierEval import bezier_levels
+from Continuity import CONTINUITY_LEVELS, enforce_continuity
+from CurveBounds import CurveBVH
+from Flatten import flatten_in_view
+from CurveSet import CurveSet
+from PointTable import VirtualPointTable
 
 class BezierCurveApp:
     def __init__(self, root):
@@ -14,7 +20,17 @@ class BezierCurveApp:
         self.root.resizable(False, False)
 
         self.num_points = tk.IntVar()
-        self.entries = []
+        # 拼接曲线时要求的连续性
+        self.continuity = tk.StringVar(value='C1')
+        # 控制点数据模型：所有组的点连续存放，第 i 组为 model.points[offsets[i]:offsets[i + 1]]
+        self.model = CurveSet(np.empty((0, 2)), [0])
+        # 曲线与绘制折线之间允许的最大偏差，单位为屏幕像素（随缩放自动换算成数据单位）
+        self.flatness = 0.5
+        # 当前绘制的曲线、它们的包围盒层次结构，以及随视口重绘的图元
+        self.curves_points = []
+        self.bvh = None
+        self.view_artists = []
+        self.redraw_pending = False
 
         self.setup_ui()
 
@@ -38,29 +54,15 @@ class BezierCurveApp:
         self.input_frame_container = ttk.Frame(control_frame)
         self.input_frame_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        # Create a canvas object and a vertical scrollbar for scrolling it
-        self.canvas = tk.Canvas(self.input_frame_container)
-        self.scrollbar = ttk.Scrollbar(self.input_frame_container, orient="vertical", command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        # Pack the canvas and scrollbar
-        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        # Create a frame inside the canvas which will hold the input fields
-        self.scrollable_frame = ttk.Frame(self.canvas)
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(
-                scrollregion=self.canvas.bbox("all")
-            )
-        )
-
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        # Scrollable table of the control points; only the visible rows have widgets
+        self.point_table = VirtualPointTable(self.input_frame_container)
+        self.point_table.pack(fill=tk.BOTH, expand=True)
 
         self.plot_button = ttk.Button(control_frame, text="Plot", command=self.plot_curve)
         self.plot_button.pack(anchor=tk.CENTER, padx=5, pady=5)
 
+        ttk.Combobox(control_frame, textvariable=self.continuity, values=CONTINUITY_LEVELS, state="readonly",
+                     width=8, justify="center").pack(anchor=tk.CENTER, padx=5, pady=5)
         self.connect_button = ttk.Button(control_frame, text="Connect", command=self.connect_curve)
         self.connect_button.pack(anchor=tk.CENTER, padx=5, pady=5)
 
@@ -69,6 +71,9 @@ class BezierCurveApp:
 
         self.figure, self.ax = plt.subplots(figsize=(8, 6))
         self.canvas_plot = FigureCanvasTkAgg(self.figure, master=plot_frame)
+        # 工具栏提供缩放和平移，视口变化时只重绘可见的曲线
+        self.toolbar = NavigationToolbar2Tk(self.canvas_plot, plot_frame)
+        self.toolbar.update()
         self.canvas_plot.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         self.ax.set_xlabel('x')
         self.ax.set_ylabel('y')
@@ -91,101 +96,54 @@ class BezierCurveApp:
 
     def create_input_fields(self):
         self.curves = [self.num_points.get()]
+        self.set_model(CurveSet(np.full((self.curves[0], 2), np.nan), [0, self.curves[0]]))
+
+    def set_model(self, model):
+        # 直接替换数据模型并刷新表格；NaN 表示尚未输入的值
+        self.model = model
+        self.curves = model.sizes.tolist()
         self.create_fields()
 
     def create_fields(self):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-
-        self.entries = []
-
-        # Iterate through each group's number of points
-        for group_index, num_points in enumerate(self.curves):
-            entry = []
-
-            # Create a label for the group
-            group_label = ttk.Label(self.scrollable_frame, text=f"Group {group_index}",
-                                    font=("Helvetica", 10, "bold"))
-            group_label.pack(anchor=tk.W, pady=5)
-            for i in range(num_points):
-                frame = ttk.Frame(self.scrollable_frame)
-                frame.pack(anchor=tk.W, pady=2)
-                ttk.Label(frame, padding=(5, 0)).pack(side=tk.LEFT)
-                y_entry = ttk.Entry(frame, width=10, validate="key",
-                                    validatecommand=(self.root.register(self.validate_real_number), '%P'), justify="center")
-                y_entry.pack(side=tk.RIGHT, padx=(5, 0))
-                ttk.Label(frame, text="Y").pack(side=tk.RIGHT)
-                x_entry = ttk.Entry(frame, width=10, validate="key",
-                                    validatecommand=(self.root.register(self.validate_real_number), '%P'), justify="center")
-                x_entry.pack(side=tk.RIGHT, padx=(5, 0))
-                ttk.Label(frame, text="X").pack(side=tk.RIGHT)
-                entry.append((x_entry, y_entry))
-            self.entries.append(entry)
-            # Add some vertical space between groups
-            # spacer = ttk.Frame(self.scrollable_frame, height=10)
-            # spacer.pack(anchor=tk.W, pady=10)
-
+        # 表格直接编辑 self.model.points，输入框只为可见的行创建并在滚动时复用
+        self.point_table.set_model(self.model.points, self.model.offsets)
 
     def Import_data(self):
-        file_path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        file_path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("Binary control points", "*.bzp"),
+                                                          ("All files", "*.*")])
         if file_path:
             try:
-                with open(file_path, 'r') as file:
-                    content = file.read().strip()
-                    groups = content.split("\n\n")  # Split by empty lines to separate groups
-
-                    # Clear any previous data
-                    self.curves = []
-
-                    for group_index, group in enumerate(groups):
-                        lines = group.strip().splitlines()
-                        if len(lines) < 2:
-                            messagebox.showwarning("Warning",
-                                                   f"At least two points are required in group {group_index + 1}.")
-                            return
-
-                        num_points_in_group = len(lines)
-                        self.curves.append(num_points_in_group)  # Append number of points in this group
-
-                    self.create_fields()
-
-                    for group_index, group in enumerate(groups):
-                        lines = group.strip().splitlines()
-                        for i, line in enumerate(lines):
-                            parts = line.strip().split()
-                            if len(parts) != 2:
-                                messagebox.showwarning("Warning",
-                                                       f"Invalid format in line {i + 1} of group {group_index + 1}: {line}")
-                                return
-                            x_value, y_value = parts
-                            self.entries[group_index][i][0].insert(0, x_value)
-                            self.entries[group_index][i][1].insert(0, y_value)
-
-                    # Now you can use self.num_points as an array containing number of points in each group
-                    print("Number of points in each group:", self.curves)
+                # 文本文件按块流式解析，二进制文件通过 memmap 直接读取
+                model = CurveSet.read(file_path)
+                small_groups = np.flatnonzero(model.sizes < 2)
+                if len(small_groups):
+                    messagebox.showwarning("Warning",
+                                           f"At least two points are required in group {small_groups[0] + 1}.")
+                    return
+            except ValueError as e:
+                messagebox.showwarning("Warning", str(e))
+                return
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load file: {e}")
+                return
+
+            # 表格会原地编辑模型，复制一份可写的（memmap 是只读的）
+            self.set_model(model.copy())
+            # Now you can use self.curves as an array containing number of points in each group
+            print("Number of points in each group:", self.curves)
 
     def Export_data(self):
         # 弹出文件对话框，让用户选择保存位置和文件名
-        file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt"),
+                                                                                     ("Binary control points", "*.bzp"),
+                                                                                     ("All files", "*.*")])
         if file_path:
+            # 检查所有点都已输入
+            if self.collect_points() is None:
+                return
             try:
-                # 打开文件准备写入
-                with open(file_path, 'w') as file:
-                    # 遍历每组数据
-                    for group_index, num_points_in_group in enumerate(self.curves):
-                        # 获取当前组的数据
-                        group_data = []
-                        for i in range(num_points_in_group):
-                            # 提取每个点的 x 和 y 值
-                            x_value = self.entries[group_index][i][0].get()
-                            y_value = self.entries[group_index][i][1].get()
-                            # 将 x 和 y 值格式化并添加到组数据中
-                            group_data.append(f"{x_value} {y_value}")
-
-                        # 将当前组的数据写入文件，每组数据之间用空行分隔
-                        file.write("\n".join(group_data) + "\n\n")
+                # 二进制格式：头部 + 连续的 float64 点数组 + 组偏移表；文本格式每组数据之间用空行分隔
+                self.model.write(file_path)
 
                 messagebox.showinfo("Success", "Data exported successfully.")
 
@@ -193,67 +151,31 @@ class BezierCurveApp:
                 messagebox.showerror("Error", f"Failed to export data: {e}")
 
     def collect_points(self):
-        curves_points = []
-        for index, group_entries in enumerate(self.entries):
-            points = []
-            for x_entry, y_entry in group_entries:
-                x = x_entry.get()
-                y = y_entry.get()
-                if not x or not y:
-                    messagebox.showerror("Error", "Please enter all the points.")
-                    return
-                points.append(np.array([float(x), float(y)]))
-
-            if len(points) <= 1:
-                messagebox.showerror("Error", "Please enter some points.")
-                return
-
-            curves_points.append(points)
-        return curves_points
+        # 输入框的修改已实时写入 self.model，这里只需检查并复制一份；按组取点得到的是视图
+        if np.isnan(self.model.points).any():
+            messagebox.showerror("Error", "Please enter all the points.")
+            return
+        if np.any(self.model.sizes <= 1):
+            messagebox.showerror("Error", "Please enter some points.")
+            return
+        return self.model.copy()
 
     def plot_curve(self, curves_points=None):
         if curves_points is None:
             curves_points = self.collect_points()
+            if curves_points is None:
+                return
 
         self.ax.clear()
-        t_values = np.linspace(0, 1, 100)
-        offset = [(-10, 10), (10, -10)]
-        plot_color = ['blue', 'green', 'purple']
-        for index, points in enumerate(curves_points):
-            curves = [[] for _ in range(len(points) - 1)]
-
-            # 使用 Bernstein 函数计算贝塞尔曲线点
-            for t in t_values:
-                for n in range(2, len(points)+1):
-                    curves[n-2].append([sum([Bernstein_basis(n-1, i, t) * points[i+k] for i in range(0, n)])
-                                       for k in range(0, len(points)-n+1)])
-
-            # # 使用 de Casteljau 函数计算贝塞尔曲线点
-            # for t in t_values:
-            #     curves[0].append([np.array((1 - t) * points[i] + t * points[i + 1]) for i in range(len(points) - 1)])
-            #     for i in range(1, len(curves)):
-            #         curves[i].append(
-            #             [np.array((1 - t) * curves[i - 1][-1][j] + t * curves[i - 1][-1][j + 1])
-            #              for j in range(len(curves[i - 1][-1]) - 1)]
-            #         )
-
-            for i, point in enumerate(points):
-                self.ax.scatter(*point, color='red', s=20)
-                self.ax.annotate(f'{chr(80 + index)}{i}', (point[0], point[1]),
-                                 textcoords="offset points",
-                                 xytext=offset[index % len(offset)], ha='center')
-
-            for i in range(len(curves)):
-                for k in range(len(curves[i][0])):
-                    c = np.array(curves[i])[:, k]
-                    self.ax.plot(c[:, 0], c[:, 1], linestyle='--', linewidth=.7)
-
-            for k in range(len(curves[0][0])):
-                c = np.array(curves[0])[:, k]
-                self.ax.plot(c[:, 0], c[:, 1], linewidth=.7, color='black')
-
-            c = np.array(curves[-1])[:, 0]
-            self.ax.plot(c[:, 0], c[:, 1], linewidth=2, color=plot_color[index%len(plot_color)])
+        # 每条曲线的精确包围盒放入层次结构，视口变化时只查询、求值并绘制可见的曲线
+        self.curves_points = curves_points
+        self.bvh = CurveBVH.from_bezier_curves(self.curves_points)
+        self.view_artists = []
+        all_points = self.curves_points.points
+        low, high = all_points.min(axis=0), all_points.max(axis=0)
+        margin = 0.05 * np.where(high > low, high - low, 1.0)
+        self.ax.set_xlim(low[0] - margin[0], high[0] + margin[0])
+        self.ax.set_ylim(low[1] - margin[1], high[1] + margin[1])
 
         self.ax.set_xlabel('x')
         self.ax.set_ylabel('y')
@@ -265,6 +187,10 @@ class BezierCurveApp:
         # 设置网格线的样式为虚线
         self.ax.grid(True, linestyle='--')
 
+        # ax.clear() 会清掉回调，每次重新连接
+        self.ax.callbacks.connect('xlim_changed', self.schedule_view_update)
+        self.ax.callbacks.connect('ylim_changed', self.schedule_view_update)
+        self.update_view()
         self.canvas_plot.draw()
 
         # 绘图完成后保存为PNG文件，设置dpi以提高分辨率
@@ -272,25 +198,68 @@ class BezierCurveApp:
         self.figure.savefig(save_file_path, dpi=300, bbox_inches='tight')
         messagebox.showinfo("Info", f"Plot saved as {save_file_path}")
 
+    def schedule_view_update(self, ax=None):
+        # x、y 范围的变化通常成对出现（平移时还会连续出现），合并为一次空闲时的重绘
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.root.after_idle(self.update_view)
+
+    def update_view(self):
+        self.redraw_pending = False
+        for artist in self.view_artists:
+            artist.remove()
+        self.view_artists = []
+        if self.bvh is None:
+            return
+        # 颜色循环从头开始，缩放前后各构造线颜色不变
+        self.ax.set_prop_cycle(None)
+
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        view = np.array([[x0, y0], [x1, y1]])
+        # 一个像素对应的数据长度，平直度换算到当前缩放下
+        width, height = self.ax.get_window_extent().size
+        tolerance = self.flatness * min((x1 - x0) / max(width, 1), (y1 - y0) / max(height, 1))
+        offset = [(-10, 10), (10, -10)]
+        plot_color = ['blue', 'green', 'purple']
+        artists = self.view_artists
+
+        for index in self.bvh.query(view):
+            points = self.curves_points[index]
+            n = len(points) - 1
+
+            artists.append(self.ax.scatter(points[:, 0], points[:, 1], color='red', s=20))
+            for i, point in enumerate(points):
+                artists.append(self.ax.annotate(f'{chr(80 + index)}{i}', (point[0], point[1]),
+                                                textcoords="offset points",
+                                                xytext=offset[index % len(offset)], ha='center'))
+
+            # 只细分视口内的部分；各可见段之间用 NaN 断开
+            runs = flatten_in_view(points[None], view, tolerance)
+            if not runs:
+                continue
+            t_values = np.concatenate([np.append(t, np.nan) for _, t, _ in runs])[:-1]
+            levels = bezier_levels(points, t_values)
+
+            for level in range(1, n + 1):
+                for k in range(n + 1 - level):
+                    c = levels[level, :, k]
+                    artists.extend(self.ax.plot(c[:, 0], c[:, 1], linestyle='--', linewidth=.7))
+
+            artists.extend(self.ax.plot(points[:, 0], points[:, 1], linewidth=.7, color='black'))
+
+            c = levels[n, :, 0]
+            artists.extend(self.ax.plot(c[:, 0], c[:, 1], linewidth=2, color=plot_color[index%len(plot_color)]))
+        self.canvas_plot.draw_idle()
+
     def connect_curve(self):
         curves_points = self.collect_points()
-        # 完成多段Bezier曲线的拼接，确保一阶导数连续性
-        for i in range(len(curves_points) - 1):
-            # 当前段的最后一个点
-            curves_points[i][-1] = curves_points[i + 1][0]
-
-            p3 = curves_points[i][-1]
-            # 下一段的第一个点
-            q0 = curves_points[i + 1][0]
-            # 当前段的倒数第二个点
-            p2 = curves_points[i][-2]
-            # 下一段的第二个点
-            q1 = curves_points[i + 1][1]
-
-            # 确保两段曲线在拼接点处的切线方向相同
-            p3_p2_direction = p3 - p2
-            new_q1 = q0 + p3_p2_direction
-            curves_points[i + 1][1] = new_q1
+        if curves_points is None:
+            return
+        # 所有拼接点一次求解：与逐段拼接相同，只移动后一段开头的内部控制点，已画好的前一段不变；切向量按两段的次数比例缩放
+        continuity = self.continuity.get()
+        errors = enforce_continuity(curves_points, continuity)
+        if len(errors):
+            print(f"{continuity} error at each junction:", errors[:, CONTINUITY_LEVELS.index(continuity)])
 
         self.plot_curve(curves_points)
 
@@ -0,0 +1,167 @@
+from functools import lru_cache
+from math import comb, lgamma
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def binomial_row(n):
+    """Read-only array of the binomial coefficients C(n, 0..n), cached per degree."""
+    # 超出 float64 范围的系数记为 inf，而不是在转换时抛出 OverflowError
+    row = np.array([float(c) if c.bit_length() <= 1023 else np.inf for c in map(comb, [n] * (n + 1), range(n + 1))])
+    row.flags.writeable = False
+    return row
+
+
+def bernstein_matrix(n, t):
+    """
+    Evaluate all Bernstein polynomials of degree n at once.
+
+    Parameters:
+    - n: Degree
+    - t: Parameter values, array of length m
+
+    Returns:
+    - (m, n + 1) array with entry [s, i] = C(n, i) * t[s]^i * (1 - t[s])^(n - i)
+    """
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    exponents = np.arange(n + 1)
+    t_powers = t[:, None] ** exponents
+    s_powers = (1 - t)[:, None] ** exponents[::-1]
+    return binomial_row(n) * t_powers * s_powers
+
+
+def bezier_levels(control_points, t):
+    """
+    All de Casteljau levels of one or several Bezier curves of the same degree.
+
+    Level l holds the n + 1 - l points obtained after l interpolation steps, i.e. the
+    points of the degree-l Bezier curves of P[k..k+l]; level n is the curve itself.
+
+    Parameters:
+    - control_points: (n + 1, dim) control points, or (curves, n + 1, dim) for a batch
+    - t: Parameter values, array of length m
+
+    Returns:
+    - (n + 1, m, n + 1, dim) array, or (curves, n + 1, m, n + 1, dim) for a batch;
+      slots past the n + 1 - l valid points of level l are NaN
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    batched = control_points.ndim == 3
+    if not batched:
+        control_points = control_points[None]
+
+    num_curves, count, dim = control_points.shape
+    levels = np.full((num_curves, count, len(t), count, dim), np.nan)
+    levels[:, 0] = control_points[:, None]
+    t = t[None, :, None, None]
+    for level in range(1, count):
+        previous = levels[:, level - 1, :, :count - level + 1]
+        levels[:, level, :, :count - level] = (1 - t) * previous[:, :, :-1] + t * previous[:, :, 1:]
+    return levels if batched else levels[0]
+
+
+def bezier_levels_groups(groups, t):
+    """
+    De Casteljau levels for a ragged list of control polygons.
+
+    Polygons with the same number of points are stacked and evaluated in a single
+    bezier_levels call. The result list is in input order, one (n + 1, m, n + 1, dim)
+    array per polygon.
+    """
+    groups = [np.asarray(points, dtype=float) for points in groups]
+    by_length = {}
+    for index, points in enumerate(groups):
+        by_length.setdefault(len(points), []).append(index)
+
+    results = [None] * len(groups)
+    for indices in by_length.values():
+        levels = bezier_levels(np.stack([groups[i] for i in indices]), t)
+        for i, level in zip(indices, levels):
+            results[i] = level
+    return results
+
+
+@lru_cache(maxsize=None)
+def log_binomial_row(n):
+    """Read-only array of log C(n, 0..n); finite for any degree, unlike binomial_row."""
+    row = np.array([lgamma(n + 1) - lgamma(i + 1) - lgamma(n - i + 1) for i in range(n + 1)])
+    row.flags.writeable = False
+    return row
+
+
+def log_bernstein_matrix(n, t):
+    """
+    Same values as bernstein_matrix, computed in log space.
+
+    C(n, i), t^i and (1 - t)^(n - i) are combined as a sum of logarithms before a single
+    exponentiation, so nothing overflows or underflows prematurely at degrees of several
+    hundred or more.
+    """
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    exponents = np.arange(n + 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_t = np.where(exponents == 0, 0.0, exponents * np.log(t)[:, None])
+        log_s = np.where(exponents == n, 0.0, (n - exponents) * np.log1p(-t)[:, None])
+    return np.exp(log_binomial_row(n) + log_t + log_s)
+
+
+def _de_casteljau(control_points, t, dtype=float):
+    # 所有参数值同时做 de Casteljau 迭代，只保留当前一层
+    control_points = np.asarray(control_points, dtype=dtype)
+    t = np.asarray(t, dtype=dtype)[:, None, None]
+    points = np.repeat(control_points[None], t.shape[0], axis=0)
+    for count in range(len(control_points) - 1, 0, -1):
+        points[:, :count] = (1 - t) * points[:, :count] + t * points[:, 1:count + 1]
+    return points[:, 0]
+
+
+def _horner(control_points, t):
+    # Bernstein 形式的 Horner 求值：t <= 0.5 时按 t/(1-t) 展开，否则按 (1-t)/t 反向展开，保证比值不超过 1
+    n = len(control_points) - 1
+    coefficients = binomial_row(n)[:, None] * control_points
+    result = np.empty((len(t), control_points.shape[1]))
+    low = t <= 0.5
+    for mask, numerator, base, c in ((low, t, 1 - t, coefficients), (~low, 1 - t, t, coefficients[::-1])):
+        ratio = (numerator[mask] / base[mask])[:, None]
+        acc = np.repeat(c[-1:], len(ratio), axis=0)
+        for i in range(n - 1, -1, -1):
+            acc = acc * ratio + c[i]
+        result[mask] = acc * (base[mask] ** n)[:, None]
+    return result
+
+
+BEZIER_MODES = {
+    # 精度最高，O(n^2) 次线性插值
+    'casteljau': _de_casteljau,
+    # 参考实现，不是快速模式：每个采样点 O(n)，不构造 (m, n + 1) 的基矩阵，内存最省；
+    # 逐次的 Python 循环使它比两种矩阵模式都慢，高次时二项式系数会溢出
+    'horner': _horner,
+    # 对数空间的 Bernstein 系数，数百次时仍有限，也是这时最快的
+    'log': lambda control_points, t: log_bernstein_matrix(len(control_points) - 1, t) @ control_points,
+    # 显式幂次求和加一次矩阵乘法，低次到约 100 次时最快
+    'power': lambda control_points, t: bernstein_matrix(len(control_points) - 1, t) @ control_points,
+}
+
+
+def evaluate_bezier(control_points, t, mode='casteljau'):
+    """
+    Evaluate a Bezier curve at an array of parameter values.
+
+    Parameters:
+    - control_points: (n + 1, dim) control points
+    - t: Parameter values in [0, 1], array of length m
+    - mode: One of BEZIER_MODES; 'casteljau' is the accurate default, 'power' the fastest
+      up to degree ~100 and 'log' above that (it also stays finite for degrees of several
+      hundred). 'horner' is a reference implementation, not a fast mode: it needs no
+      (m, n + 1) basis matrix but is slower than both (see benchmarks/bezier_modes.py)
+
+    Returns:
+    - (m, dim) array of curve points
+    """
+    if mode not in BEZIER_MODES:
+        raise ValueError(f"Unknown Bezier evaluation mode {mode!r}, expected one of {sorted(BEZIER_MODES)}")
+    control_points = np.asarray(control_points, dtype=float)
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    return BEZIER_MODES[mode](control_points, t)
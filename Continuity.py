@@ -0,0 +1,180 @@
+from math import comb
+
+import numpy as np
+
+CONTINUITY_LEVELS = ('C0', 'G1', 'C1', 'C2')
+# 'next'：只移动后一段的内部控制点；'both'：两侧的内部控制点一起移动，总改动量最小
+MOVE_MODES = ('next', 'both')
+
+
+def _junctions(curves, intervals):
+    # 每个拼接点两侧的信息：前一段 A 的末点 a_m 与后一段 B 的起点 b_0 的下标、两段的次数和参数区间长度
+    if np.any(curves.degrees >= 0):
+        raise ValueError("Continuity is enforced between Bezier curves only")
+    sizes = curves.sizes
+    if np.any(sizes < 2):
+        raise ValueError("Every Bezier curve needs at least two control points")
+    if intervals is None:
+        intervals = np.ones(len(curves))
+    intervals = np.broadcast_to(np.asarray(intervals, dtype=float), (len(curves),))
+    ends, starts = curves.offsets[1:-1] - 1, curves.offsets[1:-1]
+    return ends, starts, sizes[:-1] - 1, sizes[1:] - 1, intervals[:-1], intervals[1:]
+
+
+def _derivative_terms(ends, starts, m, n, h_a, h_b, order):
+    # A 在末端与 B 在起点的 order 阶导数之差写成 sum(coef * points[index])，形状均为 (junctions, 2 * (order + 1))。
+    # d^k/du^k 在端点处为 m!/(m-k)!/h^k 乘以控制点的 k 阶差分；次数低于 order 的一侧导数为 0
+    steps = np.arange(order + 1)
+    difference = np.array([(-1.0) ** (order - i) * comb(order, i) for i in steps])
+    falling_m = np.prod([np.maximum(m - i, 0) for i in range(order)], axis=0).astype(float)
+    falling_n = np.prod([np.maximum(n - i, 0) for i in range(order)], axis=0).astype(float)
+    coef_a = (falling_m / h_a ** order)[:, None] * difference
+    coef_b = -(falling_n / h_b ** order)[:, None] * difference
+    # 系数为 0 的项可能越过曲线的边界，把下标换成拼接点本身
+    index_a = np.where(coef_a != 0, ends[:, None] - order + steps, ends[:, None])
+    index_b = np.where(coef_b != 0, starts[:, None] + steps, starts[:, None])
+    return np.concatenate((index_a, index_b), axis=1), np.concatenate((coef_a, coef_b), axis=1)
+
+
+def _unit(vectors):
+    length = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0)
+
+
+def _constraints(points, continuity, ends, starts, m, n, h_a, h_b):
+    # 线性约束块 (index, coef, free)：每个坐标分量各一行，sum(coef[r, t] * points[index[r, t], 分量]) = 0；
+    # free[r] 是 'next' 模式下满足该约束的后一段内部控制点，后一段是直线时为 -1（没有可动的内部点）
+    index, coef = _derivative_terms(ends, starts, m, n, h_a, h_b, 1)
+    if continuity == 'G1':
+        # G1 即按当前两侧导数长度之比缩放后的 C1，约束仍是线性的；某侧切向量为 0 时按 C1 处理
+        incoming = np.linalg.norm(np.einsum('jt,jtd->jd', coef[:, :2], points[index[:, :2]]), axis=1)
+        outgoing = np.linalg.norm(np.einsum('jt,jtd->jd', coef[:, 2:], points[index[:, 2:]]), axis=1)
+        ratio = np.divide(incoming, outgoing, out=np.ones_like(incoming), where=(incoming > 0) & (outgoing > 0))
+        coef = coef * np.concatenate((np.ones_like(coef[:, :2]), np.repeat(ratio[:, None], 2, axis=1)), axis=1)
+    blocks = [(index, coef, np.where(n >= 2, starts + 1, -1))]
+    if continuity == 'C2':
+        # 只有一个内部控制点的二次曲线（以及直线）无法在两端同时满足 C1 和 C2，这些拼接点只做到 C1
+        index, coef = _derivative_terms(ends, starts, m, n, h_a, h_b, 2)
+        capable = (m >= 3) & (n >= 3)
+        blocks.append((index[capable], coef[capable], starts[capable] + 2))
+    return blocks
+
+
+def _solve(points, offsets, blocks, move):
+    # 两种模式都直接求解带状稀疏方程组，没有迭代
+    from scipy import sparse
+    from scipy.sparse.linalg import spsolve
+
+    total, dim = points.shape
+    # 各块补齐到相同的项数，补上的项系数为 0
+    width = max(index.shape[1] for index, _, _ in blocks)
+    index = np.concatenate([np.pad(index, ((0, 0), (0, width - index.shape[1])), mode='edge')
+                            for index, _, _ in blocks])
+    coef = np.concatenate([np.pad(coef, ((0, 0), (0, width - coef.shape[1]))) for _, coef, _ in blocks])
+    free = np.concatenate([free for _, _, free in blocks])
+    if move == 'next':
+        # 每个约束恰好由一个后一段的内部控制点满足，这些点互不相同，方程组是方阵；
+        # 按拼接点排序后它是下三角的，前一段保持不动，与逐个拼接时只改后一段相同
+        index, coef, free = index[free >= 0], coef[free >= 0], free[free >= 0]
+    if not len(index):
+        return
+    # 各坐标分量互不耦合：第 r 行的第 d 个分量对应稀疏矩阵的第 r * dim + d 行
+    rows = np.broadcast_to(np.arange(len(index) * dim).reshape(-1, 1, dim), index.shape + (dim,))
+    columns = index[:, :, None] * dim + np.arange(dim)
+    values = np.broadcast_to(coef[:, :, None], index.shape + (dim,))
+    matrix = sparse.csr_matrix((values.ravel(), (rows.ravel(), columns.ravel())), shape=(len(index) * dim, total * dim))
+
+    flat = points.reshape(-1)
+    residual = matrix @ flat
+    if move == 'next':
+        variables = (free[:, None] * dim + np.arange(dim)).ravel()
+        flat[variables] += spsolve(matrix[:, variables].tocsc(), -residual)
+        return
+    # 'both'：所有内部控制点都可动，取改动量最小的解 delta = A^T (A A^T)^-1 (-r)；
+    # 没有可动控制点的约束（两段直线之间）无法满足，去掉后 A A^T 仍是带状的
+    interior = np.ones(total, dtype=bool)
+    interior[offsets[:-1]] = False
+    interior[offsets[1:] - 1] = False
+    variables = np.flatnonzero(np.repeat(interior, dim))
+    reduced = matrix[:, variables].tocsr()
+    reduced.eliminate_zeros()
+    keep = np.diff(reduced.indptr) > 0
+    if not keep.any():
+        return
+    reduced = reduced[keep]
+    flat[variables] += reduced.T @ spsolve((reduced @ reduced.T).tocsc(), -residual[keep])
+
+
+def continuity_errors(curves, intervals=None):
+    """
+    Continuity defects at the junctions of consecutive Bezier curves of a CurveSet.
+
+    Parameters:
+    - curves: CurveSet of Bezier curves; curve i + 1 is joined to the end of curve i
+    - intervals: Parameter length of every curve (one value or one per curve), default 1
+
+    Returns:
+    - (junctions, 4) array, one column per level of CONTINUITY_LEVELS: the gap |a_m - b_0|,
+      the angle between the end tangents in radians (NaN where a tangent vanishes), and
+      the norms of the first and second derivative differences with respect to the
+      global parameter
+    """
+    ends, starts, m, n, h_a, h_b = _junctions(curves, intervals)
+    points = curves.points
+    errors = np.empty((len(ends), 4))
+    errors[:, 0] = np.linalg.norm(points[ends] - points[starts], axis=1)
+    incoming = points[ends] - points[ends - 1]
+    outgoing = points[starts + 1] - points[starts]
+    # 2 atan2(|u - v|, |u + v|) 在夹角接近 0 或 π 时都准确
+    u, v = _unit(incoming), _unit(outgoing)
+    angle = 2 * np.arctan2(np.linalg.norm(u - v, axis=1), np.linalg.norm(u + v, axis=1))
+    vanishing = (np.linalg.norm(incoming, axis=1) == 0) | (np.linalg.norm(outgoing, axis=1) == 0)
+    errors[:, 1] = np.where(vanishing, np.nan, angle)
+    for order in (1, 2):
+        index, coef = _derivative_terms(ends, starts, m, n, h_a, h_b, order)
+        errors[:, 1 + order] = np.linalg.norm(np.einsum('jt,jtd->jd', coef, points[index]), axis=1)
+    return errors
+
+
+def enforce_continuity(curves, continuity='C1', intervals=None, move='next'):
+    """
+    Join consecutive Bezier curves of a CurveSet with the given continuity, in place.
+
+    Every curve's end point is moved onto the start of the next one (C0). For G1, C1 and
+    C2 the conditions at all junctions form one banded sparse system, solved directly at
+    once. By default (move='next') each junction is met by moving only the first interior
+    control points of the next curve (q1, and q2 for C2), as connecting one curve after
+    another does, so a curve is never changed by the curves that follow it. With
+    move='both' all interior control points may move and the smallest total displacement
+    is taken; prefer it for C2 on long paths, where the one-sided fix-up amplifies from
+    curve to curve (see benchmarks/continuity.py). Derivatives are taken with respect to
+    a global parameter in which curve i spans intervals[i]: the end derivative of a
+    degree-m curve is m / h times its last control point difference, so the tangents are
+    scaled by the degree and interval ratio of the two sides. G1 is C1 up to the current
+    ratio of the two end derivative lengths, which keeps the conditions linear. C2 is
+    only imposed between curves of degree 3 or more; a quadratic has a single inner
+    control point and cannot meet C1 and C2 at both ends, so junctions next to
+    quadratics are made C1. A straight segment has no interior point to move, so with
+    move='next' a junction into a line stays C0, and with 'both' a junction between two
+    lines does; such defects show up in the returned errors.
+
+    Parameters:
+    - curves: CurveSet of Bezier curves, modified in place
+    - continuity: 'C0', 'G1', 'C1' or 'C2'
+    - intervals: Parameter length of every curve (one value or one per curve), default 1
+    - move: 'next' to keep every curve fixed but the one after each junction, 'both' to
+      spread the change over the interior points on both sides
+
+    Returns:
+    - (junctions, 4) continuity errors after the fix-up, see continuity_errors
+    """
+    if continuity not in CONTINUITY_LEVELS:
+        raise ValueError(f"Unknown continuity {continuity!r}, expected one of {CONTINUITY_LEVELS}")
+    if move not in MOVE_MODES:
+        raise ValueError(f"Unknown move mode {move!r}, expected one of {MOVE_MODES}")
+    ends, starts, m, n, h_a, h_b = _junctions(curves, intervals)
+    points = curves.points
+    points[ends] = points[starts]
+    if continuity != 'C0' and len(ends):
+        _solve(points, curves.offsets, _constraints(points, continuity, ends, starts, m, n, h_a, h_b), move)
+    return continuity_errors(curves, intervals)
@@ -0,0 +1,153 @@
+import numpy as np
+
+
+def hull_bounds(segments):
+    """Boxes of the control polygons, (..., 2, dim) as [min, max]; they contain the curves."""
+    segments = np.asarray(segments, dtype=float)
+    return np.stack((segments.min(axis=-2), segments.max(axis=-2)), axis=-2)
+
+
+def _evaluate_at(segments, t):
+    # 每段在各自的参数 t[s, r] 处求值（批量 de Casteljau），返回 (k, roots, dim)
+    points = np.repeat(segments[:, None], t.shape[1], axis=1)
+    t = t[:, :, None, None]
+    for count in range(segments.shape[1] - 1, 0, -1):
+        points = (1 - t) * points[:, :, :count] + t * points[:, :, 1:count + 1]
+    return points[:, :, 0]
+
+
+def _derivative_roots(segments):
+    # 导数为 0 的参数（各坐标轴分别求），仅支持次数 <= 3；返回 (k, dim, 2)，无效处为 NaN
+    degree = segments.shape[1] - 1
+    difference = np.diff(segments, axis=1)
+    roots = np.full(segments.shape[:1] + segments.shape[2:] + (2,), np.nan)
+    if degree == 2:
+        d0, d1 = difference[:, 0], difference[:, 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roots[..., 0] = d0 / (d0 - d1)
+    elif degree == 3:
+        # B'(t) ∝ a t^2 + b t + c
+        d0, d1, d2 = difference[:, 0], difference[:, 1], difference[:, 2]
+        a, b, c = d0 - 2 * d1 + d2, 2 * (d1 - d0), d0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            root = np.sqrt(b * b - 4 * a * c)
+            quadratic = np.abs(a) > 1e-12 * (np.abs(b) + np.abs(c))
+            roots[..., 0] = np.where(quadratic, (-b + root) / (2 * a), -c / b)
+            roots[..., 1] = np.where(quadratic, (-b - root) / (2 * a), np.nan)
+    roots[~((roots > 0) & (roots < 1))] = np.nan
+    return roots
+
+
+def bezier_bounds(segments, subdivisions=3):
+    """
+    Tight axis-aligned boxes of a batch of Bezier segments.
+
+    For degrees up to 3 the box is exact: the end points plus the curve at the roots of
+    the derivative of each coordinate. Higher degrees use the control hull boxes of the
+    segment split into 2^subdivisions pieces, which converge quadratically to the curve.
+
+    Parameters:
+    - segments: (k, n + 1, dim) control points
+
+    Returns:
+    - (k, 2, dim) boxes as [min, max]
+    """
+    segments = np.asarray(segments, dtype=float)
+    if segments.shape[1] - 1 <= 3:
+        roots = _derivative_roots(segments)
+        k, dim = segments.shape[0], segments.shape[2]
+        t = roots.reshape(k, -1)
+        extrema = _evaluate_at(segments, np.where(np.isnan(t), 0.0, t))
+        # 第 a 个坐标只取对该坐标求得的根
+        own_axis = np.repeat(np.eye(dim, dtype=bool), roots.shape[-1], axis=0)
+        valid = ~np.isnan(t)[:, :, None] & own_axis[None]
+        ends = segments[:, [0, -1]]
+        low = np.minimum(ends.min(axis=1), np.where(valid, extrema, np.inf).min(axis=1))
+        high = np.maximum(ends.max(axis=1), np.where(valid, extrema, -np.inf).max(axis=1))
+        return np.stack((low, high), axis=1)
+
+    from Flatten import _split_half
+    pieces = segments
+    for _ in range(subdivisions):
+        left, right = _split_half(pieces)
+        pieces = np.concatenate((left, right))
+    boxes = hull_bounds(pieces).reshape(2 ** subdivisions, len(segments), 2, -1)
+    return np.stack((boxes[:, :, 0].min(axis=0), boxes[:, :, 1].max(axis=0)), axis=1)
+
+
+def _morton(centres):
+    # 两个坐标各量化到 16 位并交错，得到 Z 序编码
+    low, high = centres.min(axis=0), centres.max(axis=0)
+    scaled = (centres - low) / np.where(high > low, high - low, 1.0)
+    codes = np.zeros(len(centres), dtype=np.uint64)
+    quantized = np.minimum(scaled * 65535, 65535).astype(np.uint64)
+    for bit in range(16):
+        for axis in range(min(2, centres.shape[1])):
+            codes |= ((quantized[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(2 * bit + axis)
+    return codes
+
+
+class CurveBVH:
+    """
+    Bounding volume hierarchy over the boxes of curve segments, for viewport queries.
+
+    Leaves are sorted along a Z-order curve of their box centres and merged pairwise
+    into an implicit binary tree, one box array per level. A query walks down the
+    levels keeping only the nodes that overlap the view, so it touches O(visible * log n)
+    boxes.
+
+    Parameters:
+    - boxes: (k, 2, dim) leaf boxes as [min, max], e.g. from bezier_bounds
+    """
+
+    def __init__(self, boxes):
+        boxes = np.asarray(boxes, dtype=float)
+        self.boxes = boxes
+        self.order = np.argsort(_morton(boxes.mean(axis=1)), kind='stable') if len(boxes) else np.zeros(0, int)
+        self.levels = [boxes[self.order]]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            if len(level) % 2:
+                level = np.concatenate((level, level[-1:]))
+            self.levels.append(np.stack((np.minimum(level[0::2, 0], level[1::2, 0]),
+                                         np.maximum(level[0::2, 1], level[1::2, 1])), axis=1))
+
+    @classmethod
+    def from_bezier_curves(cls, curves):
+        """One leaf per Bezier curve of a ragged list of control polygons; leaf i is curve i."""
+        boxes = np.empty((len(curves), 2, 2))
+        by_length = {}
+        for index, points in enumerate(curves):
+            by_length.setdefault(len(points), []).append(index)
+        for indices in by_length.values():
+            boxes[indices] = bezier_bounds(np.stack([np.asarray(curves[i], dtype=float) for i in indices]))
+        return cls(boxes)
+
+    @property
+    def bounds(self):
+        """Box around all leaves."""
+        return self.levels[-1][0]
+
+    def query(self, view):
+        """
+        Indices of the leaves whose boxes overlap view.
+
+        Parameters:
+        - view: (2, dim) box as [min, max], e.g. the axes limits
+
+        Returns:
+        - Sorted int array of leaf indices
+        """
+        view = np.asarray(view, dtype=float)
+        if not len(self.boxes):
+            return np.zeros(0, dtype=np.int64)
+        nodes = np.zeros(1, dtype=np.int64)
+        for depth in range(len(self.levels) - 1, -1, -1):
+            level = self.levels[depth]
+            if depth < len(self.levels) - 1:
+                nodes = np.concatenate((2 * nodes, 2 * nodes + 1))
+                nodes = nodes[nodes < len(level)]
+            boxes = level[nodes]
+            overlap = np.all((boxes[:, 0] <= view[1]) & (boxes[:, 1] >= view[0]), axis=1)
+            nodes = nodes[overlap]
+        return np.sort(self.order[nodes[nodes < len(self.order)]])
@@ -0,0 +1,105 @@
+from functools import lru_cache
+
+import numpy as np
+
+from BSplineEval import find_span
+from KnotOps import transform_control_points, refinement_matrix
+
+
+@lru_cache(maxsize=256)
+def _decomposition(node_bytes, degree):
+    nodes = np.frombuffer(node_bytes, dtype=float)
+    domain = nodes[degree:len(nodes) - degree]
+    breaks = np.unique(domain)
+    # 定义域内（含两端）每个不同节点都插到重数 degree，每个区间就成为一段 Bezier
+    multiplicity = np.count_nonzero(nodes[:, None] == breaks, axis=0)
+    new_nodes = np.sort(np.concatenate((nodes, np.repeat(breaks, np.maximum(degree - multiplicity, 0)))))
+    matrix = refinement_matrix(nodes, degree, new_nodes)
+    first = find_span(new_nodes, breaks[:-1]) - degree
+    rows = first[:, None] + np.arange(degree + 1)
+    for array in (breaks, rows, matrix.data, matrix.indices, matrix.indptr):
+        array.flags.writeable = False
+    return breaks, rows, matrix
+
+
+def bezier_decomposition(nodes, degree):
+    """
+    Cached knot-insertion data that splits any B-spline on nodes into Bezier segments.
+
+    Returns:
+    - breaks: (segments + 1,) distinct knots of the domain [nodes[degree], nodes[-degree - 1]]
+    - rows: (segments, degree + 1) indices of each segment's control points in the refined curve
+    - matrix: CSR refinement matrix, refined control points = matrix @ control_points
+    """
+    nodes = np.ascontiguousarray(nodes, dtype=float)
+    return _decomposition(nodes.tobytes(), int(degree))
+
+
+def bspline_to_bezier(control_points, nodes, degree):
+    """
+    Decompose a B-spline into its polynomial pieces as Bezier curves, exactly.
+
+    Every distinct knot in the domain is inserted up to multiplicity degree; the
+    refinement matrix depends only on the knot vector and is cached, so converting other
+    control points on the same knots is a single sparse product.
+
+    Parameters:
+    - control_points: (n, dim) control points, or (curves, n, dim) for curves sharing nodes
+    - nodes: Knot vector, clamped or not
+    - degree: Degree of the B-spline
+
+    Returns:
+    - breaks: (segments + 1,) parameter values where the segments meet; segment i covers
+      [breaks[i], breaks[i + 1]] with its own parameter t in [0, 1]
+    - segments: (..., segments, degree + 1, dim) Bezier control points
+    """
+    breaks, rows, matrix = bezier_decomposition(nodes, degree)
+    return breaks, transform_control_points(matrix, control_points)[..., rows, :]
+
+
+def elevate_bezier(control_points, degree):
+    """Control points of the same Bezier curve written with the given higher degree."""
+    points = np.asarray(control_points, dtype=float)
+    for n in range(points.shape[-2] - 1, degree):
+        # Q_i = i / (n + 1) * P_{i-1} + (1 - i / (n + 1)) * P_i
+        ratio = (np.arange(n + 2) / (n + 1))[:, None]
+        zeros = np.zeros_like(points[..., :1, :])
+        padded = np.concatenate((zeros, points, zeros), axis=-2)
+        points = ratio * padded[..., :-1, :] + (1 - ratio) * padded[..., 1:, :]
+    return points
+
+
+def bezier_to_bspline(segments, breaks=None):
+    """
+    Write a chain of Bezier curves as one clamped B-spline, exactly.
+
+    Segments of lower degree are degree-elevated to the highest degree first. Where a
+    segment starts at the end point of the previous one they share that control point
+    and the junction knot has multiplicity degree; otherwise it has multiplicity
+    degree + 1 and the B-spline jumps there.
+
+    Parameters:
+    - segments: List of (n_i + 1, dim) control points, or a (segments, n + 1, dim) array
+    - breaks: (segments + 1,) increasing parameter values of the junctions, default 0, 1, 2, ...
+
+    Returns:
+    - nodes, control_points, degree of the B-spline
+    """
+    segments = [np.asarray(segment, dtype=float) for segment in segments]
+    degree = max(len(segment) for segment in segments) - 1
+    segments = [elevate_bezier(segment, degree) for segment in segments]
+    breaks = np.arange(len(segments) + 1, dtype=float) if breaks is None else np.asarray(breaks, dtype=float)
+    if len(breaks) != len(segments) + 1:
+        raise ValueError(f"Expected {len(segments) + 1} breaks, got {len(breaks)}")
+
+    nodes = [np.repeat(breaks[0], degree + 1)]
+    points = [segments[0]]
+    for segment, start in zip(segments[1:], breaks[1:-1]):
+        if np.allclose(segment[0], points[-1][-1]):
+            nodes.append(np.repeat(start, degree))
+            points.append(segment[1:])
+        else:
+            nodes.append(np.repeat(start, degree + 1))
+            points.append(segment)
+    nodes.append(np.repeat(breaks[-1], degree + 1))
+    return np.concatenate(nodes), np.concatenate(points), degree
@@ -0,0 +1,153 @@
+import io
+import re
+
+import numpy as np
+
+# 二进制控制点文件（.bzp）布局，全部为小端序：
+#   头部 32 字节：magic b'BZPT'、版本 uint32、组数 uint64、点数 uint64、偏移表位置 uint64
+#   点数组：num_points x 2 个 float64，紧接在头部之后
+#   偏移表：num_groups + 1 个 uint64，第 i 组为 points[offsets[i]:offsets[i + 1]]
+# 偏移表放在最后，这样转换文本文件时可以边解析边写入点数据
+BINARY_MAGIC = b'BZPT'
+BINARY_VERSION = 1
+_HEADER = np.dtype([('magic', 'S4'), ('version', '<u4'), ('num_groups', '<u8'),
+                    ('num_points', '<u8'), ('offsets_at', '<u8')])
+
+# 组与组之间以空行分隔
+_SEPARATOR = re.compile(rb'\r?\n(?:[ \t]*\r?\n)+')
+
+
+def read_binary(path):
+    """
+    Open a .bzp file without reading it into memory.
+
+    Returns:
+    - points: (num_points, 2) read-only float64 memmap
+    - offsets: (num_groups + 1,) read-only uint64 memmap of group boundaries
+    """
+    header = np.fromfile(path, dtype=_HEADER, count=1)
+    if len(header) != 1 or header['magic'][0] != BINARY_MAGIC:
+        raise ValueError(f"{path} is not a binary control point file")
+    if header['version'][0] != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary control point file version {header['version'][0]}")
+    num_groups, num_points = int(header['num_groups'][0]), int(header['num_points'][0])
+    if num_points:
+        points = np.memmap(path, dtype='<f8', mode='r', offset=_HEADER.itemsize, shape=(num_points, 2))
+    else:
+        points = np.empty((0, 2))
+    offsets = np.memmap(path, dtype='<u8', mode='r', offset=int(header['offsets_at'][0]), shape=(num_groups + 1,))
+    return points, offsets
+
+
+class BinaryWriter:
+    """Append groups of points to a .bzp file; the offset table is written by close()."""
+
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.file.write(bytes(_HEADER.itemsize))
+        self.offsets = [0]
+
+    def write(self, points, sizes):
+        """Append consecutive groups: points is (sum(sizes), 2), sizes the number of points per group."""
+        self.file.write(np.ascontiguousarray(points, dtype='<f8').tobytes())
+        self.offsets.extend((self.offsets[-1] + np.cumsum(sizes, dtype=np.uint64)).tolist())
+
+    def close(self):
+        offsets_at = self.file.tell()
+        self.file.write(np.asarray(self.offsets, dtype='<u8').tobytes())
+        header = np.array([(BINARY_MAGIC, BINARY_VERSION, len(self.offsets) - 1, self.offsets[-1], offsets_at)],
+                          dtype=_HEADER)
+        self.file.seek(0)
+        self.file.write(header.tobytes())
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_binary(path, points, offsets):
+    with BinaryWriter(path) as writer:
+        writer.write(points, np.diff(np.asarray(offsets, dtype=np.int64)))
+
+
+def iter_text_chunks(path, chunk_size=1 << 20, min_points=2):
+    """
+    Stream a blank-line-separated text file ("x y" per line) in chunks of whole groups.
+
+    Each chunk of complete groups is parsed by a single np.loadtxt call, so only the group
+    boundaries are handled in Python.
+
+    Yields:
+    - points: (k, 2) float64 array of the chunk's points
+    - sizes: list with the number of points of each group in the chunk
+    """
+    group_index = 0
+    pending = b''
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            data = pending + chunk
+            if chunk:
+                # 最后一个分隔符之后的组可能还不完整，留到下一块
+                last = None
+                for last in _SEPARATOR.finditer(data):
+                    pass
+                if last is None:
+                    pending = data
+                    continue
+                complete, pending = data[:last.start()], data[last.end():]
+            else:
+                complete, pending = data, b''
+
+            groups = [group for group in _SEPARATOR.split(complete.strip()) if group.strip()]
+            if groups:
+                sizes = [group.strip().count(b'\n') + 1 for group in groups]
+                for size in sizes:
+                    if size < min_points:
+                        raise ValueError(f"At least {min_points} points are required in group {group_index + 1}.")
+                    group_index += 1
+                points = np.loadtxt(io.BytesIO(b'\n'.join(group.strip() for group in groups)), ndmin=2)
+                if points.shape[1] != 2:
+                    raise ValueError(f"Invalid format: expected 2 values per line, found {points.shape[1]}")
+                yield points, sizes
+            if not chunk:
+                break
+
+
+def read_text(path, chunk_size=1 << 20):
+    """Parse a text control point file into (points, offsets) arrays."""
+    chunks = list(iter_text_chunks(path, chunk_size))
+    points = np.concatenate([points for points, _ in chunks]) if chunks else np.empty((0, 2))
+    sizes = np.concatenate([sizes for _, sizes in chunks]) if chunks else np.empty(0, dtype=np.int64)
+    return points, np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+
+
+def convert_text_to_binary(text_path, binary_path, chunk_size=1 << 20):
+    """Convert a text control point file to .bzp, holding at most one chunk in memory."""
+    with BinaryWriter(binary_path) as writer:
+        for points, sizes in iter_text_chunks(text_path, chunk_size):
+            writer.write(points, sizes)
+
+
+def write_text(path, points, offsets):
+    """Write groups in the text format, one "x y" line per point and an empty line after each group."""
+    with open(path, 'w') as file:
+        for start, stop in zip(offsets[:-1], offsets[1:]):
+            lines = [f"{np.format_float_positional(x, trim='-')} {np.format_float_positional(y, trim='-')}"
+                     for x, y in points[start:stop].tolist()]
+            file.write("\n".join(lines) + "\n\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a text control point file to the binary .bzp format")
+    parser.add_argument('text_path')
+    parser.add_argument('binary_path')
+    args = parser.parse_args()
+    convert_text_to_binary(args.text_path, args.binary_path)
+    points, offsets = read_binary(args.binary_path)
+    print(f"Wrote {len(offsets) - 1} groups, {len(points)} points to {args.binary_path}")
@@ -0,0 +1,214 @@
+import numpy as np
+
+from BatchEval import curve_nodes, evaluate_curves
+from BezierEval import evaluate_bezier
+from BSplineEval import evaluate_bspline
+from CurveIO import read_binary, read_text, write_binary, write_text
+
+
+class CurveSet:
+    """
+    Ragged collection of curves whose control points share one contiguous float64 buffer.
+
+    Curve i owns points[offsets[i]:offsets[i + 1]], 16 bytes per 2D point, in the same
+    (points, offsets) layout as CurveIO and BatchEval.evaluate_curves, so the arrays go to
+    the file formats and the evaluators without copying. degrees[i] is -1 for a Bezier
+    curve (of degree len - 1) and the B-spline degree otherwise; a B-spline's knot vector
+    is knots[knot_offsets[i]:knot_offsets[i + 1]], empty for Bezier curves.
+
+    Indexing a curve returns a view, so set[i][j] = (x, y) edits the buffer in place.
+    Inserting or deleting points shifts the tail of the buffer within its spare capacity,
+    which grows geometrically like a list; views taken before a reallocation no longer
+    track the set. Changing the number of points of a B-spline resets its knot vector to
+    the clamped uniform one.
+
+    Parameters:
+    - points: (total, dim) control points of all curves, used without copying if float64
+    - offsets: (k + 1,) curve boundaries
+    - degrees: B-spline degree per curve (or one for all), -1 for Bezier; default all Bezier
+    - knots, knot_offsets: Flat knot vectors and their boundaries; default clamped uniform
+    """
+
+    def __init__(self, points, offsets, degrees=None, knots=None, knot_offsets=None):
+        self._buffer = np.asarray(points, dtype=float)
+        self._size = len(self._buffer)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        count = len(self.offsets) - 1
+        if degrees is None:
+            self.degrees = np.full(count, -1, dtype=np.int64)
+        else:
+            self.degrees = np.array(np.broadcast_to(degrees, (count,)), dtype=np.int64)
+        if knots is None:
+            self.knots = np.empty(0)
+            self.knot_offsets = np.zeros(count + 1, dtype=np.int64)
+            self._reset_knots(np.flatnonzero(self.degrees >= 0))
+        else:
+            self.knots = np.asarray(knots, dtype=float)
+            self.knot_offsets = np.asarray(knot_offsets, dtype=np.int64)
+
+    @classmethod
+    def from_groups(cls, groups, degrees=None):
+        """Pack a list of (n_i, dim) control point arrays into one buffer."""
+        groups = [np.asarray(group, dtype=float) for group in groups]
+        sizes = [len(group) for group in groups]
+        points = np.concatenate(groups) if groups else np.empty((0, 2))
+        return cls(points, np.concatenate(([0], np.cumsum(sizes))), degrees)
+
+    @classmethod
+    def read(cls, path):
+        """Bezier curves of a control point file; .bzp files stay memory-mapped and read-only until modified."""
+        points, offsets = read_binary(path) if path.endswith('.bzp') else read_text(path)
+        return cls(points, offsets)
+
+    def write(self, path):
+        """Write the control points as .bzp or text, see CurveIO."""
+        if path.endswith('.bzp'):
+            write_binary(path, self.points, self.offsets)
+        else:
+            write_text(path, self.points, self.offsets)
+
+    def copy(self):
+        """Independent, writable copy."""
+        return CurveSet(self.points.copy(), self.offsets.copy(), self.degrees.copy(), self.knots.copy(),
+                        self.knot_offsets.copy())
+
+    @property
+    def points(self):
+        """(total, dim) view of all control points."""
+        return self._buffer[:self._size]
+
+    @property
+    def dim(self):
+        return self._buffer.shape[1]
+
+    @property
+    def sizes(self):
+        """Number of control points of every curve."""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self):
+        """Bytes of the arrays in use (coordinates, offsets, degrees and knots)."""
+        return (self.points.nbytes + self.offsets.nbytes + self.degrees.nbytes + self.knots.nbytes
+                + self.knot_offsets.nbytes)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, curve):
+        curve = range(len(self))[curve]
+        return self._buffer[self.offsets[curve]:self.offsets[curve + 1]]
+
+    def __iter__(self):
+        for curve in range(len(self)):
+            yield self[curve]
+
+    def degree(self, curve):
+        """Degree of a curve, len - 1 for a Bezier curve."""
+        degree = self.degrees[curve]
+        return int(degree) if degree >= 0 else int(self.offsets[curve + 1] - self.offsets[curve]) - 1
+
+    def nodes(self, curve):
+        """View of a B-spline's knot vector, None for a Bezier curve."""
+        if self.degrees[curve] < 0:
+            return None
+        return self.knots[self.knot_offsets[curve]:self.knot_offsets[curve + 1]]
+
+    def curve_of(self, index):
+        """Curve number of every point index."""
+        return np.searchsorted(self.offsets, index, side='right') - 1
+
+    def _reserve(self, size):
+        # 容量不足（或缓冲区只读，例如 .bzp 的 memmap）时按倍数扩容，插入与追加均摊 O(1)
+        if size > len(self._buffer) or not self._buffer.flags.writeable:
+            buffer = np.empty((max(size, 2 * len(self._buffer), 16), self.dim))
+            buffer[:self._size] = self.points
+            self._buffer = buffer
+
+    def _reset_knots(self, curves):
+        # 点数变化后这些 B 样条改用两端夹紧的均匀节点矢量；点数不超过次数时节点为空
+        if not len(curves):
+            return
+        sizes = self.sizes
+        pieces = [self.knots[start:stop] for start, stop in zip(self.knot_offsets[:-1], self.knot_offsets[1:])]
+        for curve in curves:
+            degree = int(self.degrees[curve])
+            pieces[curve] = curve_nodes(int(sizes[curve]), degree) if sizes[curve] > degree else np.empty(0)
+        self.knot_offsets = np.concatenate(([0], np.cumsum([len(piece) for piece in pieces]))).astype(np.int64)
+        self.knots = np.concatenate(pieces)
+
+    def insert(self, curve, index, points):
+        """Insert one (dim,) point or (m, dim) points before position index of a curve."""
+        points = np.asarray(points, dtype=float).reshape(-1, self.dim)
+        curve = range(len(self))[curve]
+        size = int(self.offsets[curve + 1] - self.offsets[curve])
+        if not 0 <= index <= size:
+            raise IndexError(f"Position {index} is outside curve {curve} of {size} points")
+        at, count = int(self.offsets[curve]) + index, len(points)
+        self._reserve(self._size + count)
+        self._buffer[at + count:self._size + count] = self._buffer[at:self._size]
+        self._buffer[at:at + count] = points
+        self._size += count
+        self.offsets[curve + 1:] += count
+        if self.degrees[curve] >= 0:
+            self._reset_knots([curve])
+
+    def append(self, curve, points):
+        """Add points at the end of a curve."""
+        curve = range(len(self))[curve]
+        self.insert(curve, int(self.offsets[curve + 1] - self.offsets[curve]), points)
+
+    def delete(self, curve, index, count=1):
+        """Remove count consecutive points of a curve starting at position index."""
+        curve = range(len(self))[curve]
+        size = int(self.offsets[curve + 1] - self.offsets[curve])
+        if not (0 <= index and count >= 0 and index + count <= size):
+            raise IndexError(f"Points {index} to {index + count - 1} are outside curve {curve} of {size} points")
+        at = int(self.offsets[curve]) + index
+        self._reserve(self._size)
+        self._buffer[at:self._size - count] = self._buffer[at + count:self._size]
+        self._size -= count
+        self.offsets[curve + 1:] -= count
+        if self.degrees[curve] >= 0:
+            self._reset_knots([curve])
+
+    def append_curve(self, points, degree=-1, nodes=None):
+        """Add a curve at the end; a B-spline without nodes gets the clamped uniform knot vector."""
+        points = np.asarray(points, dtype=float).reshape(-1, self.dim)
+        self._reserve(self._size + len(points))
+        self._buffer[self._size:self._size + len(points)] = points
+        self._size += len(points)
+        self.offsets = np.append(self.offsets, self._size)
+        self.degrees = np.append(self.degrees, degree)
+        nodes = np.empty(0) if nodes is None else np.asarray(nodes, dtype=float)
+        self.knots = np.concatenate((self.knots, nodes))
+        self.knot_offsets = np.append(self.knot_offsets, len(self.knots))
+        if degree >= 0 and not len(nodes):
+            self._reset_knots([len(self) - 1])
+
+    def evaluate(self, num_points=100, **kwargs):
+        """
+        Sample every curve at num_points evenly spaced parameter values.
+
+        A set of Bezier curves is handed to BatchEval.evaluate_curves as its flat buffer and
+        offsets (kwargs go there, e.g. executor); otherwise each curve is evaluated on its
+        own view with its knot vector.
+
+        Returns:
+        - (k, num_points, dim) array of curve points
+        """
+        if np.all(self.degrees < 0):
+            return evaluate_curves(self.points, num_points, 'bezier', offsets=self.offsets, **kwargs)
+        out = np.empty((len(self), num_points, self.dim))
+        t = np.linspace(0, 1, num_points)
+        for curve, points in enumerate(self):
+            degree = int(self.degrees[curve])
+            if degree < 0:
+                out[curve] = evaluate_bezier(points, t)
+            else:
+                if len(points) <= degree:
+                    raise ValueError("A B-spline needs more control points than its degree.")
+                nodes = self.nodes(curve)
+                u = np.linspace(nodes[degree], nodes[-degree - 1], num_points)
+                out[curve] = evaluate_bspline(points, nodes, degree, u, include_end=True)
+        return out
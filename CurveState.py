@@ -0,0 +1,172 @@
+import numpy as np
+
+from BSplineEval import clamped_uniform_nodes, evaluate_bspline
+from BezierEval import log_bernstein_matrix
+from Flatten import flatten_bezier, flatten_bspline
+
+
+class CurveState:
+    """
+    Sampled curve of an editable control polygon, re-evaluated only where it changed.
+
+    Moving a vertex marks it dirty. For B-splines only the samples inside the degree + 1
+    knot spans supported by the dirty vertices are recomputed. For Bezier curves the moved
+    vertex's Bernstein column is added as a rank-1 update, O(num_points) per vertex.
+    Adding or removing vertices or switching the curve type changes the basis, which
+    triggers a full evaluation. Nothing is evaluated while the vertices are unchanged.
+
+    With a tolerance (in pixels) the curve is flattened adaptively instead (see Flatten),
+    so the polyline has as many vertices as its shape needs on screen rather than
+    num_points. The adaptive vertices depend on the whole shape, so every change re-flattens
+    the curve.
+    """
+
+    # 连续做这么多次增量更新后重新完整求值一次，避免舍入误差累积
+    REFRESH_INTERVAL = 256
+
+    def __init__(self, curve_mode='bezier', num_points=100, degree=3, tolerance=None):
+        self.curve_mode = curve_mode
+        self.num_points = num_points
+        self.degree = degree
+        self.tolerance = tolerance
+        self.t = np.linspace(0, 1, num_points)
+
+        self.vertices = np.empty((0, 2))
+        self._points = None
+        self._curve = []
+        self._dirty = set()
+        self._old_positions = {}
+        self._stale = True
+        self._bernstein = None
+        self._nodes = None
+        self._incremental_updates = 0
+
+        self.full_evaluations = 0
+        self.partial_evaluations = 0
+        self.samples_recomputed = 0
+
+    def set_curve_mode(self, curve_mode):
+        if curve_mode != self.curve_mode:
+            self.curve_mode = curve_mode
+            self._stale = True
+
+    def set_tolerance(self, tolerance):
+        """Switch between adaptive flattening (tolerance in pixels) and the fixed grid (None)."""
+        if tolerance != self.tolerance:
+            self.tolerance = tolerance
+            self._stale = True
+
+    def set_vertices(self, vertices):
+        """Replace the whole control polygon (after adding or removing vertices)."""
+        vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+        if len(vertices) != len(self.vertices):
+            self._stale = True
+            self.vertices = vertices.copy()
+            return
+        for index in np.flatnonzero(np.any(vertices != self.vertices, axis=1)):
+            self.move_vertex(index, vertices[index])
+
+    def move_vertex(self, index, position):
+        """Move one vertex and mark it dirty."""
+        if self._stale or self._points is None:
+            self.vertices[index] = position
+            return
+        if index not in self._dirty:
+            self._dirty.add(index)
+            self._old_positions[index] = self.vertices[index].copy()
+        self.vertices[index] = position
+
+    def curve(self):
+        """Curve samples as a list of integer pixel tuples, recomputed only if something changed."""
+        if self.tolerance is not None:
+            if self._stale or self._dirty:
+                self._flatten()
+        elif self._stale:
+            self._evaluate_all()
+        elif self._dirty:
+            if self._incremental_updates >= self.REFRESH_INTERVAL:
+                self._evaluate_all()
+            elif self.curve_mode == 'bezier':
+                self._update_bezier()
+            else:
+                self._update_bspline()
+        return self._curve
+
+    def _evaluate_all(self):
+        self._dirty.clear()
+        self._old_positions = {}
+        self._stale = False
+        self._incremental_updates = 0
+        self._bernstein = None
+        self._nodes = None
+        n = len(self.vertices)
+        if self.curve_mode == 'bezier':
+            if n == 0:
+                self._points = None
+            else:
+                # 对数空间的 Bernstein 矩阵在数百个顶点时仍然稳定，同时用于之后的秩 1 更新
+                self._bernstein = log_bernstein_matrix(n - 1, self.t)
+                self._points = self._bernstein @ self.vertices
+        else:
+            if n < self.degree + 1:
+                self._points = None  # 顶点数少于 degree+1 时无法形成B样条
+            else:
+                self._nodes = clamped_uniform_nodes(n, self.degree)
+                self._points = evaluate_bspline(self.vertices, self._nodes, self.degree, self.t, include_end=True)
+        self.full_evaluations += 1
+        self.samples_recomputed += 0 if self._points is None else len(self._points)
+        self._refresh_curve()
+
+    def _flatten(self):
+        # 自适应细分：折线顶点随曲线形状变化，只能整体重新细分
+        self._dirty.clear()
+        self._old_positions = {}
+        self._stale = False
+        self._incremental_updates = 0
+        self._bernstein = None
+        self._nodes = None
+        n = len(self.vertices)
+        if self.curve_mode == 'bezier':
+            self._points = flatten_bezier(self.vertices, self.tolerance)[1] if n else None
+        elif n < self.degree + 1:
+            self._points = None  # 顶点数少于 degree+1 时无法形成B样条
+        else:
+            self._points = flatten_bspline(self.vertices, clamped_uniform_nodes(n, self.degree), self.degree,
+                                           self.tolerance)[1]
+        self.full_evaluations += 1
+        self.samples_recomputed += 0 if self._points is None else len(self._points)
+        self._refresh_curve()
+
+    def _update_bezier(self):
+        # 秩 1 更新：P(t) += B_i(t) * (新位置 - 旧位置)
+        dirty = sorted(self._dirty)
+        delta = self.vertices[dirty] - np.array([self._old_positions[i] for i in dirty])
+        self._points += self._bernstein[:, dirty] @ delta
+        self._finish_partial(len(self._points))
+
+    def _update_bspline(self):
+        # 局部支撑：顶点 i 只影响 u ∈ [T[i], T[i+degree+1]) 内的采样点
+        nodes = self._nodes
+        affected = np.zeros(len(self.t), dtype=bool)
+        for index in self._dirty:
+            start = np.searchsorted(self.t, nodes[index])
+            end = nodes[index + self.degree + 1]
+            stop = len(self.t) if end == nodes[-1] else np.searchsorted(self.t, end)
+            affected[start:stop] = True
+        self._points[affected] = evaluate_bspline(self.vertices, nodes, self.degree, self.t[affected],
+                                                  include_end=True)
+        self._finish_partial(int(affected.sum()))
+
+    def _finish_partial(self, count):
+        self._dirty.clear()
+        self._old_positions = {}
+        self._incremental_updates += 1
+        self.partial_evaluations += 1
+        self.samples_recomputed += count
+        self._refresh_curve()
+
+    def _refresh_curve(self):
+        if self._points is None:
+            self._curve = []
+        else:
+            self._curve = [tuple(point) for point in self._points.astype(int).tolist()]
@@ -1,39 +1,18 @@
-import pygame
 import sys
-import tkinter as tk
-from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
 import numpy as np
-
-# 初始化Pygame
-pygame.init()
+from BezierEval import evaluate_bezier
+from CurveSet import CurveSet
+from BSplineEval import clamped_uniform_nodes, evaluate_bspline
+from CurveState import CurveState
+from Flatten import flatten_bezier, flatten_bspline
+from SpatialIndex import VertexGrid
 
 # 设置Pygame绘图区域大小
 drawing_width = 800
 drawing_height = 600
 
-# 创建Tkinter窗口
-root = tk.Tk()
-root.title("bezier曲线绘制")
-
-# 设置Tkinter窗口大小
-root.geometry(f'{drawing_width + 150}x{drawing_height}')
-
-# 添加一个Frame用于包含Canvas和边框
-drawing_frame = tk.Frame(root, width=drawing_width, height=drawing_height, bg='black', bd=2, relief=tk.SUNKEN)
-drawing_frame.pack(side=tk.LEFT, padx=10, pady=10)
-
-# 添加一个Canvas用于嵌入Pygame绘图区域
-canvas = tk.Canvas(drawing_frame, width=drawing_width, height=drawing_height)
-canvas.pack()
-
-# 创建一个Frame用于放置控制按钮
-control_frame = tk.Frame(root, width=200, height=drawing_height)
-control_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
-
-# 添加一个Frame用于居中按钮，放置在control_frame的顶部
-button_frame = tk.Frame(control_frame)
-button_frame.pack(anchor=tk.N, pady=20)
+# 窗口、画布、字体和渲染器在 main() 中创建；导入本模块不会打开窗口，也不会导入 pygame / tkinter
+root = canvas = font = renderer = None
 
 # 添加节点函数
 def add_mode():
@@ -53,33 +32,25 @@ def move_mode():
 # 选择贝塞尔曲线函数
 def bezier_mode():
     global curve_mode
+    from tkinter import messagebox
+
     curve_mode = 'bezier'
+    curve_state.set_curve_mode(curve_mode)
+    renderer.invalidate()
     root.title("bezier曲线绘制")
     messagebox.showinfo("Curve Mode", "已选择绘制贝塞尔曲线")
 
 # 选择B样条曲线函数
 def bspline_mode():
     global curve_mode
+    from tkinter import messagebox
+
     curve_mode = 'bspline'
+    curve_state.set_curve_mode(curve_mode)
+    renderer.invalidate()
     root.title("bspline曲线绘制")
     messagebox.showinfo("Curve Mode", "已选择绘制B样条曲线")
 
-# 添加控制按钮
-add_button = ttk.Button(button_frame, text="添加节点", command=add_mode)
-add_button.pack(pady=10)
-
-remove_button = ttk.Button(button_frame, text="删除节点", command=remove_mode)
-remove_button.pack(pady=10)
-
-move_button = ttk.Button(button_frame, text="移动节点", command=move_mode)
-move_button.pack(pady=10)
-
-bezier_button = ttk.Button(button_frame, text="选择贝塞尔曲线", command=bezier_mode)
-bezier_button.pack(pady=10)
-
-bspline_button = ttk.Button(button_frame, text="选择B样条曲线", command=bspline_mode)
-bspline_button.pack(pady=10)
-
 # 设置颜色
 white = (255, 255, 255)
 black = (0, 0, 0)
@@ -87,20 +58,15 @@ red = (255, 0, 0)
 gray = (200, 200, 200)
 blue = (0, 0, 255)
 
-# 存储顶点的列表
-vertices = []
+# 顶点存放在只有一组的 CurveSet 中，polygon 是这组顶点的 (n, 2) 视图
+vertices = CurveSet(np.empty((0, 2)), [0, 0])
 mode = 'add'  # 默认模式为添加节点
 moving_vertex_index = None
 curve_mode = 'bezier'  # 默认绘制贝塞尔曲线
-
-# 创建Pygame绘图表面
-screen = pygame.Surface((drawing_width, drawing_height))
-
-def pygame_to_tk_image(surface):
-    # 将Pygame表面转换为PIL图像
-    pygame_image = pygame.surfarray.array3d(surface)
-    pil_image = Image.fromarray(pygame_image.transpose((1, 0, 2)))
-    return ImageTk.PhotoImage(image=pil_image)
+flatness = 0.5  # 曲线与折线之间允许的最大距离（像素），折线点数按曲线在屏幕上的形状自适应
+curve_state = CurveState(curve_mode, tolerance=flatness)  # 顶点不变时直接复用上次的折线
+hit_radius = 10  # 距离阈值，避免误删、误选
+vertex_grid = VertexGrid(hit_radius)  # 顶点的均匀网格索引，点击时只检查附近的格子
 
 def handle_mouse_click(event):
     global moving_vertex_index
@@ -109,43 +75,35 @@ def handle_mouse_click(event):
     if mouse_x < drawing_width:  # 确保点击在左侧绘图区域
         if mode == 'add':
             # 添加节点
-            vertices.append((mouse_x, mouse_y))
+            vertices.append(0, (mouse_x, mouse_y))
+            vertex_grid.append((mouse_x, mouse_y))
+            curve_state.set_vertices(vertices[0])
+            renderer.invalidate()
         elif mode == 'remove':
             # 删除节点
-            if vertices:
-                # 查找离鼠标点击位置最近的顶点并删除
-                closest_vertex_index = None
-                closest_distance = float('inf')
-                for i, vertex in enumerate(vertices):
-                    distance = ((vertex[0] - mouse_x) ** 2 + (vertex[1] - mouse_y) ** 2) ** 0.5
-                    if distance < closest_distance:
-                        closest_distance = distance
-                        closest_vertex_index = i
-                if closest_vertex_index is not None and closest_distance < 10:  # 距离阈值，避免误删
-                    vertices.pop(closest_vertex_index)
+            # 查找离鼠标点击位置最近的顶点并删除
+            closest_vertex_index = vertex_grid.nearest((mouse_x, mouse_y), hit_radius)
+            if closest_vertex_index is not None:
+                vertices.delete(0, closest_vertex_index)
+                vertex_grid.remove(closest_vertex_index)
+                curve_state.set_vertices(vertices[0])
+                renderer.invalidate()
         elif mode == 'move':
             # 选中要移动的节点
-            moving_vertex_index = None
-            closest_distance = float('inf')
-            for i, vertex in enumerate(vertices):
-                distance = ((vertex[0] - mouse_x) ** 2 + (vertex[1] - mouse_y) ** 2) ** 0.5
-                if distance < closest_distance:
-                    closest_distance = distance
-                    moving_vertex_index = i
-            if closest_distance >= 10:  # 距离阈值，避免误选
-                moving_vertex_index = None
+            moving_vertex_index = vertex_grid.nearest((mouse_x, mouse_y), hit_radius)
 
 def handle_mouse_motion(event):
-    global moving_vertex_index
     if moving_vertex_index is not None and mode == 'move':
         mouse_x, mouse_y = event.x, event.y
         if mouse_x < drawing_width:  # 确保移动在左侧绘图区域
-            vertices[moving_vertex_index] = (mouse_x, mouse_y)
-
-canvas.bind("<Button-1>", handle_mouse_click)
-canvas.bind("<B1-Motion>", handle_mouse_motion)
+            vertices[0][moving_vertex_index] = (mouse_x, mouse_y)
+            vertex_grid.move(moving_vertex_index, (mouse_x, mouse_y))
+            curve_state.move_vertex(moving_vertex_index, (mouse_x, mouse_y))
+            renderer.invalidate()
 
 def draw_grid_and_axes(screen):
+    import pygame
+
     # 绘制网格线和坐标轴
     for x in range(100, drawing_width, 70):  # 范围调整为覆盖大约70个单位
         pygame.draw.line(screen, gray, (x, 0), (x, drawing_height), 1)
@@ -160,7 +118,6 @@ def draw_grid_and_axes(screen):
     pygame.draw.line(screen, black, (0, origin_y), (drawing_width, origin_y), 2)  # 横坐标
 
 def draw_labels(screen):
-    font = pygame.font.SysFont('Arial', 15)
     origin_x = 70
     origin_y = drawing_height - 70
     # 绘制 x 轴和 y 轴坐标
@@ -172,115 +129,157 @@ def draw_labels(screen):
         screen.blit(label, (origin_x + 5, y))
 
 def draw_vertices(screen, vertices):
-    font = pygame.font.SysFont('Arial', 15)
+    import pygame
+
     origin_x = 70
     origin_y = drawing_height - 70
+    rects = []
     for i, vertex in enumerate(vertices):
-        pygame.draw.circle(screen, blue, vertex, 3)  # 蓝色 (0, 0, 255) 和半径 3
+        rects.append(pygame.draw.circle(screen, blue, vertex, 3))  # 蓝色 (0, 0, 255) 和半径 3
         # 将屏幕坐标转换为实际坐标
         x_coord = ((vertex[0] - origin_x) / 70)
         y_coord = ((origin_y - vertex[1]) / 70)
         # 绘制顶点标识和坐标
         label = font.render(f'p{i} ({x_coord:.2f},{y_coord:.2f})', True, black)
-        screen.blit(label, (vertex[0] + 5, vertex[1] - 15))
-
-
-def bezier_curve(vertices, num_points=100):
-    # 计算贝塞尔曲线上的点
-    n = len(vertices) - 1
-    curve = []
-    for t in np.linspace(0, 1, num_points):
-        x = sum(
-            [binomial_coeff(n, i) * (1 - t) ** (n - i) * t ** i * vertices[i][0] for i in range(n + 1)]
-        )
-        y = sum(
-            [binomial_coeff(n, i) * (1 - t) ** (n - i) * t ** i * vertices[i][1] for i in range(n + 1)]
-        )
-        curve.append((int(x), int(y)))
-    return curve
-
-def binomial_coeff(n, k):
-    # 计算二项式系数 C(n, k)
-    return np.math.factorial(n) // (np.math.factorial(k) * np.math.factorial(n - k))
-
-def bspline_curve(vertices, num_points=100):
-    # 计算B样条曲线上的点
+        rects.append(screen.blit(label, (vertex[0] + 5, vertex[1] - 15)))
+    return rects
+
+
+def bezier_curve(vertices, num_points=100, mode='casteljau', tolerance=None):
+    # 计算贝塞尔曲线上的点，mode 见 BezierEval.BEZIER_MODES：快速模式为 'power'（约 100 次以下）和 'log'，'horner' 只是参考实现
+    # 给定 tolerance（像素）时按平直度自适应细分，忽略 num_points
+    if len(vertices) == 0:
+        return []
+    if tolerance is not None:
+        points = flatten_bezier(vertices, tolerance)[1]
+    else:
+        points = evaluate_bezier(vertices, np.linspace(0, 1, num_points), mode)
+    return [tuple(point) for point in points.astype(int).tolist()]
+
+def bspline_curve(vertices, num_points=100, tolerance=None):
+    # 计算B样条曲线上的点，给定 tolerance（像素）时按节点区间自适应细分
     k = 3  # 阶数 (k阶B样条，通常为3)
     n = len(vertices)
     if n < k + 1:
         return []  # 如果顶点数少于k+1，无法形成B样条
-    t = np.linspace(0, 1, num_points)
-    T = [0] * k + list(np.linspace(0, 1, n - k + 1)) + [1] * k
-    curve = []
-    for u in t:
-        x, y = 0, 0
-        for i in range(n):
-            b = bspline_basis(i, k, u, T)
-            x += vertices[i][0] * b
-            y += vertices[i][1] * b
-        curve.append((int(x), int(y)))
-    return curve
-
-def bspline_basis(i, k, u, T):
-    if k == 0:
-        if T[i] <= u < T[i + 1] or (u == T[-1] and T[i] <= u <= T[i + 1]):
-            return 1
-        return 0
-    denominator1 = T[i + k] - T[i]
-    denominator2 = T[i + k + 1] - T[i + 1]
-    coef1 = (u - T[i]) / denominator1 if denominator1 != 0 else 0
-    coef2 = (T[i + k + 1] - u) / denominator2 if denominator2 != 0 else 0
-    return coef1 * bspline_basis(i, k - 1, u, T) + coef2 * bspline_basis(i + 1, k - 1, u, T)
-
-def draw_bezier_curve(screen, vertices):
-    # 绘制贝塞尔曲线
-    curve_points = bezier_curve(vertices)
-    pygame.draw.lines(screen, red, False, curve_points, 2)
-
-def draw_bspline_curve(screen, vertices):
-    # 绘制B样条曲线
-    curve_points = bspline_curve(vertices)
-    if curve_points:  # 确保有足够的顶点绘制B样条曲线
-        pygame.draw.lines(screen, red, False, curve_points, 2)
+    nodes = clamped_uniform_nodes(n, k)
+    if tolerance is not None:
+        points = flatten_bspline(vertices, nodes, k, tolerance)[1]
+    else:
+        points = evaluate_bspline(vertices, nodes, k, np.linspace(0, 1, num_points), include_end=True)
+    return [tuple(point) for point in points.astype(int).tolist()]
+
+def draw_curve(screen, curve_points):
+    import pygame
+
+    # 绘制贝塞尔曲线或B样条曲线
+    if curve_points:  # 确保有足够的顶点绘制曲线
+        return [pygame.draw.lines(screen, red, False, curve_points, 2)]
+    return []
 
 def draw_polygon(screen, vertices):
-    if len(vertices) > 1:
-        pygame.draw.lines(screen, gray, False, vertices, 2)
+    import pygame
 
-# 主循环
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    if len(vertices) > 1:
+        return [pygame.draw.lines(screen, gray, False, vertices, 2)]
+    return []
 
-    # 填充背景颜色
+def draw_background(screen):
+    # 静态背景只绘制一次：填充背景颜色、网格线、坐标轴和刻度
     screen.fill(white)
-
-    # 绘制网格线和坐标轴
     draw_grid_and_axes(screen)
     draw_labels(screen)
 
+def draw_scene(screen):
+    # 返回本帧绘制过的矩形区域，只有这些区域会被传送到Tkinter Canvas
     # 绘制控制多边形
-    draw_polygon(screen, vertices)
+    polygon = vertices[0]
+    rects = draw_polygon(screen, polygon)
 
     # 绘制所有顶点及其坐标
-    draw_vertices(screen, vertices)
+    rects += draw_vertices(screen, polygon)
+
+    # 根据选择绘制相应的曲线，顶点未变化时直接复用上次的结果
+    rects += draw_curve(screen, curve_state.curve())
+    return rects
+
+# 帧率上限，只有在画面被标记为需要重绘时才会渲染
+max_fps = 60
+
+def tick():
+    import pygame
+
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            root.destroy()
+            return
+
+    # 将Pygame绘图表面渲染到Tkinter Canvas（复用同一个图像对象）
+    renderer.render(draw_scene)
+    root.after(renderer.frame_interval, tick)
+
+def main():
+    global root, canvas, font, renderer
+    import pygame
+    import tkinter as tk
+    from tkinter import ttk
+    from SurfaceRenderer import SurfaceRenderer
+
+    # 初始化Pygame
+    pygame.init()
+    font = pygame.font.SysFont('Arial', 15)
+
+    # 创建Tkinter窗口
+    root = tk.Tk()
+    root.title("bezier曲线绘制")
+
+    # 设置Tkinter窗口大小
+    root.geometry(f'{drawing_width + 150}x{drawing_height}')
+
+    # 添加一个Frame用于包含Canvas和边框
+    drawing_frame = tk.Frame(root, width=drawing_width, height=drawing_height, bg='black', bd=2, relief=tk.SUNKEN)
+    drawing_frame.pack(side=tk.LEFT, padx=10, pady=10)
+
+    # 添加一个Canvas用于嵌入Pygame绘图区域
+    canvas = tk.Canvas(drawing_frame, width=drawing_width, height=drawing_height)
+    canvas.pack()
+
+    # 创建一个Frame用于放置控制按钮
+    control_frame = tk.Frame(root, width=200, height=drawing_height)
+    control_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
+
+    # 添加一个Frame用于居中按钮，放置在control_frame的顶部
+    button_frame = tk.Frame(control_frame)
+    button_frame.pack(anchor=tk.N, pady=20)
+
+    # 添加控制按钮
+    add_button = ttk.Button(button_frame, text="添加节点", command=add_mode)
+    add_button.pack(pady=10)
+
+    remove_button = ttk.Button(button_frame, text="删除节点", command=remove_mode)
+    remove_button.pack(pady=10)
+
+    move_button = ttk.Button(button_frame, text="移动节点", command=move_mode)
+    move_button.pack(pady=10)
+
+    bezier_button = ttk.Button(button_frame, text="选择贝塞尔曲线", command=bezier_mode)
+    bezier_button.pack(pady=10)
+
+    bspline_button = ttk.Button(button_frame, text="选择B样条曲线", command=bspline_mode)
+    bspline_button.pack(pady=10)
+
+    canvas.bind("<Button-1>", handle_mouse_click)
+    canvas.bind("<B1-Motion>", handle_mouse_motion)
 
-    # 根据选择绘制相应的曲线
-    if curve_mode == 'bezier':
-        draw_bezier_curve(screen, vertices)
-    elif curve_mode == 'bspline':
-        draw_bspline_curve(screen, vertices)
+    renderer = SurfaceRenderer(canvas, drawing_width, drawing_height, draw_background, max_fps)
 
-    # 将Pygame绘图表面渲染到Tkinter Canvas
-    tk_image = pygame_to_tk_image(screen)
-    canvas.create_image((0, 0), anchor=tk.NW, image=tk_image)
+    # 主循环
+    tick()
+    root.mainloop()
 
-    # 更新Tkinter窗口
-    root.update_idletasks()
-    root.update()
+    # 退出Pygame
+    pygame.quit()
+    sys.exit()
 
-# 退出Pygame
-pygame.quit()
-sys.exit()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import numpy as np
+
+from CurveConvert import bspline_to_bezier
+
+
+def _chord_deviation(points):
+    # 各段内部点到首末点连线（线段）的最大距离，points 形状为 (segments, count, dim)
+    start, end = points[:, :1], points[:, -1:]
+    chord = end - start
+    length2 = np.sum(chord ** 2, axis=-1, keepdims=True)
+    offset = points[:, 1:-1] - start
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(length2 > 0, np.sum(offset * chord, axis=-1, keepdims=True) / length2, 0.0)
+    distance = np.linalg.norm(offset - np.clip(s, 0, 1) * chord, axis=-1)
+    return distance.max(axis=1) if distance.shape[1] else np.zeros(len(points))
+
+
+def _split_half(segments):
+    # de Casteljau 在 t = 0.5 处把一批 Bezier 段各自一分为二
+    degree = segments.shape[1] - 1
+    left = np.empty_like(segments)
+    right = np.empty_like(segments)
+    left[:, 0] = segments[:, 0]
+    right[:, degree] = segments[:, degree]
+    points = segments
+    for level in range(1, degree + 1):
+        points = 0.5 * (points[:, :-1] + points[:, 1:])
+        left[:, level] = points[:, 0]
+        right[:, degree - level] = points[:, -1]
+    return left, right
+
+
+def _flatten_segments(segments, tolerance, max_depth, view=None):
+    # 一批 Bezier 段同时逐层细分；返回被接受的子段所属的段号、起点参数、参数宽度和起点，按 (段号, t) 排序
+    # 给定 view 时，控制多边形包围盒与 view 不相交的子段直接丢弃（凸包性质保证曲线也不可见）
+    ids = np.arange(len(segments))
+    starts = np.zeros(len(segments))
+    width = 1.0
+    accepted_ids, accepted_t, accepted_width, accepted_points = [], [], [], []
+    for depth in range(max_depth + 1):
+        if view is not None:
+            visible = np.all((segments.min(axis=1) <= view[1]) & (segments.max(axis=1) >= view[0]), axis=1)
+            segments, ids, starts = segments[visible], ids[visible], starts[visible]
+        flat = _chord_deviation(segments) <= tolerance
+        if depth == max_depth:
+            flat[:] = True
+        accepted_ids.append(ids[flat])
+        accepted_t.append(starts[flat])
+        accepted_width.append(np.full(np.count_nonzero(flat), width))
+        accepted_points.append(segments[flat, 0])
+        segments, ids, starts = segments[~flat], ids[~flat], starts[~flat]
+        if not len(segments):
+            break
+        left, right = _split_half(segments)
+        width /= 2
+        segments = np.concatenate((left, right))
+        ids = np.concatenate((ids, ids))
+        starts = np.concatenate((starts, starts + width))
+
+    ids, t = np.concatenate(accepted_ids), np.concatenate(accepted_t)
+    order = np.lexsort((t, ids))
+    return ids[order], t[order], np.concatenate(accepted_width)[order], np.concatenate(accepted_points)[order]
+
+
+def flatten_bezier(control_points, tolerance, max_depth=16):
+    """
+    Approximate a Bezier curve by the shortest polyline found by recursive subdivision.
+
+    A segment is accepted once all of its control points lie within tolerance of its chord;
+    by the convex hull property the curve then deviates from the chord by at most tolerance.
+    All segments of one subdivision level are split together with a vectorized de Casteljau.
+
+    Parameters:
+    - control_points: (n + 1, dim) control points
+    - tolerance: Maximum distance between the curve and the polyline, in curve units (pixels on screen)
+    - max_depth: Subdivision limit, at most 2^max_depth segments
+
+    Returns:
+    - t: Parameter values of the polyline vertices, increasing from 0 to 1
+    - points: (len(t), dim) polyline vertices, lying exactly on the curve
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    _, t, _, points = _flatten_segments(control_points[None], tolerance, max_depth)
+    return np.append(t, 1.0), np.concatenate((points, control_points[-1:]))
+
+
+def flatten_bspline(control_points, nodes, degree, tolerance, max_depth=16):
+    """
+    Approximate a B-spline over [nodes[degree], nodes[-degree - 1]] by an adaptive polyline.
+
+    The B-spline is converted to its Bezier segments (CurveConvert.bspline_to_bezier,
+    cached per knot vector) and all segments are flattened together exactly like
+    flatten_bezier, so the same convex hull bound holds.
+
+    Returns:
+    - u: Parameter values of the polyline vertices
+    - points: (len(u), dim) polyline vertices on the curve
+    """
+    breaks, segments = bspline_to_bezier(control_points, nodes, degree)
+    ids, t, _, points = _flatten_segments(segments, tolerance, max_depth)
+    u = breaks[ids] + t * (breaks[ids + 1] - breaks[ids])
+    return np.append(u, breaks[-1]), np.concatenate((points, segments[-1, -1:]))
+
+
+def flatten_in_view(segments, view, tolerance, max_depth=16):
+    """
+    Flatten only the parts of a batch of Bezier segments that can be visible in a view.
+
+    Works like flatten_bezier, but after every subdivision step the pieces whose control
+    polygon box misses the view are dropped, so the work is proportional to the visible
+    length of the curves. Pass the size of a pixel in data units (times the allowed
+    error in pixels) as tolerance to get the level of detail that matches the zoom.
+
+    Parameters:
+    - segments: (k, n + 1, dim) control points of Bezier segments of the same degree
+    - view: (2, dim) box as [min, max], e.g. the axes limits
+    - tolerance: Maximum distance between the curve and the polylines, in curve units
+    - max_depth: Subdivision limit, at most 2^max_depth pieces per segment
+
+    Returns:
+    - List of contiguous visible runs (segment index, t, points), ordered by segment and
+      t; t increases within [0, 1] and points lie exactly on the curve
+    """
+    segments = np.asarray(segments, dtype=float)
+    view = np.asarray(view, dtype=float)
+    ids, t, width, points = _flatten_segments(segments, tolerance, max_depth, view)
+    if not len(ids):
+        return []
+    # 子段终点不等于下一个子段起点（或换段）处断开
+    end = t + width
+    breaks = np.flatnonzero((ids[1:] != ids[:-1]) | (end[:-1] != t[1:])) + 1
+    runs = []
+    for first, stop in zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [len(ids)]))):
+        segment, last = ids[first], stop - 1
+        # 以最后一个子段的终点收尾
+        tail = _point_at(segments[segment], end[last])
+        runs.append((segment, np.append(t[first:stop], end[last]), np.concatenate((points[first:stop], tail[None]))))
+    return runs
+
+
+def _point_at(control_points, t):
+    # 单个 Bezier 在 t 处的点（de Casteljau）
+    points = control_points
+    while len(points) > 1:
+        points = (1 - t) * points[:-1] + t * points[1:]
+    return points[0]
+
+
+def flatten_stats(points, uniform_points):
+    """Number of polyline vertices emitted compared with a uniform sampling of uniform_points."""
+    return {'points': len(points), 'uniform_points': uniform_points, 'ratio': len(points) / uniform_points}
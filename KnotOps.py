@@ -0,0 +1,171 @@
+import numpy as np
+
+from BSplineEval import find_span, sparse_basis_matrix
+
+
+def transform_control_points(matrix, control_points):
+    """Apply matrix to the control point axis of (n, dim) or (curves, n, dim) control points."""
+    control_points = np.asarray(control_points, dtype=float)
+    moved = np.moveaxis(control_points, -2, 0)
+    result = matrix @ moved.reshape(moved.shape[0], -1)
+    return np.moveaxis(np.asarray(result).reshape((-1,) + moved.shape[1:]), 0, -2)
+
+
+def insert_knot(control_points, nodes, degree, u, times=1):
+    """
+    Insert the knot u times into a B-spline without changing its shape (Boehm's algorithm).
+
+    Each insertion replaces the degree control points around u by convex combinations of
+    their neighbours, computed for all of them at once.
+
+    Parameters:
+    - control_points: (n, dim) control points, or (curves, n, dim) for curves sharing nodes
+    - nodes: Knot vector
+    - degree: Degree of the B-spline
+    - u: Knot value, nodes[0] < u < nodes[-1]
+    - times: Number of insertions; the multiplicity of u may not exceed degree
+
+    Returns:
+    - new_nodes: Knot vector with u added times
+    - new_control_points: (..., n + times, dim) control points
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    points = np.asarray(control_points, dtype=float)
+    if not nodes[0] < u < nodes[-1]:
+        raise ValueError(f"Knot {u} lies outside the open interval ({nodes[0]}, {nodes[-1]})")
+    if np.count_nonzero(nodes == u) + times > degree:
+        raise ValueError(f"Inserting {u} {times} times would raise its multiplicity above the degree {degree}")
+
+    for _ in range(times):
+        k = int(find_span(nodes, u)[0])
+        n = points.shape[-2]
+        # a_i = 1 (i <= k - p)，0 (i > k)，中间为 (u - t_i) / (t_{i+p} - t_i)
+        alpha = np.zeros(n + 1)
+        alpha[:k - degree + 1] = 1.0
+        middle = np.arange(k - degree + 1, k + 1)
+        alpha[middle] = (u - nodes[middle]) / (nodes[middle + degree] - nodes[middle])
+        index = np.arange(n + 1)
+        current = points[..., np.minimum(index, n - 1), :]
+        previous = points[..., np.maximum(index - 1, 0), :]
+        points = alpha[:, None] * current + (1 - alpha)[:, None] * previous
+        nodes = np.insert(nodes, k + 1, u)
+    return nodes, points
+
+
+def refinement_matrix(nodes, degree, new_nodes):
+    """
+    Sparse matrix A with new_control_points = A @ control_points for a refinement of nodes.
+
+    Row j holds the discrete B-splines of the Oslo algorithm: the degree + 1 nonzero
+    basis functions on the span of new_nodes[j], with the parameter of level r replaced
+    by new_nodes[j + r]. All rows are computed together.
+
+    Parameters:
+    - nodes: Knot vector
+    - degree: Degree of the B-spline
+    - new_nodes: Knot vector containing every knot of nodes (with at least its multiplicity)
+
+    Returns:
+    - (len(new_nodes) - degree - 1, len(nodes) - degree - 1) CSR matrix
+    """
+    from scipy import sparse
+
+    nodes = np.asarray(nodes, dtype=float)
+    new_nodes = np.asarray(new_nodes, dtype=float)
+    num_basis = len(nodes) - degree - 1
+    rows = len(new_nodes) - degree - 1
+    spans = find_span(nodes, new_nodes[:rows], include_end=True)
+    if np.any(spans < 0):
+        raise ValueError("new_nodes must lie inside the knot vector")
+
+    padded = np.concatenate((nodes[0] - np.arange(degree, 0, -1), nodes, nodes[-1] + np.arange(1, degree + 1)))
+    mu = spans + degree
+    values = np.zeros((rows, degree + 1))
+    values[:, 0] = 1.0
+    for r in range(1, degree + 1):
+        x = new_nodes[np.arange(rows) + r]
+        saved = np.zeros(rows)
+        for s in range(r):
+            high = padded[mu + s + 1]
+            low = padded[mu + s + 1 - r]
+            temp = values[:, s] / (high - low)
+            values[:, s] = saved + (high - x) * temp
+            saved = (x - low) * temp
+        values[:, r] = saved
+
+    index = spans[:, None] - degree + np.arange(degree + 1)
+    keep = (index >= 0) & (index < num_basis)
+    indptr = np.concatenate(([0], np.cumsum(keep.sum(axis=1))))
+    return sparse.csr_matrix((values[keep], index[keep], indptr), shape=(rows, num_basis))
+
+
+def refine_knots(control_points, nodes, degree, knots):
+    """
+    Insert many knots at once (Oslo-style knot refinement), keeping the curve unchanged.
+
+    Parameters:
+    - control_points: (n, dim) control points, or (curves, n, dim) for curves sharing nodes;
+      a batch is refined with a single sparse matrix product
+    - nodes: Knot vector
+    - degree: Degree of the B-spline
+    - knots: Knot values to insert, repeated values are inserted repeatedly
+
+    Returns:
+    - new_nodes: Refined knot vector
+    - new_control_points: (..., len(new_nodes) - degree - 1, dim) control points
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    new_nodes = np.sort(np.concatenate((nodes, np.asarray(knots, dtype=float).ravel())))
+    return new_nodes, transform_control_points(refinement_matrix(nodes, degree, new_nodes), control_points)
+
+
+def greville_abscissae(nodes, degree):
+    """Knot averages (t_{i+1} + ... + t_{i+degree}) / degree, one per control point."""
+    nodes = np.asarray(nodes, dtype=float)
+    if degree == 0:
+        return nodes[:-1].copy()
+    window = np.lib.stride_tricks.sliding_window_view(nodes[1:-1], degree)
+    return window.mean(axis=1)
+
+
+def elevate_degree(control_points, nodes, degree, times=1):
+    """
+    Raise the degree of a clamped B-spline (e.g. from create_open_uniform_nodes) exactly.
+
+    The elevated curve lives on the same knots with every distinct knot's multiplicity
+    raised by times. Its control points are found by interpolating the original curve at
+    the Greville abscissae of the new knot vector; the collocation matrix is sparse and
+    banded and is factorized once for all curves of a batch. Since the original curve lies
+    in the elevated spline space, the representation is exact up to rounding.
+
+    Parameters:
+    - control_points: (n, dim) control points, or (curves, n, dim) for curves sharing nodes
+    - nodes: Clamped knot vector, first and last knot repeated degree + 1 times
+    - degree: Current degree
+    - times: Number of degrees to add
+
+    Returns:
+    - new_nodes: Knot vector of the elevated curve
+    - new_control_points: (..., len(new_nodes) - degree - times - 1, dim) control points
+    """
+    from scipy.sparse.linalg import splu
+
+    nodes = np.asarray(nodes, dtype=float)
+    if times < 0:
+        raise ValueError("times must not be negative")
+    if np.any(nodes[:degree + 1] != nodes[0]) or np.any(nodes[-degree - 1:] != nodes[-1]):
+        raise ValueError("Degree elevation needs a clamped (open uniform) knot vector")
+    if times == 0:
+        return nodes.copy(), np.array(control_points, dtype=float)
+
+    distinct, counts = np.unique(nodes, return_counts=True)
+    new_nodes = np.repeat(distinct, counts + times)
+    new_degree = degree + times
+    sites = greville_abscissae(new_nodes, new_degree)
+    collocation = sparse_basis_matrix(new_nodes, new_degree, sites, include_end=True).tocsc()
+    samples = sparse_basis_matrix(nodes, degree, sites, include_end=True)
+    points = transform_control_points(samples, control_points)
+
+    moved = np.moveaxis(points, -2, 0)
+    solved = splu(collocation).solve(moved.reshape(moved.shape[0], -1))
+    return new_nodes, np.moveaxis(solved.reshape(moved.shape), 0, -2)
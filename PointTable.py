@@ -0,0 +1,146 @@
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+
+class VirtualPointTable(ttk.Frame):
+    """
+    Scrollable editor for groups of (x, y) control points held in a NumPy model.
+
+    The model is a float array points (NaN for values not entered yet) and group boundaries
+    offsets, the same arrays BezierCurveApp keeps. The table has one header row per group
+    plus one row per point, but widgets exist only for the rows that fit on screen: the
+    same row widgets are re-bound to other rows when scrolling. Every valid keystroke is
+    written straight into the model array.
+    """
+
+    ROW_HEIGHT = 30
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.points = np.empty((0, 2))
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self._header_rows = np.zeros(0, dtype=np.int64)
+        self.first_row = 0
+
+        self._slots = []
+        self._entry_targets = {}
+        self._updating = False
+        self._validate = (self.register(self._on_edit), '%W', '%P')
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.body = ttk.Frame(self)
+        self.body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.body.bind("<Configure>", lambda e: self._ensure_slots())
+        self._bind_wheel(self.body)
+
+    @property
+    def num_rows(self):
+        return len(self._header_rows) + len(self.points)
+
+    @property
+    def visible_rows(self):
+        return max(1, self.body.winfo_height() // self.ROW_HEIGHT)
+
+    def set_model(self, points, offsets):
+        """Show the given model; edits are written into points in place."""
+        self.points = points
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        # 第 g 组的标题行位于 offsets[g] + g
+        self._header_rows = self.offsets[:-1] + np.arange(len(self.offsets) - 1)
+        self.first_row = 0
+        self._refresh()
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.first_row = int(float(args[1]) * self.num_rows)
+        elif args[0] == 'scroll':
+            step = self.visible_rows if args[2] == 'pages' else 1
+            self.first_row += int(args[1]) * step
+        self._refresh()
+
+    def _row(self, row):
+        # 行号 -> (组号, 点在 points 中的下标)，标题行的点下标为 None
+        group = int(np.searchsorted(self._header_rows, row, side='right')) - 1
+        header = self._header_rows[group]
+        return group, None if row == header else int(self.offsets[group] + row - header - 1)
+
+    def _ensure_slots(self):
+        # 只为可见的行（多一行用于部分可见的最后一行）创建控件
+        while len(self._slots) < self.visible_rows + 1:
+            self._slots.append(self._create_slot(len(self._slots)))
+        self._refresh()
+
+    def _create_slot(self, index):
+        frame = ttk.Frame(self.body)
+        label = ttk.Label(frame, width=10, padding=(5, 0))
+        label.grid(row=0, column=0, sticky=tk.W)
+        widgets = {'frame': frame, 'label': label, 'point': None}
+        for axis, name in enumerate("XY"):
+            axis_label = ttk.Label(frame, text=name)
+            axis_label.grid(row=0, column=1 + 2 * axis, padx=(5, 0))
+            entry = ttk.Entry(frame, width=10, validate="key", validatecommand=self._validate, justify="center")
+            entry.grid(row=0, column=2 + 2 * axis, padx=(5, 0))
+            self._entry_targets[str(entry)] = (widgets, axis)
+            widgets[name] = (axis_label, entry)
+        for widget in frame.winfo_children() + [frame]:
+            self._bind_wheel(widget)
+        return widgets
+
+    def _refresh(self):
+        total = self.num_rows
+        self.first_row = max(0, min(self.first_row, total - self.visible_rows))
+        self._updating = True
+        try:
+            for index, slot in enumerate(self._slots):
+                row = self.first_row + index
+                if row >= total:
+                    slot['frame'].place_forget()
+                    continue
+                slot['frame'].place(x=0, y=index * self.ROW_HEIGHT, relwidth=1, height=self.ROW_HEIGHT)
+                group, point = self._row(row)
+                slot['point'] = point
+                if point is None:
+                    slot['label'].configure(text=f"Group {group}", font=("Helvetica", 10, "bold"))
+                else:
+                    slot['label'].configure(text=f"P{point - self.offsets[group]}", font=("Helvetica", 9))
+                for axis, name in enumerate("XY"):
+                    axis_label, entry = slot[name]
+                    if point is None:
+                        axis_label.grid_remove()
+                        entry.grid_remove()
+                        continue
+                    axis_label.grid()
+                    entry.grid()
+                    entry.delete(0, tk.END)
+                    value = self.points[point, axis]
+                    if not np.isnan(value):
+                        entry.insert(0, np.format_float_positional(value, trim='-'))
+        finally:
+            self._updating = False
+
+        if total:
+            self.scrollbar.set(self.first_row / total, min(1.0, (self.first_row + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_edit(self, widget_name, value):
+        # 校验输入是否为实数，并直接写入数据模型；空字符串记为 NaN（未输入）
+        if value == "":
+            number = np.nan
+        else:
+            try:
+                number = float(value)
+            except ValueError:
+                return False
+        slot, axis = self._entry_targets[widget_name]
+        if not self._updating and slot['point'] is not None:
+            self.points[slot['point'], axis] = number
+        return True
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.yview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        widget.bind("<Button-4>", lambda e: self.yview('scroll', -1, 'units'))
+        widget.bind("<Button-5>", lambda e: self.yview('scroll', 1, 'units'))
@@ -0,0 +1,206 @@
+import numpy as np
+
+from CurveConvert import bspline_to_bezier
+from Flatten import _chord_deviation, _flatten_segments
+
+
+def _subsegments(segments, low, high):
+    # 每个 Bezier 段在参数区间 [low, high] 上的部分，仍写成 Bezier 控制点
+    def split(points, t, keep_right):
+        t = t[:, None, None]
+        side = []
+        while points.shape[1]:
+            side.append(points[:, -1] if keep_right else points[:, 0])
+            points = (1 - t) * points[:, :-1] + t * points[:, 1:]
+        return np.stack(side[::-1] if keep_right else side, axis=1)
+
+    right = split(segments, low, True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(low < 1, (high - low) / (1 - low), 1.0)
+    return split(right, ratio, False)
+
+
+def _point_derivatives(segments, t):
+    # 每个 Bezier 段在各自的 t 处的点及一、二阶导数（de Casteljau 的最后三层）
+    n = segments.shape[1] - 1
+    t = t[:, None, None]
+    points, previous, before = segments, None, None
+    while points.shape[1] > 1:
+        before, previous = previous, points
+        points = (1 - t) * points[:, :-1] + t * points[:, 1:]
+    zeros = np.zeros_like(points[:, 0])
+    first = n * (previous[:, 1] - previous[:, 0]) if n >= 1 else zeros
+    second = n * (n - 1) * (before[:, 2] - 2 * before[:, 1] + before[:, 0]) if n >= 2 else zeros
+    return points[:, 0], first, second
+
+
+class CurveProjector:
+    """
+    Closest points on a piecewise Bezier curve for many query points at once.
+
+    The curve is flattened once into a coarse polyline, with long pieces split so that no
+    chord exceeds the spacing, and its vertices go into a k-d tree. The pieces around the
+    nearest vertices of a query are candidates; since the curve stays within the flatness
+    of each chord, only pieces whose chord is nearly as close as the closest chord can
+    hold the closest point. Newton's method on (C(t) - p) . C'(t) = 0 then runs for all
+    of them together, starting from the projection onto the chord and clamped to the
+    piece, and the closest result wins.
+
+    A piece that was not examined has both vertices farther than the k-th nearest one,
+    which bounds its distance from below; queries whose best distance is not below that
+    bound are retried with twice as many vertices, so the result is the global minimum.
+
+    Parameters:
+    - segments: (k, n + 1, dim) Bezier segments of the same degree
+    - breaks: (k + 1,) parameter values of the segment ends, default 0, 1, ..., k
+    - resolution: Flatness of the coarse polyline relative to the size of the curve
+    - spacing: Longest polyline chord relative to the size of the curve
+    """
+
+    def __init__(self, segments, breaks=None, resolution=1e-3, spacing=0.02):
+        from scipy.spatial import cKDTree
+
+        self.segments = np.asarray(segments, dtype=float)
+        count = len(self.segments)
+        self.breaks = np.arange(count + 1, dtype=float) if breaks is None else np.asarray(breaks, dtype=float)
+        scale = max(np.ptp(self.segments.reshape(-1, self.segments.shape[-1]), axis=0).max(), 1e-300)
+        tolerance = resolution * scale
+        ids, t, width, points = _flatten_segments(self.segments, tolerance, 16)
+
+        # 弦长超过间距的小段按参数均分，保证顶点足够密
+        ends = np.r_[points[1:], self.segments[-1:, -1]]
+        last = np.r_[ids[1:] != ids[:-1], True]
+        ends[last] = self.segments[ids[last], -1]
+        splits = np.maximum(np.ceil(np.linalg.norm(ends - points, axis=1) / (spacing * scale)), 1).astype(int)
+        piece = np.repeat(np.arange(len(ids)), splits)
+        within = np.arange(len(piece)) - np.repeat(np.cumsum(splits) - splits, splits)
+        ids = np.concatenate((ids[piece], np.arange(count)))
+        t = np.concatenate((t[piece] + within * (width / splits)[piece], np.ones(count)))
+        order = np.lexsort((t, ids))
+        self.ids, self.t = ids[order], t[order]
+        vertices, _, _ = _point_derivatives(self.segments[self.ids], self.t)
+
+        # 相邻顶点之间为一个小段；由小段自身的 Bezier 控制点求曲线到弦的最大距离
+        self.vertices = vertices
+        self.last = np.r_[self.ids[1:] != self.ids[:-1], True]
+        pieces = np.flatnonzero(~self.last)
+        self.flatness = np.zeros(len(self.ids))
+        self.flatness[pieces] = _chord_deviation(_subsegments(
+            self.segments[self.ids[pieces]], self.t[pieces], self.t[pieces + 1]))
+        self.chords = np.r_[vertices[1:] - vertices[:-1], np.zeros_like(vertices[:1])]
+        length2 = np.einsum('ij,ij->i', self.chords, self.chords)
+        self.inverse_length2 = np.divide(1.0, length2, out=np.zeros_like(length2), where=length2 > 0)
+        self.half_chord = np.sqrt(length2[pieces].max()) / 2 if len(pieces) else 0.0
+        self.tree = cKDTree(vertices)
+
+    @classmethod
+    def from_bezier(cls, control_points, **kwargs):
+        """Projector onto one Bezier curve; parameters are its t in [0, 1]."""
+        return cls(np.asarray(control_points, dtype=float)[None], np.array([0.0, 1.0]), **kwargs)
+
+    @classmethod
+    def from_bspline(cls, control_points, nodes, degree, **kwargs):
+        """Projector onto a B-spline over [nodes[degree], nodes[-degree - 1]]; parameters are its u."""
+        breaks, segments = bspline_to_bezier(control_points, nodes, degree)
+        return cls(segments, breaks, **kwargs)
+
+    def _newton(self, queries, pieces, t, max_iterations):
+        # 在各小段的参数区间内做 Newton 迭代，返回收敛的参数、曲线上的点和距离
+        segments = self.segments[self.ids[pieces]]
+        low, high = self.t[pieces], self.t[pieces + 1]
+        active = np.arange(len(t))
+        for _ in range(max_iterations):
+            curve, first, second = _point_derivatives(segments[active], t[active])
+            offset = curve - queries[active]
+            gradient = np.einsum('ij,ij->i', offset, first)
+            # 二阶项使 Hessian 非正时退化为 Gauss-Newton 步，保证朝下降方向走
+            speed = np.einsum('ij,ij->i', first, first)
+            hessian = speed + np.einsum('ij,ij->i', offset, second)
+            hessian = np.where(hessian > 0, hessian, speed)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = np.where(hessian > 0, -gradient / hessian, 0.0)
+            updated = np.clip(t[active] + step, low[active], high[active])
+            moved = np.abs(updated - t[active]) > 1e-15
+            t[active] = updated
+            active = active[moved]
+            if not len(active):
+                break
+        curve, _, _ = _point_derivatives(segments, t)
+        return t, curve, np.linalg.norm(curve - queries, axis=1)
+
+    def _project_round(self, points, k, max_iterations):
+        # 最近的 k 个顶点两侧的小段为候选；曲线距弦不超过该段的 flatness，
+        # 所以只有弦距离减 flatness 不超过 min(弦距离 + flatness) 的小段可能含最近点
+        reached, nearest = self.tree.query(points, k=k)
+        reached, nearest = reached.reshape(len(points), k), nearest.reshape(len(points), k)
+        pieces = np.sort(np.concatenate((nearest - 1, nearest), axis=1), axis=1)
+        valid = (pieces >= 0) & (pieces < len(self.ids) - 1)
+        valid[:, 1:] &= pieces[:, 1:] != pieces[:, :-1]
+        pieces = np.where(valid, pieces, 0)
+        valid &= ~self.last[pieces]
+
+        chord = self.chords[pieces]
+        offset = points[:, None] - self.vertices[pieces]
+        s = np.clip(np.einsum('ijk,ijk->ij', offset, chord) * self.inverse_length2[pieces], 0, 1)
+        offset -= s[..., None] * chord
+        chord_distance = np.where(valid, np.sqrt(np.einsum('ijk,ijk->ij', offset, offset)), np.inf)
+        flatness = self.flatness[pieces]
+        bound = np.min(chord_distance + flatness, axis=1, keepdims=True)
+        keep = chord_distance - flatness <= bound
+
+        rows, columns = np.nonzero(keep)
+        kept = pieces[rows, columns]
+        t0 = self.t[kept] + s[rows, columns] * (self.t[kept + 1] - self.t[kept])
+        t, curve, distance = self._newton(points[rows], kept, t0, max_iterations)
+
+        distances = np.full(keep.shape, np.inf)
+        distances[rows, columns] = distance
+        position = np.zeros(keep.shape, dtype=np.int64)
+        position[rows, columns] = np.arange(len(rows))
+        index = position[np.arange(len(points)), np.argmin(distances, axis=1)]
+        # 未取到的小段两端顶点都比第 k 个顶点远，其弦的距离至少为 sqrt(r_k^2 - (弦长/2)^2)
+        unseen = np.sqrt(np.maximum(reached[:, -1] ** 2 - self.half_chord ** 2, 0)) - self.flatness.max()
+        return kept[index], t[index], curve[index], distance[index], unseen
+
+    def project(self, points, candidates=8, max_iterations=20):
+        """
+        Closest point on the curve for every query point.
+
+        Parameters:
+        - points: (m, dim) query points
+        - candidates: Number of nearest polyline vertices whose pieces are examined per query
+        - max_iterations: Newton iteration limit; convergence usually takes 2 to 4
+
+        Returns:
+        - parameters: (m,) curve parameter of the closest points
+        - closest: (m, dim) closest points on the curve
+        - distances: (m,) distances from the query points to the curve
+        """
+        points = np.asarray(points, dtype=float)
+        piece = np.zeros(len(points), dtype=np.int64)
+        t = np.zeros(len(points))
+        closest = np.empty_like(points)
+        distances = np.empty(len(points))
+        pending = np.arange(len(points))
+        while len(pending):
+            k = min(candidates, self.tree.n)
+            result = self._project_round(points[pending], k, max_iterations)
+            piece[pending], t[pending], closest[pending], distances[pending], unseen = result
+            if k == self.tree.n:
+                break
+            pending = pending[unseen < distances[pending]]
+            candidates *= 2
+
+        ids = self.ids[piece]
+        parameters = self.breaks[ids] + t * (self.breaks[ids + 1] - self.breaks[ids])
+        return parameters, closest, distances
+
+
+def project_to_bezier(points, control_points, **kwargs):
+    """Closest points on a Bezier curve, see CurveProjector.project; returns (t, closest, distances)."""
+    return CurveProjector.from_bezier(control_points).project(points, **kwargs)
+
+
+def project_to_bspline(points, control_points, nodes, degree, **kwargs):
+    """Closest points on a B-spline, see CurveProjector.project; returns (u, closest, distances)."""
+    return CurveProjector.from_bspline(control_points, nodes, degree).project(points, **kwargs)
@@ -0,0 +1,81 @@
+from bisect import bisect_left
+from math import floor
+
+
+class VertexGrid:
+    """
+    Uniform grid over the vertices of an ordered polygon for nearest-vertex queries.
+
+    Each vertex gets a stable id when it is appended; a cell maps to the set of ids it
+    contains and positions are stored per id. Since vertices are only ever appended,
+    ids stay sorted in polygon order, so a vertex's current index is a bisection away
+    and removing a vertex needs no renumbering. Appending, moving and removing update a
+    single cell, and a query only looks at the cells within the search radius, so hit
+    testing costs O(1) expected time regardless of the number of vertices.
+    """
+
+    def __init__(self, cell_size=10.0, points=()):
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._positions = {}
+        self._ids = []
+        self._next_id = 0
+        for point in points:
+            self.append(point)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _cell(self, point):
+        return floor(point[0] / self.cell_size), floor(point[1] / self.cell_size)
+
+    def append(self, point):
+        """Add a vertex at the end of the polygon."""
+        vertex_id = self._next_id
+        self._next_id += 1
+        self._ids.append(vertex_id)
+        self._positions[vertex_id] = point
+        self._cells.setdefault(self._cell(point), set()).add(vertex_id)
+
+    def remove(self, index):
+        """Remove the vertex at the given polygon index."""
+        vertex_id = self._ids.pop(index)
+        cell = self._cell(self._positions.pop(vertex_id))
+        members = self._cells[cell]
+        members.discard(vertex_id)
+        if not members:
+            del self._cells[cell]
+
+    def move(self, index, point):
+        """Move the vertex at the given polygon index to point."""
+        vertex_id = self._ids[index]
+        old_cell, new_cell = self._cell(self._positions[vertex_id]), self._cell(point)
+        self._positions[vertex_id] = point
+        if old_cell != new_cell:
+            members = self._cells[old_cell]
+            members.discard(vertex_id)
+            if not members:
+                del self._cells[old_cell]
+            self._cells.setdefault(new_cell, set()).add(vertex_id)
+
+    def nearest(self, point, radius):
+        """
+        Index of the vertex closest to point, or None if none is closer than radius.
+
+        Ties go to the lowest index, like a linear scan keeping the first minimum.
+        """
+        x, y = point
+        low_x, low_y = self._cell((x - radius, y - radius))
+        high_x, high_y = self._cell((x + radius, y + radius))
+        positions = self._positions
+        # 比较距离的平方；初值为 radius^2，距离恰为 radius 的顶点不算命中
+        best_distance, best_id = radius * radius, None
+        for cell_x in range(low_x, high_x + 1):
+            for cell_y in range(low_y, high_y + 1):
+                for vertex_id in self._cells.get((cell_x, cell_y), ()):
+                    vx, vy = positions[vertex_id]
+                    distance = (vx - x) * (vx - x) + (vy - y) * (vy - y)
+                    if distance < best_distance or (distance == best_distance and best_id is not None
+                                                    and vertex_id < best_id):
+                        best_distance, best_id = distance, vertex_id
+        return None if best_id is None else bisect_left(self._ids, best_id)
@@ -0,0 +1,125 @@
+import os
+import sys
+import tkinter as tk
+
+# pygame 在导入时会打印版本横幅，导入本模块不应有输出
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame
+from PIL import Image, ImageTk
+
+# 32 位表面按 R, G, B, X 的字节顺序存放像素，PIL 可以直接映射其内存（RGBX）而无需解码
+RGBX_MASKS = (0xff, 0xff00, 0xff0000, 0) if sys.byteorder == 'little' else (0xff000000, 0xff0000, 0xff00, 0)
+
+
+def surface_raw_mode(surface):
+    """PIL raw mode ('RGBX', 'BGRX', ...) describing the byte layout of a 32-bit surface."""
+    channels = dict(zip(surface.get_shifts()[:3], 'RGB'))
+    order = [channels.get(8 * byte, 'X') for byte in range(4)]
+    if sys.byteorder == 'big':
+        order.reverse()
+    return ''.join(order)
+
+
+def surface_region_image(surface, rect):
+    """
+    PIL image of rect read straight from the surface's pixel buffer.
+
+    For RGBX surfaces the image shares the surface memory, so no pixels are copied; other
+    layouts are decoded once. The surface stays locked (and cannot be blitted to) until the
+    returned image is released.
+    """
+    x, y, width, height = rect
+    pitch = surface.get_pitch()
+    buffer = memoryview(surface.get_buffer())[y * pitch + x * 4:]
+    return Image.frombuffer('RGBX', (width, height), buffer, 'raw', surface_raw_mode(surface), pitch, 1)
+
+
+class SurfaceRenderer:
+    """
+    Renders a pygame surface into a single Tk canvas image item, only when something changed.
+
+    The static part of the scene (grid, axes, labels) is drawn once into a background
+    surface. Each frame restores the background only where the previous scene was drawn,
+    draws the new scene and transfers just the union of the old and new scene rectangles
+    into the persistent PhotoImage. draw_scene returns the rectangles it touched, or None
+    to repaint everything. Callers mark the scene dirty with invalidate(); ticks that find
+    nothing to redraw are counted as skipped frames.
+    """
+
+    def __init__(self, canvas, width, height, draw_background, max_fps=60):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.max_fps = max_fps
+
+        self.surface = pygame.Surface((width, height), 0, 32, RGBX_MASKS)
+        self.background = pygame.Surface((width, height), 0, self.surface)
+        draw_background(self.background)
+
+        self.photo = ImageTk.PhotoImage('RGB', (width, height))
+        # 脏矩形先写入暂存图像的左上角，再由 Tk 复制到目标位置
+        self.scratch = ImageTk.PhotoImage('RGB', (width, height))
+        self.image_item = canvas.create_image((0, 0), anchor=tk.NW, image=self.photo)
+
+        self.dirty = True
+        self._scene_rect = self.surface.get_rect()
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self.pixels_transferred = 0
+
+    @property
+    def frame_interval(self):
+        """Delay between ticks in milliseconds for the configured FPS cap."""
+        return max(1, round(1000 / self.max_fps))
+
+    def invalidate(self):
+        self.dirty = True
+
+    def render(self, draw_scene):
+        """Redraw the scene with draw_scene(surface) if dirty; return whether a frame was drawn."""
+        if not self.dirty:
+            self.frames_skipped += 1
+            return False
+        self.dirty = False
+
+        bounds = self.surface.get_rect()
+        self.surface.blit(self.background, self._scene_rect, self._scene_rect)
+        rects = draw_scene(self.surface)
+        if rects is None:
+            scene_rect = bounds
+        else:
+            rects = [rect for rect in rects if rect.width and rect.height]
+            scene_rect = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+        scene_rect = scene_rect.clip(bounds)
+
+        # 需要重绘的区域：上一帧场景所在位置（已恢复为背景）与本帧场景的并集
+        previous = self._scene_rect
+        if not (scene_rect.width and scene_rect.height):
+            region = previous
+        elif not (previous.width and previous.height):
+            region = scene_rect
+        else:
+            region = previous.union(scene_rect)
+        self.transfer(region)
+        self._scene_rect = scene_rect
+        self.frames_rendered += 1
+        return True
+
+    def transfer(self, rect):
+        """Copy rect of the surface into the canvas image."""
+        rect = pygame.Rect(rect)
+        if rect.width == 0 or rect.height == 0:
+            return
+        image = surface_region_image(self.surface, rect)
+        if rect == self.surface.get_rect():
+            self.photo.paste(image)
+        else:
+            self.scratch.paste(image)
+            self.canvas.tk.call(str(self.photo), 'copy', str(self.scratch),
+                                '-from', 0, 0, rect.width, rect.height, '-to', rect.x, rect.y)
+        del image  # 释放对表面内存的引用，解除表面锁定
+        self.pixels_transferred += rect.width * rect.height
+
+    def stats(self):
+        return {'frames_rendered': self.frames_rendered, 'frames_skipped': self.frames_skipped,
+                'pixels_transferred': self.pixels_transferred}
@@ -0,0 +1,114 @@
+"""
+Throughput of BatchEval.evaluate_curves against a per-curve loop.
+
+The loop evaluates one curve per call (evaluate_bezier / evaluate_bspline), the way
+BezierApp and BSpline handle their groups. The batch rows run evaluate_curves in the
+calling thread, with executor='auto' and on thread and process pools of increasing size;
+speedup is relative to the in-thread batch.
+
+--calibrate measures what BatchEval.THREAD_MIN_WORK is based on: the same chunks run in
+the calling thread and on a one-thread pool, which adds the per-task cost of the pool
+without any parallelism. The threshold is the work (multiply-adds) per chunk for which
+that cost stays under 10% of the chunk's own time.
+
+Usage (from the repository root):
+    python -m benchmarks.batch_eval [--curves 20000] [--points 200] [--kind bezier] [--input data.txt]
+    python -m benchmarks.batch_eval --calibrate
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from BatchEval import THREAD_MIN_WORK, curve_nodes, evaluate_curves
+from BezierEval import evaluate_bezier
+from BSplineEval import evaluate_bspline
+from CurveIO import read_binary, read_text
+
+
+def random_nets(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.random((int(n), 2)) * 1000 for n in rng.integers(4, 16, count)]
+
+
+def loop(nets, num_points, kind, degree):
+    t = np.linspace(0, 1, num_points)
+    for net in nets:
+        if kind == 'bezier':
+            evaluate_bezier(net, t)
+        else:
+            nodes = curve_nodes(len(net), degree)
+            evaluate_bspline(net, nodes, degree, np.linspace(nodes[degree], nodes[-degree - 1], num_points), True)
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def calibrate(num_points, repeat=9):
+    # 每个块 chunk 条 8 个控制点的曲线，共 64 个块；线程池只有一个线程，多出的时间就是每个任务的调度开销
+    nets = [np.random.default_rng(0).random((8, 2)) for _ in range(64 * 256)]
+    print(f"{'chunk':>6} {'work/chunk':>11} {'serial ms':>10} {'pool ms':>9} {'us/task':>8} {'overhead':>9}")
+    overheads, rates = [], []
+    for chunk in (4, 16, 64, 256):
+        count = 64 * chunk
+        out = np.empty((count, num_points, 2))
+        serial = min(timed(lambda: evaluate_curves(nets[:count], num_points, executor=None, chunk_size=chunk,
+                                                   out=out)) for _ in range(repeat))
+        pooled = min(timed(lambda: evaluate_curves(nets[:count], num_points, executor='thread', workers=1,
+                                                   chunk_size=chunk, out=out)) for _ in range(repeat))
+        work = chunk * num_points * 8
+        per_task = max(pooled - serial, 0.0) / 64
+        overheads.append(per_task)
+        rates.append(work * 64 / serial)
+        print(f"{chunk:>6} {work:>11} {serial * 1e3:>10.2f} {pooled * 1e3:>9.2f} {per_task * 1e6:>8.1f} "
+              f"{per_task * 64 / serial:>8.1%}")
+    print(f"median {np.median(overheads) * 1e6:.1f} us/task at {np.median(rates) / 1e6:.0f}M multiply-adds/s; "
+          f"work per chunk for <= 10% pool overhead: {10 * np.median(overheads) * np.median(rates):.0f} "
+          f"(BatchEval.THREAD_MIN_WORK = {THREAD_MIN_WORK})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--curves', type=int, default=20000)
+    parser.add_argument('--points', type=int, default=200)
+    parser.add_argument('--kind', choices=('bezier', 'bspline'), default='bezier')
+    parser.add_argument('--degree', type=int, default=3)
+    parser.add_argument('--input', help="Use the groups of a text or .bzp file instead of random curves")
+    parser.add_argument('--calibrate', action='store_true', help="Measure the per-task cost of the thread pool")
+    args = parser.parse_args()
+    if args.calibrate:
+        calibrate(args.points)
+        return
+
+    if args.input:
+        points, offsets = read_binary(args.input) if args.input.endswith('.bzp') else read_text(args.input)
+        nets = [points[int(a):int(b)] for a, b in zip(offsets[:-1], offsets[1:])]
+    else:
+        nets = random_nets(args.curves)
+    out = np.empty((len(nets), args.points, 2))
+    print(f"{len(nets)} {args.kind} curves x {args.points} points, {os.cpu_count()} cores")
+
+    def batch(executor, workers=None):
+        return lambda: evaluate_curves(nets, args.points, args.kind, args.degree, executor=executor,
+                                       workers=workers, out=out)
+
+    loop_seconds = timed(lambda: loop(nets, args.points, args.kind, args.degree))
+    base = timed(batch(None))
+    print(f"{'mode':<12} {'workers':>7} {'curves/s':>12} {'speedup':>8}")
+    print(f"{'loop':<12} {1:>7} {len(nets) / loop_seconds:>12.0f} {base / loop_seconds:>8.2f}")
+    print(f"{'batch':<12} {1:>7} {len(nets) / base:>12.0f} {1.0:>8.2f}")
+    seconds = timed(batch('auto'))
+    print(f"{'auto':<12} {'-':>7} {len(nets) / seconds:>12.0f} {base / seconds:>8.2f}")
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    for executor in ('thread', 'process'):
+        for workers in counts:
+            seconds = timed(batch(executor, workers))
+            print(f"{executor:<12} {workers:>7} {len(nets) / seconds:>12.0f} {base / seconds:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare the Bezier evaluation modes of BezierEval by accuracy and throughput.
+
+The reference is de Casteljau in extended precision (np.longdouble). Errors are
+reported relative to the extent of the control polygon.
+'horner' is listed as a reference implementation; 'power' and 'log' are the fast modes.
+
+Usage (from the repository root):
+    python -m benchmarks.bezier_modes [--degrees 3 10 30 100 300 600] [--samples 1000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from BezierEval import BEZIER_MODES, _de_casteljau, evaluate_bezier
+
+
+def run(degrees, samples, repeat, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 1, samples)
+    rows = []
+    for degree in degrees:
+        control_points = rng.uniform(-100, 100, size=(degree + 1, 2))
+        scale = np.ptp(control_points, axis=0).max()
+        reference = _de_casteljau(control_points, t, dtype=np.longdouble)
+        for mode in BEZIER_MODES:
+            with np.errstate(all='ignore'):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    points = evaluate_bezier(control_points, t, mode)
+                elapsed = (time.perf_counter() - start) / repeat
+                error = float(np.max(np.abs(points - reference)) / scale)
+            rows.append((degree, mode, error, samples / elapsed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--degrees', type=int, nargs='+', default=[3, 10, 30, 100, 300, 600])
+    parser.add_argument('--samples', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'degree':>6}  {'mode':<10} {'rel. error':>12} {'points/s':>14}")
+    for degree, mode, error, throughput in run(args.degrees, args.samples, args.repeat):
+        print(f"{degree:>6}  {mode:<10} {error:>12.3e} {throughput:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
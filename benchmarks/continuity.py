@@ -0,0 +1,80 @@
+"""
+Time and residual continuity error of Continuity.enforce_continuity on long paths.
+
+Each path is a chain of random Bezier curves of the given degrees, with small gaps at
+the junctions. The loop row is the per-junction Python loop BezierApp.connect_curve used
+before (C0 plus copying p3 - p2 onto the next curve, which is C1 only for equal
+degrees); its error column is measured like the others, as the largest first derivative
+mismatch. The solver rows run every level with both move modes ('next' changes only
+the curve after each junction, 'both' spreads the change over both sides) and report
+the largest error of the requested level and the largest control point displacement.
+With lines or quadratics in the path some junctions cannot meet the level (a line has no
+interior point to move, C2 is not imposed next to a quadratic), and those errors are
+reported as they are. C2 with move='next' amplifies from curve to curve on long paths.
+
+Usage (from the repository root):
+    python -m benchmarks.continuity [--segments 1000 10000] [--degrees 3] [--degrees 2 3 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from Continuity import CONTINUITY_LEVELS, MOVE_MODES, continuity_errors, enforce_continuity
+from CurveSet import CurveSet
+
+
+def random_path(segments, degrees, rng):
+    groups = []
+    start = np.zeros(2)
+    for degree in rng.choice(degrees, segments):
+        group = start + np.cumsum(rng.normal(size=(degree + 1, 2)), axis=0)
+        group[0] = start
+        groups.append(group)
+        start = group[-1] + rng.normal(size=2) * 0.1
+    return CurveSet.from_groups(groups)
+
+
+def loop(curves):
+    # 原来的逐个拼接点处理
+    groups = [list(group.copy()) for group in curves]
+    for i in range(len(groups) - 1):
+        groups[i][-1] = groups[i + 1][0]
+        groups[i + 1][1] = groups[i + 1][0] + (groups[i][-1] - groups[i][-2])
+    curves.points[:] = np.concatenate(groups)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--segments', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--degrees', type=int, nargs='+', action='append', help="Degrees to draw the curves from")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # scipy 在第一次求解时导入，不计入时间
+    enforce_continuity(random_path(3, [3], rng), 'C1')
+    print(f"{'degrees':<10} {'segments':>9} {'method':<7} {'move':<5} {'ms':>9} {'max error':>10} {'moved':>8}")
+    for degrees in args.degrees or [[3], [2, 3, 5]]:
+        label = ','.join(map(str, degrees))
+        for segments in args.segments:
+            path = random_path(segments, degrees, rng)
+            curves = path.copy()
+            start = time.perf_counter()
+            loop(curves)
+            elapsed = time.perf_counter() - start
+            error = np.nanmax(continuity_errors(curves)[:, 2])
+            print(f"{label:<10} {segments:>9} {'loop':<7} {'next':<5} {elapsed * 1e3:>9.1f} {error:>10.2e} "
+                  f"{np.abs(curves.points - path.points).max():>8.2f}")
+            for level in CONTINUITY_LEVELS:
+                for move in MOVE_MODES:
+                    curves = path.copy()
+                    start = time.perf_counter()
+                    errors = enforce_continuity(curves, level, move=move)
+                    elapsed = time.perf_counter() - start
+                    error = np.nanmax(errors[:, CONTINUITY_LEVELS.index(level)])
+                    print(f"{label:<10} {segments:>9} {level:<7} {move:<5} {elapsed * 1e3:>9.1f} {error:>10.2e} "
+                          f"{np.abs(curves.points - path.points).max():>8.2e}")
+
+
+if __name__ == '__main__':
+    main()
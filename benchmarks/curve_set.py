@@ -0,0 +1,70 @@
+"""
+Memory per control point and build/evaluation time of CurveSet against Python lists.
+
+The list rows are the layouts the GUIs used: a list of per-point np.array([x, y]) per
+group (BezierApp.collect_points) and a list of (x, y) tuples (Draw_Curve.vertices).
+Their memory is measured with tracemalloc while building them; the CurveSet row counts
+its coordinate, offset and metadata arrays. Evaluation runs BatchEval.evaluate_curves on
+the lists and CurveSet.evaluate on the set, which passes its buffer without copying.
+
+Usage (from the repository root):
+    python -m benchmarks.curve_set [--curves 20000] [--points 200]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from BatchEval import evaluate_curves
+from CurveSet import CurveSet
+
+
+def traced(build):
+    # 返回 (结果, 秒, 构造期间新分配的字节数)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--curves', type=int, default=20000)
+    parser.add_argument('--points', type=int, default=200, help="Samples per curve for the evaluation")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    sizes = rng.integers(4, 16, args.curves)
+    coordinates = rng.random((int(sizes.sum()), 2)) * 1000
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    rows = coordinates.tolist()
+    total = len(coordinates)
+
+    layouts = {
+        'list of arrays': lambda: [[np.array([float(x), float(y)]) for x, y in rows[start:stop]]
+                                   for start, stop in zip(offsets[:-1], offsets[1:])],
+        'list of tuples': lambda: [[(x, y) for x, y in rows[start:stop]]
+                                   for start, stop in zip(offsets[:-1], offsets[1:])],
+        'CurveSet': lambda: CurveSet(np.array(coordinates), offsets),
+    }
+    print(f"{total} control points in {args.curves} curves, {args.points} samples per curve")
+    print(f"{'layout':<16} {'bytes/point':>12} {'build ms':>10} {'evaluate ms':>12}")
+    for name, build in layouts.items():
+        curves, build_time, size = traced(build)
+        if isinstance(curves, CurveSet):
+            size = curves.nbytes
+            start = time.perf_counter()
+            curves.evaluate(args.points, executor=None)
+        else:
+            start = time.perf_counter()
+            evaluate_curves(curves, args.points, executor=None)
+        evaluate_time = time.perf_counter() - start
+        print(f"{name:<16} {size / total:>12.1f} {build_time * 1e3:>10.1f} {evaluate_time * 1e3:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
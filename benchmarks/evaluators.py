@@ -0,0 +1,378 @@
+"""
+Headless benchmark of every curve evaluator in the repository.
+
+Each evaluator runs on a grid of degree, control-point count and sample count and is
+measured for wall time (best of --repeat runs), peak memory allocated during one run
+(tracemalloc, which sees NumPy buffers) and maximum deviation from a reference.
+The reference is de Casteljau for Bezier curves and de Boor for B-splines, both in
+extended precision (np.longdouble) and independent of the code under test. Control
+points are random pixel coordinates in an 800x600 window, so the evaluators of
+Draw_Curve, which return integer pixels, deviate by up to about one unit.
+
+Evaluators whose module cannot be imported headless are recorded as skipped with the
+reason. The recursive scalar basis functions are exponential in the degree; their
+grids are capped with --scalar-work.
+
+Before the grid, BSplineEval.basis_matrix and evaluate_bspline are checked against the
+recursive BSpline.basis_function on knot vectors with repeated knots, at every knot and
+between them; they must agree to RECURSIVE_TOLERANCE (1e-12).
+
+The run fails with exit status 1 when the recursive check fails, when an evaluator
+deviates more than --tolerance from the reference (one pixel more for the integer
+evaluators of Draw_Curve), or when a case
+regresses against the baseline: benchmarks/evaluators_baseline.json next to this file
+unless --baseline names another run or --no-baseline is given. A case regresses when it
+is slower than --time-ratio times the baseline, uses more than --memory-ratio times the
+baseline memory, or deviates more than the baseline plus --accuracy-slack. Timings
+depend on the machine; refresh the baseline with --output after a deliberate change.
+
+Results are written as JSON with --output.
+
+Usage (from the repository root):
+    python -m benchmarks.evaluators
+    python -m benchmarks.evaluators --output benchmarks/evaluators_baseline.json
+    python -m benchmarks.evaluators --output current.json --baseline other.json
+    python -m benchmarks.evaluators [--degrees 2 3 5] [--control-points 8 32] [--samples 200 2000]
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+
+matplotlib.use('Agg')
+import numpy as np
+
+from BezierEval import _de_casteljau
+from BSpline import basis_function
+from BSplineEval import basis_matrix, evaluate_bspline
+
+
+def reference_bezier(control_points, t):
+    return _de_casteljau(control_points, t, dtype=np.longdouble)
+
+
+def reference_bspline(control_points, nodes, degree, u):
+    # 扩展精度的 de Boor；右端点取左极限
+    nodes = np.asarray(nodes, dtype=np.longdouble)
+    u = np.asarray(u, dtype=np.longdouble)
+    spans = np.clip(np.searchsorted(nodes, u, side='right') - 1, degree, len(nodes) - degree - 2)
+    points = np.asarray(control_points, dtype=np.longdouble)[spans[:, None] - degree + np.arange(degree + 1)]
+    for r in range(1, degree + 1):
+        for j in range(degree, r - 1, -1):
+            i = spans - degree + j
+            left, right = nodes[i], nodes[i + degree + 1 - r]
+            alpha = ((u - left) / (right - left))[:, None]
+            points[:, j] = (1 - alpha) * points[:, j - 1] + alpha * points[:, j]
+    return points[:, degree]
+
+
+def clamped_nodes(count, degree):
+    # 与 BSpline.create_open_uniform_nodes 相同：两端重复 degree + 1 次，定义域 [0, count - degree]
+    return np.concatenate((np.zeros(degree), np.arange(count - degree + 1), np.full(degree, count - degree)))
+
+
+def scalar_curve(basis, control_points, nodes, degree, u):
+    # 逐点、逐基函数调用标量递归基函数求和，即这些函数在原代码中的用法
+    points = []
+    for x in u:
+        weights = [basis(i, degree, x, nodes) for i in range(len(control_points))]
+        points.append(np.dot(weights, control_points))
+    return np.array(points)
+
+
+# 每个求值器：(名称, 曲线类型, 模块, 准备函数)
+# 准备函数接收 (module, control_points, degree, samples)，返回 (call, u, nodes)，
+# call() 只做被计时的求值；nodes 为 None 表示 Bezier 曲线
+def _bezier_eval(mode):
+    def prepare(module, control_points, degree, samples):
+        t = np.linspace(0, 1, samples)
+        return (lambda: module.evaluate_bezier(control_points, t, mode)), t, None
+    return prepare
+
+
+def _bezier_animation(module, control_points, degree, samples):
+    t = np.linspace(0, 1, samples)
+    return (lambda: np.array([module.bezier_curve(control_points, x) for x in t])), t, None
+
+
+def _bernstein_basis(module, control_points, degree, samples):
+    t = np.linspace(0, 1, samples)
+    n = len(control_points) - 1
+
+    def call():
+        return sum(module.Bernstein_basis(n, i, t)[:, None] * control_points[i] for i in range(n + 1))
+    return call, t, None
+
+
+def _draw_curve_bezier(module, control_points, degree, samples):
+    t = np.linspace(0, 1, samples)
+    return (lambda: np.array(module.bezier_curve(control_points.tolist(), samples))), t, None
+
+
+def _b_spline_curve(module, control_points, degree, samples):
+    nodes = clamped_nodes(len(control_points), degree)
+    u = np.linspace(nodes[degree], nodes[-degree - 1], samples)
+    return (lambda: module.b_spline_curve(control_points, nodes, degree, samples)), u, nodes
+
+
+def _basis_function(module, control_points, degree, samples):
+    # basis_function 的区间是左闭右开，右端点处全为 0，所以网格不含右端点
+    nodes = clamped_nodes(len(control_points), degree)
+    u = np.linspace(nodes[degree], nodes[-degree - 1], samples, endpoint=False)
+    return (lambda: scalar_curve(module.basis_function, control_points, nodes, degree, u)), u, nodes
+
+
+def _draw_curve_bspline(module, control_points, degree, samples):
+    # Draw_Curve.bspline_curve 固定为三次，节点在 [0, 1] 上均匀分布
+    n, k = len(control_points), 3
+    nodes = np.array([0] * k + list(np.linspace(0, 1, n - k + 1)) + [1] * k)
+    u = np.linspace(0, 1, samples)
+    return (lambda: np.array(module.bspline_curve(control_points.tolist(), samples))), u, nodes
+
+
+def _bspline_eval(module, control_points, degree, samples):
+    nodes = clamped_nodes(len(control_points), degree)
+    u = np.linspace(nodes[degree], nodes[-degree - 1], samples)
+    return (lambda: module.evaluate_bspline(control_points, nodes, degree, u, include_end=True)), u, nodes
+
+
+def _scipy_bspline(module, control_points, degree, samples):
+    nodes = clamped_nodes(len(control_points), degree)
+    u = np.linspace(nodes[degree], nodes[-degree - 1], samples)
+    return (lambda: module.BSpline(nodes, control_points, degree)(u)), u, nodes
+
+
+EVALUATORS = [
+    ('BezierEval.evaluate_bezier[casteljau]', 'bezier', 'BezierEval', _bezier_eval('casteljau')),
+    ('BezierEval.evaluate_bezier[horner]', 'bezier', 'BezierEval', _bezier_eval('horner')),
+    ('BezierAnimation.bezier_curve', 'bezier', 'BezierAnimation', _bezier_animation),
+    ('BezierApp.Bernstein_basis', 'bezier', 'BezierApp', _bernstein_basis),
+    ('Draw_Curve.bezier_curve', 'bezier', 'Draw_Curve', _draw_curve_bezier),
+    ('BSpline.b_spline_curve', 'bspline', 'BSpline', _b_spline_curve),
+    ('BSpline.basis_function', 'bspline-scalar', 'BSpline', _basis_function),
+    ('Draw_Curve.bspline_curve', 'bspline-cubic', 'Draw_Curve', _draw_curve_bspline),
+    ('BSplineEval.evaluate_bspline', 'bspline', 'BSplineEval', _bspline_eval),
+    ('scipy.interpolate.BSpline', 'bspline', 'scipy.interpolate', _scipy_bspline),
+]
+
+
+# 与递归定义对照的 (名称, 节点矢量, 次数)，包括内部重节点和两端重复的节点
+RECURSIVE_CHECKS = [
+    ('clamped', [0, 0, 0, 0, 1, 2, 3, 4, 4, 4, 4], 3),
+    ('periodic', list(range(-3, 9)), 3),
+    ('double interior', [0, 0, 0, 0, 1, 1, 2, 3, 3, 3, 4, 4, 4, 4], 3),
+    ('triple interior', [0, 0, 0, 1, 1, 1, 2, 3, 3, 3], 2),
+    ('quintic', [0] * 6 + [0.5, 0.5, 1, 2, 2, 2] + [3] * 6, 5),
+]
+RECURSIVE_TOLERANCE = 1e-12
+
+
+def recursive_agreement(samples=97, seed=0):
+    """
+    Largest differences of BSplineEval from the recursive basis functions of BSpline.
+
+    Both use half-open knot intervals, so the grid covers [nodes[0], nodes[-1]) and
+    contains every knot except the last. The curve uses control points in the unit
+    square, so its error is relative to the size of the curve.
+
+    Returns:
+    - list of {'nodes', 'degree', 'basis_error', 'curve_error'} records
+    """
+    rng = np.random.default_rng(seed)
+    records = []
+    for name, nodes, degree in RECURSIVE_CHECKS:
+        nodes = np.asarray(nodes, dtype=float)
+        count = len(nodes) - degree - 1
+        u = np.union1d(np.linspace(nodes[0], nodes[-1], samples, endpoint=False), nodes[:-1])
+        recursive = np.array([[basis_function(i, degree, x, nodes) for i in range(count)] for x in u])
+        control_points = rng.random((count, 2))
+        curve = evaluate_bspline(control_points, nodes, degree, u)
+        records.append({'nodes': name, 'degree': degree,
+                        'basis_error': float(np.abs(basis_matrix(nodes, degree, u) - recursive).max()),
+                        'curve_error': float(np.abs(curve - recursive @ control_points).max())})
+    return records
+
+
+# 返回整数像素的求值器，截断误差最多一个像素
+PIXEL_EVALUATORS = {'Draw_Curve.bezier_curve', 'Draw_Curve.bspline_curve'}
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'evaluators_baseline.json')
+
+
+def load(module_name):
+    # 模块导入失败（例如无显示器时创建窗口）返回 (None, 原因)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return importlib.import_module(module_name), None
+    except BaseException as e:
+        if isinstance(e, KeyboardInterrupt):
+            raise
+        return None, f"{type(e).__name__}: {e}".strip()
+
+
+def cases(kind, degrees, counts, samples, scalar_work):
+    for count in counts:
+        # Bezier 曲线的次数由控制点数决定
+        for degree in ([count - 1] if kind == 'bezier' else [3] if kind == 'bspline-cubic' else degrees):
+            if degree >= count:
+                continue
+            for size in samples:
+                # 递归基函数每次调用约 2^(degree + 1) 次递归
+                if kind == 'bspline-scalar' and size * count * 2 ** (degree + 1) > scalar_work:
+                    continue
+                yield degree, count, size
+
+
+def measure(prepare, module, control_points, degree, samples, repeat):
+    call, u, nodes = prepare(module, control_points, degree, samples)
+    tracemalloc.start()
+    points = call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    reference = reference_bezier(control_points, u) if nodes is None else \
+        reference_bspline(control_points, nodes, degree, u)
+    deviation = float(np.max(np.abs(np.asarray(points, dtype=np.longdouble) - reference)))
+
+    best = float('inf')
+    deadline = time.perf_counter() + 1.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+        # 慢的求值器不必重复满 repeat 次
+        if time.perf_counter() > deadline:
+            break
+    return best, peak, deviation
+
+
+def run(degrees, counts, samples, repeat, scalar_work, only=None, seed=0):
+    rng = np.random.default_rng(seed)
+    nets = {count: rng.uniform((0, 0), (800, 600), size=(count, 2)) for count in counts}
+    results = []
+    for name, kind, module_name, prepare in EVALUATORS:
+        if only and not any(pattern in name for pattern in only):
+            continue
+        module, reason = load(module_name)
+        if module is None:
+            results.append({'evaluator': name, 'status': 'skipped', 'reason': reason})
+            print(f"{name:<40} skipped ({reason})", file=sys.stderr)
+            continue
+        for degree, count, size in cases(kind, degrees, counts, samples, scalar_work):
+            with np.errstate(all='ignore'):
+                seconds, peak, deviation = measure(prepare, module, nets[count], degree, size, repeat)
+            results.append({'evaluator': name, 'status': 'ok', 'degree': degree, 'control_points': count,
+                            'samples': size, 'seconds': seconds, 'peak_bytes': peak, 'max_deviation': deviation})
+            print(f"{name:<40} p={degree:<3} n={count:<4} m={size:<6} {seconds * 1e3:>10.3f} ms "
+                  f"{peak / 1024:>10.1f} KiB {deviation:>10.2e}", file=sys.stderr)
+    return results
+
+
+def inaccurate(results, tolerance):
+    """Cases whose deviation from the reference exceeds the tolerance, as a list of messages."""
+    failures = []
+    for record in results:
+        if record['status'] != 'ok':
+            continue
+        limit = tolerance + (1.0 if record['evaluator'] in PIXEL_EVALUATORS else 0.0)
+        if record['max_deviation'] > limit:
+            failures.append(f"{record['evaluator']} p={record['degree']} n={record['control_points']} "
+                            f"m={record['samples']}: deviation {record['max_deviation']:.3e} > {limit:.3e}")
+    return failures
+
+
+def compare(results, baseline, time_ratio, memory_ratio, accuracy_slack):
+    """Regressions of results against a baseline run, as a list of messages."""
+    def key(record):
+        return record['evaluator'], record.get('degree'), record.get('control_points'), record.get('samples')
+
+    previous = {key(record): record for record in baseline['results'] if record['status'] == 'ok'}
+    regressions = []
+    for record in results:
+        old = previous.get(key(record))
+        if record['status'] != 'ok' or old is None:
+            continue
+        label = f"{record['evaluator']} p={record['degree']} n={record['control_points']} m={record['samples']}"
+        # 1 ms、64 KiB 以下的差异视为噪声
+        if record['seconds'] > old['seconds'] * time_ratio and record['seconds'] - old['seconds'] > 1e-3:
+            regressions.append(f"{label}: time {old['seconds'] * 1e3:.3f} -> {record['seconds'] * 1e3:.3f} ms")
+        if record['peak_bytes'] > old['peak_bytes'] * memory_ratio and record['peak_bytes'] - old['peak_bytes'] > 65536:
+            regressions.append(f"{label}: peak memory {old['peak_bytes']} -> {record['peak_bytes']} bytes")
+        if record['max_deviation'] > old['max_deviation'] + accuracy_slack:
+            regressions.append(f"{label}: deviation {old['max_deviation']:.3e} -> {record['max_deviation']:.3e}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--degrees', type=int, nargs='+', default=[2, 3, 5], help="B-spline degrees")
+    parser.add_argument('--control-points', type=int, nargs='+', default=[8, 32])
+    parser.add_argument('--samples', type=int, nargs='+', default=[200, 2000])
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case, best is kept")
+    parser.add_argument('--scalar-work', type=float, default=2e6,
+                        help="Largest samples * control points * 2^(degree + 1) for the recursive basis functions")
+    parser.add_argument('--only', nargs='+', help="Run only evaluators whose name contains one of these strings")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--baseline', default=BASELINE, help="JSON results of an earlier run to check for regressions")
+    parser.add_argument('--no-baseline', action='store_true', help="Skip the regression check")
+    parser.add_argument('--tolerance', type=float, default=1e-9, help="Largest deviation from the reference")
+    parser.add_argument('--time-ratio', type=float, default=1.5)
+    parser.add_argument('--memory-ratio', type=float, default=1.5)
+    parser.add_argument('--accuracy-slack', type=float, default=1e-9)
+    args = parser.parse_args()
+
+    # 先读入基准，--output 可以直接覆盖基准文件
+    baseline = None
+    if not args.no_baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    agreement = recursive_agreement()
+    failures = []
+    for record in agreement:
+        print(f"recursive basis, {record['nodes']:<16} p={record['degree']}: basis {record['basis_error']:.2e}, "
+              f"curve {record['curve_error']:.2e}", file=sys.stderr)
+        if max(record['basis_error'], record['curve_error']) > RECURSIVE_TOLERANCE:
+            failures.append(f"BSplineEval against BSpline.basis_function, {record['nodes']} p={record['degree']}: "
+                            f"basis {record['basis_error']:.3e}, curve {record['curve_error']:.3e} "
+                            f"> {RECURSIVE_TOLERANCE:.0e}")
+
+    results = run(args.degrees, args.control_points, args.samples, args.repeat, args.scalar_work, args.only)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'parameters': {name: getattr(args, name) for name in ('degrees', 'control_points', 'samples', 'repeat')},
+        'recursive_agreement': agreement,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=1)
+
+    failures += inaccurate(results, args.tolerance)
+    for message in failures:
+        print(f"INACCURATE {message}")
+    print(f"{len(failures)} cases above the accuracy tolerance")
+    regressions = []
+    if baseline is not None:
+        regressions = compare(results, baseline, args.time_ratio, args.memory_ratio, args.accuracy_slack)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        print(f"{len(regressions)} regressions against {args.baseline}")
+    if failures or regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Nearest-vertex hit testing in Draw_Curve: linear scan versus SpatialIndex.VertexGrid.
+
+The scan is the loop handle_mouse_click used before; both must pick the same vertex.
+Also times the incremental grid updates the editor performs (append, move, remove).
+
+Usage (from the repository root):
+    python -m benchmarks.hit_test [--vertices 100000] [--queries 2000]
+"""
+import argparse
+import random
+import time
+
+from SpatialIndex import VertexGrid
+
+WIDTH, HEIGHT, RADIUS = 800, 600, 10
+
+
+def linear_scan(vertices, mouse_x, mouse_y):
+    closest_index = None
+    closest_distance = float('inf')
+    for i, vertex in enumerate(vertices):
+        distance = ((vertex[0] - mouse_x) ** 2 + (vertex[1] - mouse_y) ** 2) ** 0.5
+        if distance < closest_distance:
+            closest_distance = distance
+            closest_index = i
+    return closest_index if closest_distance < RADIUS else None
+
+
+def per_call(function, arguments):
+    start = time.perf_counter()
+    results = [function(*args) for args in arguments]
+    return (time.perf_counter() - start) / len(arguments), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--scan-queries', type=int, default=20, help="The linear scan is slow; fewer queries")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vertices = [(rng.randrange(WIDTH), rng.randrange(HEIGHT)) for _ in range(args.vertices)]
+    clicks = [(rng.randrange(WIDTH), rng.randrange(HEIGHT)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    grid = VertexGrid(RADIUS, vertices)
+    build = time.perf_counter() - start
+
+    scan_time, scan_results = per_call(lambda x, y: linear_scan(vertices, x, y), clicks[:args.scan_queries])
+    grid_time, grid_results = per_call(lambda x, y: grid.nearest((x, y), RADIUS), clicks)
+    if grid_results[:args.scan_queries] != scan_results:
+        raise SystemExit("VertexGrid and the linear scan disagree")
+
+    moves = [(rng.randrange(args.vertices), (rng.randrange(WIDTH), rng.randrange(HEIGHT))) for _ in range(args.queries)]
+    move_time, _ = per_call(grid.move, moves)
+    append_time, _ = per_call(grid.append, [(click,) for click in clicks])
+    removals = [(rng.randrange(len(grid) - args.queries),) for _ in range(args.queries)]
+    remove_time, _ = per_call(grid.remove, removals)
+
+    print(f"{args.vertices} vertices in {WIDTH}x{HEIGHT}, radius {RADIUS}; grid built in {build * 1e3:.1f} ms")
+    print(f"{'operation':<14} {'us/call':>12}")
+    for name, seconds in (('linear scan', scan_time), ('grid nearest', grid_time), ('grid move', move_time),
+                          ('grid append', append_time), ('grid remove', remove_time)):
+        print(f"{name:<14} {seconds * 1e6:>12.2f}")
+    print(f"nearest speedup: {scan_time / grid_time:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Import time and import side effects of every module in the repository.
+
+Each module is imported in a fresh interpreter, --repeat times, from an empty working
+directory; the best wall time of the import statement is reported next to the time of
+importing NumPy alone. The child process also records which heavy packages the import
+loaded and whether it had side effects: output on stdout or stderr, files created,
+threads started, matplotlib figures, a Tk root window, pygame initialized, or an
+import that never returns (an event loop).
+
+The core modules (everything except the GUI and rendering layers in GUI_MODULES) must
+load none of matplotlib, scipy, pygame, tkinter and PIL; no module may have side
+effects. The run exits with status 1 if either rule is broken, so it doubles as a
+check.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time [--repeat 5] [--output imports.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('matplotlib', 'scipy', 'pygame', 'tkinter', 'PIL')
+# 界面和渲染层，允许在导入时加载上面的库，但同样不能有副作用
+GUI_MODULES = {'BezierApp', 'BatchRender', 'PointTable', 'SurfaceRenderer'}
+
+CHILD = r'''
+import json, os, sys, threading, time
+module = sys.argv[1]
+before = sorted(os.listdir('.'))
+start = time.perf_counter()
+error = None
+try:
+    __import__(module)
+except BaseException as e:
+    error = f"{type(e).__name__}: {e}"
+seconds = time.perf_counter() - start
+effects = []
+if threading.active_count() > 1:
+    effects.append('started threads')
+if sorted(os.listdir('.')) != before:
+    effects.append('created files')
+if 'matplotlib.pyplot' in sys.modules and sys.modules['matplotlib.pyplot'].get_fignums():
+    effects.append('created figures')
+if 'tkinter' in sys.modules and getattr(sys.modules['tkinter'], '_default_root', None) is not None:
+    effects.append('created a Tk root')
+if 'pygame' in sys.modules and sys.modules['pygame'].get_init():
+    effects.append('initialized pygame')
+loaded = sorted(name for name in %r if name in sys.modules)
+print('\n' + json.dumps({'seconds': seconds, 'error': error, 'effects': effects, 'loaded': loaded}))
+''' % (HEAVY,)
+
+
+def modules():
+    return sorted(name[:-3] for name in os.listdir(ROOT) if name.endswith('.py'))
+
+
+def import_once(module, timeout):
+    # 在空的临时目录中用新的解释器导入；子进程最后一行输出 JSON
+    environment = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            completed = subprocess.run([sys.executable, '-c', CHILD, module], cwd=directory, env=environment,
+                                       capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {'seconds': None, 'error': None, 'effects': [f'did not return within {timeout} s'], 'loaded': []}
+    output, _, last = completed.stdout.rstrip('\n').rpartition('\n')
+    record = json.loads(last)
+    if output.strip():
+        record['effects'].append(f'printed {output.strip()[:60]!r}')
+    if completed.stderr.strip():
+        record['effects'].append(f'wrote to stderr {completed.stderr.strip()[:60]!r}')
+    return record
+
+
+def measure(module, repeat, timeout):
+    records = [import_once(module, timeout) for _ in range(repeat)]
+    times = [record['seconds'] for record in records if record['seconds'] is not None]
+    first = records[0]
+    return {'module': module, 'seconds': min(times) if times else None, 'error': first['error'],
+            'effects': first['effects'], 'loaded': first['loaded']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per module, best time is kept")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    numpy = measure('numpy', args.repeat, args.timeout)
+    results = [measure(module, args.repeat, args.timeout) for module in modules()]
+    problems = []
+    print(f"{'module':<22} {'ms':>8} {'+numpy':>8}  loaded / side effects")
+    for record in [numpy] + results:
+        seconds = record['seconds']
+        core = record['module'] not in GUI_MODULES and record['module'] != 'numpy'
+        notes = record['loaded'] + record['effects'] + ([record['error']] if record['error'] else [])
+        if record['effects'] or record['error']:
+            problems.append(record['module'])
+        elif core and record['loaded']:
+            problems.append(record['module'])
+        total = f"{seconds * 1e3:8.1f}" if seconds is not None else f"{'-':>8}"
+        extra = f"{(seconds - numpy['seconds']) * 1e3:8.1f}" if seconds is not None else f"{'-':>8}"
+        print(f"{record['module']:<22} {total} {extra}  {', '.join(notes)}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'numpy': numpy, 'results': results, 'gui_modules': sorted(GUI_MODULES)}, file, indent=1)
+    if problems:
+        print(f"Import problems in: {', '.join(problems)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
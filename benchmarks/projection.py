@@ -0,0 +1,81 @@
+"""
+Throughput and accuracy of Projection.CurveProjector closest-point queries.
+
+Query points are scattered around a random cubic Bezier curve and a random clamped
+cubic B-spline. The reference answer minimizes the distance over a dense sampling of
+every Bezier segment, then polishes the closest samples with a bounded scalar
+minimization; the error column is the largest difference between the two distances.
+
+Usage (from the repository root):
+    python -m benchmarks.projection [--queries 100000] [--control-points 40] [--reference 2000]
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.optimize import minimize_scalar
+
+from BatchEval import curve_nodes
+from Projection import CurveProjector, _point_derivatives
+
+
+def reference_distances(projector, points, samples=4001):
+    # 稠密采样找到最近的采样点，再在相邻采样区间内做一维有界极小化
+    segments = projector.segments
+    grid = np.linspace(0, 1, samples)
+    count = len(segments)
+    curve, _, _ = _point_derivatives(np.repeat(segments, samples, axis=0), np.tile(grid, count))
+    distances = []
+    for point in points:
+        squared = np.sum((curve - point) ** 2, axis=1)
+        best = np.inf
+        # 远处的查询点可能有几个几乎等距的局部极小，逐个细化最近的几个采样点
+        for index in np.argsort(squared)[:8]:
+            segment, j = divmod(index, samples)
+            lo, hi = grid[max(j - 1, 0)], grid[min(j + 1, samples - 1)]
+
+            def distance(t):
+                return np.linalg.norm(_point_derivatives(segments[segment:segment + 1], np.array([t]))[0][0] - point)
+
+            result = minimize_scalar(distance, bounds=(lo, hi), method='bounded', options={'xatol': 1e-14})
+            best = min(best, result.fun, distance(lo), distance(hi))
+        distances.append(best)
+    return np.array(distances)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--queries', type=int, default=100000)
+    parser.add_argument('--control-points', type=int, default=40, help="Control points of the B-spline")
+    parser.add_argument('--reference', type=int, default=2000, help="Queries checked against the reference")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    bspline_points = np.cumsum(rng.normal(size=(args.control_points, 2)) * 50, axis=0)
+    cases = {
+        'bezier': lambda: CurveProjector.from_bezier(rng.random((4, 2)) * 1000),
+        'bspline': lambda: CurveProjector.from_bspline(
+            bspline_points, curve_nodes(args.control_points, 3), 3),
+    }
+
+    print(f"{'curve':<8} {'build ms':>9} {'queries/s':>12} {'max error':>11}")
+    for name, build in cases.items():
+        start = time.perf_counter()
+        projector = build()
+        build_time = time.perf_counter() - start
+
+        all_points = projector.segments.reshape(-1, 2)
+        low, high = all_points.min(axis=0), all_points.max(axis=0)
+        margin = 0.2 * (high - low)
+        queries = rng.uniform(low - margin, high + margin, (args.queries, 2))
+
+        start = time.perf_counter()
+        _, _, distances = projector.project(queries)
+        elapsed = time.perf_counter() - start
+
+        error = np.abs(distances[:args.reference] - reference_distances(projector, queries[:args.reference])).max()
+        print(f"{name:<8} {build_time * 1e3:>9.2f} {args.queries / elapsed:>12.0f} {error:>11.2e}")
+
+
+if __name__ == '__main__':
+    main()
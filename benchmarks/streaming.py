@@ -0,0 +1,69 @@
+"""
+Peak memory and time of chunked B-spline evaluation against the in-memory path.
+
+The in-memory row is BSpline.b_spline_curve without out, which builds the whole sparse
+basis matrix and result at once. The streamed rows write the same samples through
+BSplineEval.evaluate_bspline_into with several chunk sizes, into a preallocated array
+and into a memory-mapped .npy file; the output buffer itself is not traced, so the peak
+column is the working memory of the evaluation. The error column compares the streamed
+points with the in-memory ones.
+
+Usage (from the repository root):
+    python -m benchmarks.streaming [--samples 1000000] [--control-points 100000] [--degree 3]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from BasisCache import basis_cache
+from BSpline import b_spline_curve, create_open_uniform_nodes
+from BSplineEval import evaluate_bspline_into
+
+
+def traced(function):
+    # 返回 (结果, 秒, 峰值 MiB)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=1000000)
+    parser.add_argument('--control-points', type=int, default=100000)
+    parser.add_argument('--degree', type=int, default=3)
+    parser.add_argument('--chunks', type=int, nargs='+', default=[4096, 65536, 1048576])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    control_points = np.cumsum(rng.normal(size=(args.control_points, 2)), axis=0)
+    nodes = create_open_uniform_nodes(args.control_points, args.degree)
+    shape = (args.samples, 2)
+
+    print(f"{'method':<22} {'chunk':>9} {'seconds':>9} {'peak MiB':>9} {'max error':>10}")
+    reference, elapsed, peak = traced(lambda: b_spline_curve(control_points, nodes, args.degree, args.samples))
+    basis_cache.clear()
+    print(f"{'in memory':<22} {'-':>9} {elapsed:>9.3f} {peak:>9.1f} {'-':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for chunk in args.chunks:
+            out = np.empty(shape)
+            mapped = np.lib.format.open_memmap(os.path.join(directory, f'{chunk}.npy'), mode='w+', shape=shape)
+            for name, buffer in (('into array', out), ('into memmap', mapped)):
+                _, elapsed, peak = traced(lambda: evaluate_bspline_into(
+                    control_points, nodes, args.degree, args.samples, buffer, chunk))
+                error = np.abs(buffer - reference).max()
+                print(f"{name:<22} {chunk:>9} {elapsed:>9.3f} {peak:>9.1f} {error:>10.2e}")
+            del mapped
+
+
+if __name__ == '__main__':
+    main()
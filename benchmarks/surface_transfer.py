@@ -0,0 +1,96 @@
+"""
+Per-frame cost of moving a pygame surface into Tk, old path versus buffer path.
+
+- copy:   surfarray.array3d + transpose + Image.fromarray + a new PhotoImage (the old
+          Draw_Curve.pygame_to_tk_image)
+- buffer: surface_region_image over the whole surface + paste into a persistent PhotoImage
+- dirty:  the same for a 200x200 dirty rectangle only
+
+Without a display the Tk steps are skipped, and the PIL conversion that PhotoImage.paste
+performs is timed instead.
+
+Usage (from the repository root):
+    python -m benchmarks.surface_transfer [--frames 50]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from PIL import Image
+
+from SurfaceRenderer import RGBX_MASKS, surface_region_image
+
+SIZES = {'800x600': (800, 600), '4K': (3840, 2160)}
+
+
+def make_tk():
+    try:
+        import tkinter as tk
+        from PIL import ImageTk
+        root = tk.Tk()
+        root.withdraw()
+        return root, ImageTk
+    except Exception:
+        return None, None
+
+
+def time_frames(function, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        function()
+    return (time.perf_counter() - start) / frames
+
+
+def run(frames):
+    pygame.init()
+    root, ImageTk = make_tk()
+    rows = []
+    for name, size in SIZES.items():
+        legacy_surface = pygame.Surface(size)
+        surface = pygame.Surface(size, 0, 32, RGBX_MASKS)
+        for s in (legacy_surface, surface):
+            s.fill((255, 255, 255))
+            pygame.draw.circle(s, (255, 0, 0), (size[0] // 2, size[1] // 2), min(size) // 3, 2)
+        dirty = pygame.Rect(size[0] // 2, size[1] // 2, 200, 200)
+        photo = ImageTk.PhotoImage('RGB', size) if root else None
+
+        def copy_path():
+            array = pygame.surfarray.array3d(legacy_surface)
+            image = Image.fromarray(array.transpose((1, 0, 2)))
+            if root:
+                ImageTk.PhotoImage(image=image)
+
+        def transfer(rect):
+            def run_once():
+                image = surface_region_image(surface, rect)
+                if photo:
+                    photo.paste(image)
+                else:
+                    image.convert('RGB')
+            return run_once
+
+        rows.append((name, 'copy', time_frames(copy_path, frames)))
+        rows.append((name, 'buffer', time_frames(transfer(surface.get_rect()), frames)))
+        rows.append((name, 'dirty', time_frames(transfer(dirty), frames)))
+    if root:
+        root.destroy()
+    return rows, root is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=50)
+    args = parser.parse_args()
+
+    rows, with_tk = run(args.frames)
+    print(f"Tk display: {'yes' if with_tk else 'no (PIL conversion only)'}")
+    print(f"{'size':>8}  {'path':<8} {'ms/frame':>10}")
+    for name, path, seconds in rows:
+        print(f"{name:>8}  {path:<8} {seconds * 1e3:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()